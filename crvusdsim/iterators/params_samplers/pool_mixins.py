@@ -71,6 +71,7 @@ def controller_A_params(controller, A):
     controller.Aminus1 = A - 1
     controller.SQRT_BAND_RATIO = isqrt(unsafe_div(10**36 * A, unsafe_sub(A, 1)))
     controller.LOG2_A_RATIO = log2(A * 10**18 // unsafe_sub(A, 1))
+    controller._reset_y_effective_table()
 
 
 def rate_policy_params(policy, rate0):
@@ -85,16 +85,36 @@ class ParameterizedLLAMMAPoolIterator(LLAMMAPoolMixin):
             A dictionary of the pool parameters set on this iteration.
         """
         for params in self.parameter_sequence:
-            sim_market = self.sim_market_template.copy()
+            yield self.make_market(params), params
 
-            if self.sim_mode == "pool":
-                self.set_pool_attributes(sim_market.pool, params)
-            elif self.sim_mode == "controller":
-                self.set_controller_attributes(sim_market.controller, params)
-            elif self.sim_mode == "rate":
-                self.set_rate_attributes(sim_market, params)
+    def __getnewargs__(self):
+        # `__new__` needs the market to pick the subclass when unpickling
+        return (self.sim_market_template,)
 
-            yield sim_market, params
+    def make_market(self, params):
+        """
+        Returns a copy of the market template with `params` set
+        according to `sim_mode`.
+
+        Parameters
+        ----------
+        params : dict
+            One entry of `parameter_sequence`.
+
+        Returns
+        -------
+        :class:`~crvusdsim.pool.SimMarketInstance`
+        """
+        sim_market = self.sim_market_template.copy()
+
+        if self.sim_mode == "pool":
+            self.set_pool_attributes(sim_market.pool, params)
+        elif self.sim_mode == "controller":
+            self.set_controller_attributes(sim_market.controller, params)
+        elif self.sim_mode == "rate":
+            self.set_rate_attributes(sim_market, params)
+
+        return sim_market
 
     def make_parameter_sequence(self, variable_params):
         """
@@ -1,5 +1,24 @@
 __all__ = [
-    "PriceVolume"
+    "PriceVolume",
+    "SharedPriceVolume",
+    "shared_price_sampler",
+    "SyntheticPaths",
+    "SyntheticPriceVolume",
+    "GBM",
+    "JumpDiffusion",
+    "RegimeSwitching",
+    "BlockBootstrap",
+    "PegOU",
 ]
 
-from .price_volume import PriceVolume
\ No newline at end of file
+from .price_volume import PriceVolume
+from .shared import SharedPriceVolume, shared_price_sampler
+from .synthetic import (
+    GBM,
+    BlockBootstrap,
+    JumpDiffusion,
+    PegOU,
+    RegimeSwitching,
+    SyntheticPaths,
+    SyntheticPriceVolume,
+)
@@ -1,4 +1,5 @@
 import os
+from copy import copy
 from datetime import timedelta
 from curvesim.exceptions import NetworkError
 from curvesim.logging import get_logger
@@ -203,6 +204,35 @@ class PriceVolume(PriceSampler):
             else:
                 self.query_peg_prices(pegcoins)
 
+    def head(self, n):
+        """
+        Returns a copy of the sampler limited to its first `n` timestamps,
+        with the peg prices cut at the same time.
+
+        Parameters
+        ----------
+        n : int
+            Number of timestamps to keep.
+
+        Returns
+        -------
+        :class:`PriceVolume`
+        """
+        sampler = copy(self)
+        sampler.prices = self.prices.iloc[:n]
+        sampler.volumes = self.volumes.iloc[:n]
+
+        end = sampler.prices.index[-1]
+        for attr in ("peg_prices", "peg_volumes"):
+            frames = getattr(self, attr, None)
+            if frames is not None:
+                frames = {
+                    symbols: df[df.index <= end] if df is not None else None
+                    for symbols, df in frames.items()
+                }
+            setattr(sampler, attr, frames)
+        return sampler
+
     def total_volumes(self):
         """
         Returns
@@ -0,0 +1,247 @@
+"""
+Shared-memory proxy of a :class:`PriceVolume` sampler for pipeline workers.
+
+Pickling a `PriceVolume` copies every price/volume DataFrame into each
+worker task. :class:`SharedPriceVolume` copies the arrays once into a
+`multiprocessing.shared_memory` block and pickles only the block name and
+its layout; workers attach to the block and rebuild read-only DataFrames
+on top of it without copying the data.
+"""
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from curvesim.logging import get_logger
+
+from .price_volume import PriceVolume
+
+logger = get_logger(__name__)
+
+FRAME_ATTRS = ("prices", "volumes", "original_prices", "original_volumes")
+PEG_FRAME_ATTRS = ("peg_prices", "peg_volumes")
+META_ATTRS = ("assets", "data_dir", "days", "src", "end", "max_interval", "ncpu")
+
+# attached blocks of the current process, by block name
+_attached = {}
+
+
+def _frame_items(sampler):
+    """Yield (key, DataFrame) for every frame of `sampler`."""
+    for attr in FRAME_ATTRS:
+        yield (attr,), getattr(sampler, attr)
+    for attr in PEG_FRAME_ATTRS:
+        frames = getattr(sampler, attr, None)
+        if frames is None:
+            continue
+        for symbols, df in frames.items():
+            yield (attr, symbols), df
+
+
+def _layout(frames):
+    """
+    Byte layout of `frames` in the shared block: for each frame the
+    offsets/dtypes of its int64 index and 2-d values, and the
+    metadata needed to rebuild it.
+    """
+    layout = []
+    offset = 0
+    for key, df in frames:
+        assert isinstance(df, pd.DataFrame), "Can only share DataFrames"
+        assert isinstance(df.index, pd.DatetimeIndex), "Can only share time series"
+        values = df.to_numpy()
+        assert values.dtype.kind in "iuf", "Can only share numeric frames"
+        entry = {
+            "key": key,
+            "columns": df.columns,
+            "tz": df.index.tz,
+            "index_name": df.index.name,
+            "unit": df.index.unit,
+            "index_offset": offset,
+            "length": len(df),
+            "dtype": values.dtype.str,
+            "shape": values.shape,
+        }
+        offset += len(df) * 8
+        entry["values_offset"] = offset
+        offset += values.nbytes
+        layout.append(entry)
+    return layout, offset
+
+
+def _views(buf, entry):
+    index = np.ndarray(
+        (entry["length"],), dtype=np.int64, buffer=buf, offset=entry["index_offset"]
+    )
+    values = np.ndarray(
+        entry["shape"],
+        dtype=np.dtype(entry["dtype"]),
+        buffer=buf,
+        offset=entry["values_offset"],
+    )
+    return index, values
+
+
+def _rebuild(buf, entry):
+    index, values = _views(buf, entry)
+    index.flags.writeable = False
+    values.flags.writeable = False
+    dt_index = pd.DatetimeIndex(
+        index.view(f"M8[{entry['unit']}]"), name=entry["index_name"]
+    )
+    if entry["tz"] is not None:
+        dt_index = dt_index.tz_localize("UTC").tz_convert(entry["tz"])
+    return pd.DataFrame(values, index=dt_index, columns=entry["columns"], copy=False)
+
+
+def _attach(name, layout, peg_attrs):
+    """
+    Attach the block `name` once per process and build its frames,
+    keyed like the sampler attributes (peg frames by symbols).
+    """
+    if name not in _attached:
+        shm = shared_memory.SharedMemory(name=name)
+        frames = {attr: {} for attr in peg_attrs}
+        for entry in layout:
+            df = _rebuild(shm.buf, entry)
+            if len(entry["key"]) == 1:
+                frames[entry["key"][0]] = df
+            else:
+                frames[entry["key"][0]][entry["key"][1]] = df
+        _attached[name] = (shm, frames)
+    return _attached[name][1]
+
+
+class SharedPriceVolume(PriceVolume):
+    """
+    Read-only proxy of a :class:`PriceVolume` whose price/volume data
+    lives in shared memory.
+
+    Pickles to a few hundred bytes, and unpickled copies in the same
+    process share one attachment. The creating process owns the block and
+    must call :meth:`unlink` (or use the proxy as a context manager) once
+    the workers are done.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, sampler: PriceVolume):
+        """
+        Copies the frames of `sampler` into a new shared memory block.
+
+        Parameters
+        ----------
+        sampler : :class:`PriceVolume`
+            The sampler to share.
+        """
+        for attr in META_ATTRS:
+            setattr(self, attr, getattr(sampler, attr, None))
+
+        layout, size = _layout(_frame_items(sampler))
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for (_, df), entry in zip(_frame_items(sampler), layout):
+            index, values = _views(shm.buf, entry)
+            index[:] = df.index.asi8
+            values[:] = df.to_numpy()
+            del index, values
+
+        self._name = shm.name
+        self._layout = layout
+        self._peg_attrs = [
+            attr for attr in PEG_FRAME_ATTRS if getattr(sampler, attr, None) is not None
+        ]
+        self._shm = shm
+        logger.debug("Shared %d bytes of price data in %s", size, shm.name)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_shm"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
+
+    @property
+    def _frames(self):
+        return _attach(self._name, self._layout, self._peg_attrs)
+
+    @property
+    def prices(self):
+        return self._frames["prices"]
+
+    @property
+    def volumes(self):
+        return self._frames["volumes"]
+
+    @property
+    def original_prices(self):
+        return self._frames["original_prices"]
+
+    @property
+    def original_volumes(self):
+        return self._frames["original_volumes"]
+
+    @property
+    def peg_prices(self):
+        return self._frames.get("peg_prices")
+
+    @property
+    def peg_volumes(self):
+        return self._frames.get("peg_volumes")
+
+    def load_pegcoins_prices(self, *args, **kwargs):
+        raise TypeError("SharedPriceVolume is read-only")
+
+    def detach(self):
+        """
+        Drops this process' attachment to the block, e.g. in long-lived
+        workers once the proxy is no longer needed. Frames still referenced
+        elsewhere keep the mapping alive until they are released.
+        """
+        shm, frames = _attached.pop(self._name, (None, None))
+        del frames
+        if shm is not None:
+            _close(shm)
+
+    def unlink(self):
+        """
+        Releases the shared memory block. Only the creating process may
+        unlink it; other processes' attachments close on exit or
+        :meth:`detach`.
+        """
+        assert self._shm is not None, "Only the creating process can unlink"
+        self.detach()
+        _close(self._shm)
+        self._shm.unlink()
+        self._shm = None
+
+
+def _close(shm):
+    try:
+        shm.close()
+    except BufferError:
+        # frames still referenced; the mapping goes away with them
+        pass
+
+
+@contextmanager
+def shared_price_sampler(price_sampler):
+    """
+    Context manager yielding a :class:`SharedPriceVolume` for a
+    :class:`PriceVolume` and any other sampler unchanged.
+    """
+    if not isinstance(price_sampler, PriceVolume) or isinstance(
+        price_sampler, SharedPriceVolume
+    ):
+        yield price_sampler
+        return
+
+    with SharedPriceVolume(price_sampler) as shared:
+        yield shared
@@ -0,0 +1,411 @@
+"""
+Synthetic price/volume paths for Monte Carlo stress runs.
+
+:class:`SyntheticPaths` draws seeded price paths from a return model
+(:class:`GBM`, :class:`JumpDiffusion`, :class:`RegimeSwitching` or
+:class:`BlockBootstrap` of historical returns), together with peg-coin
+prices (:class:`PegOU`) on the same timestamps for the stableswap pools.
+Paths are generated with NumPy in batches of `batch_size` and handed out
+one at a time as :class:`SyntheticPriceVolume` samplers, which run like a
+:class:`~crvusdsim.iterators.price_samplers.PriceVolume` in
+:class:`~crvusdsim.templates.Strategy` and
+:func:`~crvusdsim.pipelines.run_pipeline`; only one batch is ever held in
+memory, and nothing is downloaded.
+
+Examples
+--------
+>>> paths = SyntheticPaths(
+...     assets, JumpDiffusion(sigma=0.8, jump_intensity=12), initial_price=2000,
+...     n_paths=1000, n_samples=60 * 288, pegcoins=["USDC", "USDT"], seed=42,
+... )
+>>> for price_sampler in paths:
+...     results = run_pipeline(param_sampler, price_sampler, strategy, ncpu=1)
+"""
+import numpy as np
+import pandas as pd
+
+from curvesim.logging import get_logger
+from curvesim.utils import override
+
+from .price_volume import PriceVolume, PriceVolumeSample
+
+logger = get_logger(__name__)
+
+SECONDS_PER_YEAR = 365 * 86400
+
+
+class GBM:
+    """Geometric Brownian motion with annualised drift and volatility."""
+
+    def __init__(self, mu=0.0, sigma=0.8):
+        self.mu = mu
+        self.sigma = sigma
+
+    def log_returns(self, rng, n_paths, n_steps, dt):
+        """
+        Returns an `(n_paths, n_steps)` array of log returns over steps
+        of `dt` years.
+        """
+        drift = (self.mu - self.sigma**2 / 2) * dt
+        return drift + self.sigma * np.sqrt(dt) * rng.standard_normal(
+            (n_paths, n_steps)
+        )
+
+
+class JumpDiffusion(GBM):
+    """
+    Merton jump-diffusion: :class:`GBM` plus normally distributed log
+    jumps arriving `jump_intensity` times a year on average. The drift is
+    compensated so that `mu` stays the expected return.
+    """
+
+    def __init__(
+        self, mu=0.0, sigma=0.6, jump_intensity=10, jump_mean=-0.05, jump_std=0.08
+    ):
+        super().__init__(mu, sigma)
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+
+    def log_returns(self, rng, n_paths, n_steps, dt):
+        kappa = np.exp(self.jump_mean + self.jump_std**2 / 2) - 1
+        returns = super().log_returns(rng, n_paths, n_steps, dt)
+        returns -= self.jump_intensity * kappa * dt
+
+        n_jumps = rng.poisson(self.jump_intensity * dt, (n_paths, n_steps))
+        # the sum of k normal jumps is normal with k times mean and variance
+        returns += n_jumps * self.jump_mean + np.sqrt(
+            n_jumps
+        ) * self.jump_std * rng.standard_normal((n_paths, n_steps))
+        return returns
+
+
+class RegimeSwitching:
+    """
+    Markov regime-switching GBM: each regime has its own annualised drift
+    and volatility, and the regime changes between steps according to the
+    per-step `transition` matrix. Paths start in `initial_regime`.
+    """
+
+    def __init__(
+        self,
+        mus=(0.0, -0.5),
+        sigmas=(0.5, 1.5),
+        transition=((0.9995, 0.0005), (0.002, 0.998)),
+        initial_regime=0,
+    ):
+        self.mus = np.asarray(mus, dtype=float)
+        self.sigmas = np.asarray(sigmas, dtype=float)
+        self.transition = np.asarray(transition, dtype=float)
+        self.initial_regime = initial_regime
+        assert self.transition.shape == (len(self.mus),) * 2, "transition shape"
+        assert np.allclose(self.transition.sum(axis=1), 1), "transition rows must sum to 1"
+
+    def regimes(self, rng, n_paths, n_steps):
+        """Returns the `(n_paths, n_steps)` regime of each step."""
+        cumulative = self.transition.cumsum(axis=1)
+        draws = rng.random((n_paths, n_steps))
+        regimes = np.empty((n_paths, n_steps), dtype=np.intp)
+        state = np.full(n_paths, self.initial_regime, dtype=np.intp)
+        for t in range(n_steps):
+            state = (draws[:, t, None] > cumulative[state]).sum(axis=1)
+            regimes[:, t] = state
+        return regimes
+
+    def log_returns(self, rng, n_paths, n_steps, dt):
+        regimes = self.regimes(rng, n_paths, n_steps)
+        mus, sigmas = self.mus[regimes], self.sigmas[regimes]
+        return (mus - sigmas**2 / 2) * dt + sigmas * np.sqrt(
+            dt
+        ) * rng.standard_normal((n_paths, n_steps))
+
+
+class BlockBootstrap:
+    """
+    Moving-block bootstrap of historical log returns: paths are made of
+    randomly chosen blocks of `block_size` consecutive returns, which keeps
+    their short-term autocorrelation and volatility clustering.
+
+    The returns are replayed at their own frequency, so the paths should
+    use the interval of the historical data.
+    """
+
+    def __init__(self, log_returns, block_size=288):
+        self.returns = np.asarray(log_returns, dtype=float)
+        self.block_size = min(block_size, len(self.returns))
+        assert self.block_size > 0, "No returns to bootstrap"
+
+    @classmethod
+    def from_prices(cls, prices, block_size=288):
+        """
+        Bootstraps the returns of the first column of `prices`, e.g. the
+        `prices` of a :class:`~crvusdsim.iterators.price_samplers.PriceVolume`.
+        """
+        values = np.asarray(prices.iloc[:, 0], dtype=float)
+        return cls(np.diff(np.log(values)), block_size)
+
+    def log_returns(self, rng, n_paths, n_steps, dt):
+        n_blocks = -(-n_steps // self.block_size)
+        starts = rng.integers(
+            0, len(self.returns) - self.block_size + 1, (n_paths, n_blocks)
+        )
+        index = starts[:, :, None] + np.arange(self.block_size)
+        return self.returns[index].reshape(n_paths, -1)[:, :n_steps]
+
+
+class PegOU:
+    """
+    Peg-coin prices as an Ornstein-Uhlenbeck process of the log price
+    around the peg, with annualised volatility and mean-reversion speed.
+    """
+
+    def __init__(self, sigma=0.05, reversion=500.0, peg=1.0):
+        self.sigma = sigma
+        self.reversion = reversion
+        self.peg = peg
+
+    def prices(self, rng, n_paths, n_samples, dt):
+        """Returns an `(n_paths, n_samples)` array of peg-coin prices."""
+        decay = np.exp(-self.reversion * dt)
+        scale = self.sigma * np.sqrt((1 - decay**2) / (2 * self.reversion))
+        shocks = scale * rng.standard_normal((n_paths, n_samples))
+        log_dev = np.empty((n_paths, n_samples))
+        log_dev[:, 0] = 0.0
+        for t in range(1, n_samples):
+            log_dev[:, t] = decay * log_dev[:, t - 1] + shocks[:, t]
+        return self.peg * np.exp(log_dev)
+
+
+class SyntheticPriceVolume(PriceVolume):
+    """
+    One synthetic price/volume path, iterated like a
+    :class:`~crvusdsim.iterators.price_samplers.PriceVolume`.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(
+        self,
+        assets,
+        prices,
+        volumes,
+        peg_prices=None,
+        peg_volumes=None,
+        path_id=None,
+    ):
+        """
+        Parameters
+        ----------
+        assets: SimAssets
+            Assets of the path, naming the price columns.
+
+        prices, volumes: pandas.DataFrame
+            Price and volume of the collateral, indexed by timestamp.
+
+        peg_prices, peg_volumes: dict, optional
+            Peg-coin price and volume DataFrames keyed by
+            `(symbol, "crvUSD")`, on the timestamps of `prices`.
+
+        path_id: int, optional
+            Index of the path in its :class:`SyntheticPaths`.
+        """
+        self.assets = assets
+        self.data_dir = None
+        self.days = None
+        self.src = "synthetic"
+        self.end = None
+        self.ncpu = 1
+        self.path_id = path_id
+
+        interval = prices.index.to_series().diff().median()
+        self.max_interval = int(interval.total_seconds()) if len(prices) > 1 else None
+        self.original_prices = self.prices = prices
+        self.original_volumes = self.volumes = volumes
+        self.peg_prices = peg_prices
+        self.peg_volumes = peg_volumes
+
+    @override
+    def __iter__(self) -> PriceVolumeSample:
+        """
+        Yields
+        -------
+        :class:`PriceVolumeSample`
+        """
+        columns = self.prices.columns
+        prices = self.prices.to_numpy()
+        volumes = self.volumes.to_numpy()
+
+        pegs = {}
+        if self.peg_prices is not None:
+            for symbols, df in self.peg_prices.items():
+                pegs[symbols] = df.iloc[:, 0].reindex(self.prices.index).to_numpy()
+
+        for t, timestamp in enumerate(self.prices.index):
+            peg_prices = None
+            if self.peg_prices is not None:
+                peg_prices = {
+                    symbols: None if np.isnan(peg[t]) else {symbols: peg[t]}
+                    for symbols, peg in pegs.items()
+                }
+            yield PriceVolumeSample(
+                timestamp,
+                dict(zip(columns, prices[t])),
+                dict(zip(columns, volumes[t])),
+                peg_prices,
+            )
+
+
+class SyntheticPaths:
+    """
+    Seeded stream of :class:`SyntheticPriceVolume` paths, generated
+    `batch_size` paths at a time.
+
+    A path only depends on `seed`, its index and `batch_size`, so any
+    path can be regenerated on its own with :meth:`path`.
+    """
+
+    def __init__(
+        self,
+        assets,
+        model,
+        initial_price,
+        n_paths,
+        n_samples,
+        *,
+        interval=5 * 60,
+        start="2023-01-01",
+        pegcoins=None,
+        peg_model=None,
+        volume=1e6,
+        volume_sigma=0.5,
+        batch_size=64,
+        seed=None,
+    ):
+        """
+        Parameters
+        ----------
+        assets: SimAssets
+            Assets of the paths, naming the price columns.
+
+        model: GBM, JumpDiffusion, RegimeSwitching or BlockBootstrap
+            Model of the collateral log returns.
+
+        initial_price: float
+            Collateral price at the first timestamp of every path.
+
+        n_paths: int
+            Number of paths.
+
+        n_samples: int
+            Number of timestamps of each path.
+
+        interval: int, default=5 * 60
+            Seconds between two timestamps.
+
+        start: str or pandas.Timestamp, default="2023-01-01"
+            First timestamp (UTC).
+
+        pegcoins: list of str, optional
+            Symbols of the peg coins of the stableswap pools, giving peg
+            prices keyed by `(symbol, "crvUSD")`.
+
+        peg_model: PegOU, optional
+            Model of the peg-coin prices, defaults to `PegOU()`.
+
+        volume: float, default=1e6
+            Mean volume per timestamp.
+
+        volume_sigma: float, default=0.5
+            Log-normal dispersion of the volumes.
+
+        batch_size: int, default=64
+            Number of paths generated at once.
+
+        seed: int, optional
+            Seed of the paths.
+        """
+        assert n_samples >= 2, "Paths need at least two samples"
+        self.assets = assets
+        self.model = model
+        self.initial_price = initial_price
+        self.n_paths = n_paths
+        self.n_samples = n_samples
+        self.index = pd.date_range(
+            pd.Timestamp(start, tz="UTC"), periods=n_samples, freq=f"{interval}s"
+        )
+        self.dt = interval / SECONDS_PER_YEAR
+        self.pegcoins = list(pegcoins or [])
+        self.peg_model = peg_model or PegOU()
+        self.volume = volume
+        self.volume_sigma = volume_sigma
+        self.batch_size = batch_size
+        self.seed_sequence = np.random.SeedSequence(seed)
+
+    def __len__(self):
+        return self.n_paths
+
+    def __iter__(self):
+        """
+        Yields
+        -------
+        :class:`SyntheticPriceVolume`
+        """
+        for start in range(0, self.n_paths, self.batch_size):
+            batch = self._batch(start // self.batch_size)
+            for j in range(len(batch["prices"])):
+                yield self._sampler(start + j, batch, j)
+
+    def path(self, i):
+        """Returns path `i`, as yielded by the iteration."""
+        assert 0 <= i < self.n_paths, f"No path {i}"
+        batch = self._batch(i // self.batch_size)
+        return self._sampler(i, batch, i % self.batch_size)
+
+    def _batch(self, b):
+        """Generates the arrays of batch `b`."""
+        n = min(self.batch_size, self.n_paths - b * self.batch_size)
+        seed = np.random.SeedSequence(
+            self.seed_sequence.entropy, spawn_key=self.seed_sequence.spawn_key + (b,)
+        )
+        rng = np.random.default_rng(seed)
+        n_samples, dt = self.n_samples, self.dt
+
+        log_returns = self.model.log_returns(rng, n, n_samples - 1, dt)
+        log_prices = np.zeros((n, n_samples))
+        np.cumsum(log_returns, axis=1, out=log_prices[:, 1:])
+        batch = {
+            "prices": self.initial_price * np.exp(log_prices),
+            "volumes": self._volumes(rng, n),
+            "peg_prices": {},
+            "peg_volumes": {},
+        }
+        for symbol in self.pegcoins:
+            symbols = (symbol, "crvUSD")
+            batch["peg_prices"][symbols] = self.peg_model.prices(rng, n, n_samples, dt)
+            batch["peg_volumes"][symbols] = self._volumes(rng, n)
+        logger.debug("Generated synthetic paths batch %d (%d paths)", b, n)
+        return batch
+
+    def _volumes(self, rng, n):
+        sigma = self.volume_sigma
+        return self.volume * rng.lognormal(-(sigma**2) / 2, sigma, (n, self.n_samples))
+
+    def _sampler(self, i, batch, j):
+        columns = self.assets.symbol_pairs
+
+        def frame(values, columns=columns):
+            return pd.DataFrame(values[j], index=self.index, columns=columns)
+
+        peg_prices = peg_volumes = None
+        if self.pegcoins:
+            peg_prices = {s: frame(v, ["price"]) for s, v in batch["peg_prices"].items()}
+            peg_volumes = {
+                s: frame(v, ["volume"]) for s, v in batch["peg_volumes"].items()
+            }
+        return SyntheticPriceVolume(
+            self.assets,
+            frame(batch["prices"]),
+            frame(batch["volumes"]),
+            peg_prices,
+            peg_volumes,
+            path_id=i,
+        )
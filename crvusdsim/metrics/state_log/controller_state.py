@@ -5,23 +5,26 @@ from crvusdsim.pool.sim_interface import SimLLAMMAPool
 def get_controller_state(pool, controller):
     """Returns controller and users state."""
 
-    users = list(controller.loans.values())
+    book = controller.loan_book
+    users = list(book.users)
     users_liquidated = list(controller.users_liquidated.keys())
     
-    users_debt = []
+    users_debt = book.debts(pool.get_rate_mul())
     users_x = []
     users_y = []
     users_health = []
-    users_init_y = []
+    users_init_y = [c / 1e18 for c in book.initial_collateral]
 
     liquidation_volume = 0
 
-    for user_address in users:
-        users_debt.append(controller.debt(user_address))
+    for user_address, debt, discount in zip(
+        users, users_debt, book.liquidation_discount
+    ):
         users_x.append(pool.get_xy_up(user_address, use_y=False) / 1e18)
         users_y.append(pool.get_xy_up(user_address, use_y=True) / 1e18)
-        users_health.append(controller.health(user_address) / 1e18)
-        users_init_y.append(controller.loan[user_address].initial_collateral / 1e18)
+        users_health.append(
+            controller._health(user_address, debt, False, discount) / 1e18
+        )
     
     for user_address in users_liquidated:
         liquidated_position = controller.users_liquidated[user_address]
@@ -8,7 +8,7 @@ def get_rate_state(sim_market: SimMarketInstance):
     rate0 = sim_market.policy.rate0
     rate = sim_market.policy.rate(controller)
     annualized_rate = (1 + rate / 1e18) ** ONE_YEAR - 1
-    pk_debt = sum([pk.debt for pk in sim_market.peg_keepers]) / 1e18
+    pk_debt = sim_market.policy.pk_debt / 1e18
     total_debt = sim_market.factory.total_debt() / 1e18
     pegkeeper_filling = pk_debt / total_debt if total_debt > 0 else 0
     stableswap_mean_price = (
@@ -16,6 +16,7 @@ instantiates a param_sampler, price_sampler, and strategy; and invokes `run_pipe
 returning its result metrics.
 """
 from multiprocessing import Pool as cpu_pool
+from threading import Semaphore
 
 from curvesim.logging import (
     configure_multiprocess_logging,
@@ -23,10 +24,26 @@ from curvesim.logging import (
     multiprocessing_logging_queue,
 )
 
+from .cache import ResultCache
+from .distributed import DirectoryQueue, QueueServer, TCPQueue, run_sweep
+from .executor import PipelineExecutor, executor_task
+from .instrumentation import ProgressMonitor, RunStats
+
 logger = get_logger(__name__)
 
 
-def run_pipeline(param_sampler, price_sampler, strategy, ncpu=4):
+def run_pipeline(
+    param_sampler,
+    price_sampler,
+    strategy,
+    ncpu=4,
+    chunksize=1,
+    max_in_flight=None,
+    worker_markets=False,
+    executor=None,
+    result_cache=None,
+    work_queue=None,
+):
     """
     Core function for running pipelines.
 
@@ -46,41 +63,246 @@ def run_pipeline(param_sampler, price_sampler, strategy, ncpu=4):
         A function dictating what happens at each timestep.
 
     ncpu : int, default=4
-        Number of cores to use.
+        Number of cores to use. With more than one core, a
+        :class:`~crvusdsim.iterators.price_samplers.PriceVolume` is handed to
+        the workers as a shared-memory
+        :class:`~crvusdsim.iterators.price_samplers.SharedPriceVolume`.
+
+    chunksize : int, default=1
+        Number of runs sent to a worker at a time.
+
+    max_in_flight : int, optional
+        Maximum number of runs drawn from `param_sampler` and not yet
+        finished, defaults to `2 * ncpu * chunksize`. Markets are only
+        copied by `param_sampler` as the workers free up, so the parent
+        holds at most this many at once.
+
+    worker_markets : bool, default=False
+        Build the markets in the workers instead of the parent. The
+        param_sampler (with its market template), strategy and price_sampler
+        are sent once to each worker when the pool starts, and every run
+        only sends its params dict to `param_sampler.make_market`.
+        Requires a param_sampler with `parameter_sequence` and `make_market`,
+        e.g. :class:`~crvusdsim.iterators.params_samplers.ParameterizedLLAMMAPoolIterator`.
+
+    executor : :class:`~crvusdsim.pipelines.executor.PipelineExecutor`, optional
+        Persistent worker pool to run on instead of starting one;
+        `ncpu` is then ignored. The shared inputs of the runs are sent
+        once per call rather than at pool initialisation.
+
+    result_cache : str or :class:`~crvusdsim.pipelines.cache.ResultCache`, optional
+        Directory of cached run results. Runs whose market, params, price
+        data, strategy and package version match a cached entry are not run
+        again; the others are stored as soon as they finish, so an
+        interrupted sweep resumes where it stopped.
+
+    work_queue : :class:`~crvusdsim.pipelines.distributed.WorkQueue`, optional
+        Queue to publish the runs to instead of running them here; `ncpu`
+        is then ignored and the runs go to the workers started with
+        :func:`~crvusdsim.pipelines.distributed.run_worker`, on this or
+        other hosts. Markets are built by the workers when `param_sampler`
+        has `make_market`.
 
     Returns
     -------
     results : tuple
-        Contains the metrics produced by the strategy.
+        Contains the metrics produced by the strategy, in the order of
+        `param_sampler`.
 
     """
-    if ncpu > 1:
-        with multiprocessing_logging_queue() as logging_queue:
-            strategy_args_list = [
-                (sim_market, params, price_sampler) for sim_market, params in param_sampler
-            ]
+    assert not worker_markets or hasattr(
+        param_sampler, "make_market"
+    ), "worker_markets needs a param_sampler with `make_market`"
+
+    cache = result_cache
+    results = {}
+    keys = {}
+    cached = set()
 
-            wrapped_args_list = [
-                (strategy, logging_queue, *args) for args in strategy_args_list
-            ]
+    def finish(i, metrics):
+        results[i] = metrics
+        if cache is not None:
+            cache.put(keys.pop(i), metrics)
 
-            with cpu_pool(ncpu) as clust:
-                results = tuple(
-                    zip(*clust.starmap(wrapped_strategy, wrapped_args_list))
+    runs = _runs(param_sampler)
+    if cache is not None:
+        if not isinstance(cache, ResultCache):
+            cache = ResultCache(cache)
+        run_key = cache.run_keys(param_sampler, price_sampler, strategy)
+        runs = _skip_cached(runs, cache, run_key, keys, results, cached)
+
+    parallel = executor is not None or ncpu > 1
+    remote_markets = work_queue is not None and hasattr(param_sampler, "make_market")
+    if not (parallel and worker_markets or remote_markets):
+        runs = _build_markets(runs, param_sampler)
+
+    if work_queue is not None:
+        run_sweep(
+            work_queue,
+            strategy,
+            param_sampler if remote_markets else None,
+            price_sampler,
+            runs,
+            finish,
+            max_in_flight,
+        )
+
+    elif executor is not None:
+        # pylint: disable-next=import-outside-toplevel
+        from crvusdsim.iterators.price_samplers import shared_price_sampler  # cyclic
+
+        with shared_price_sampler(price_sampler) as shared_sampler, executor.share(
+            strategy=strategy,
+            param_sampler=param_sampler if worker_markets else None,
+            price_sampler=shared_sampler,
+        ) as ref:
+            imap_ordered(
+                executor.pool,
+                executor_task,
+                ((i, (ref, params, sim_market)) for i, params, sim_market in runs),
+                chunksize,
+                max_in_flight or 2 * executor.ncpu * chunksize,
+                on_result=finish,
+            )
+
+    elif ncpu > 1:
+        # pylint: disable-next=import-outside-toplevel
+        from crvusdsim.iterators.price_samplers import shared_price_sampler  # cyclic
+
+        with multiprocessing_logging_queue() as logging_queue, shared_price_sampler(
+            price_sampler
+        ) as shared_sampler:
+            if worker_markets:
+                task_func = worker_market_task
+                tasks = ((i, params) for i, params, _ in runs)
+                pool_kwargs = {
+                    "initializer": init_worker,
+                    "initargs": (logging_queue, strategy, param_sampler, shared_sampler),
+                }
+            else:
+                task_func = wrapped_task
+                tasks = (
+                    (i, (strategy, logging_queue, sim_market, params, shared_sampler))
+                    for i, params, sim_market in runs
+                )
+                pool_kwargs = {}
+
+            with cpu_pool(ncpu, **pool_kwargs) as clust:
+                imap_ordered(
+                    clust,
+                    task_func,
+                    tasks,
+                    chunksize,
+                    max_in_flight or 2 * ncpu * chunksize,
+                    on_result=finish,
                 )
                 clust.close()
                 clust.join()  # coverage needs this
 
     else:
-        results = []
-        for sim_market, params in param_sampler:
-            metrics = strategy(sim_market, params, price_sampler)
-            results.append(metrics)
-        results = tuple(zip(*results))
+        for i, params, sim_market in runs:
+            finish(i, strategy(sim_market, params, price_sampler))
+
+    if cache is not None:
+        logger.info("Reused %d of %d cached runs", len(cached), len(results))
 
+    results = tuple(zip(*(results[i] for i in sorted(results))))
     return results
 
 
+def imap_ordered(clust, task_func, tasks, chunksize, max_in_flight, on_result=None):
+    """
+    Streams `tasks` of the form `(i, args)` through `clust.imap_unordered`
+    with at most `max_in_flight` of them drawn and unfinished, and returns
+    the results of `task_func` in task order.
+
+    `on_result(i, result)` is called as each result arrives.
+    """
+    assert max_in_flight >= chunksize, "max_in_flight must be >= chunksize"
+    tasks = BoundedTasks(tasks, max_in_flight)
+    results = {}
+    try:
+        for i, metrics in clust.imap_unordered(task_func, tasks, chunksize):
+            tasks.done()
+            results[i] = metrics
+            if on_result is not None:
+                on_result(i, metrics)
+    finally:
+        tasks.close()
+    return [results[i] for i in sorted(results)]
+
+
+def _runs(param_sampler):
+    """
+    Yields the `(i, params, sim_market)` of each run. `sim_market` is None
+    for param samplers building markets on demand with `make_market`.
+    """
+    if hasattr(param_sampler, "make_market"):
+        for i, params in enumerate(param_sampler.parameter_sequence):
+            yield i, params, None
+    else:
+        for i, (sim_market, params) in enumerate(param_sampler):
+            yield i, params, sim_market
+
+
+def _build_markets(runs, param_sampler):
+    if not hasattr(param_sampler, "make_market"):
+        yield from runs
+        return
+    for i, params, _ in runs:
+        yield i, params, param_sampler.make_market(params)
+
+
+def _skip_cached(runs, cache, run_key, keys, results, cached):
+    """
+    Loads the results of cached runs into `results`, recording their index
+    in `cached`, and yields the others, recording their keys in `keys`.
+    """
+    for i, params, sim_market in runs:
+        key = run_key(params, sim_market)
+        if key in cache:
+            results[i] = cache.get(key)
+            cached.add(i)
+        else:
+            keys[i] = key
+            yield i, params, sim_market
+
+
+class BoundedTasks:
+    """
+    Lazy task iterator for `Pool.imap_unordered` with at most
+    `max_in_flight` tasks drawn and not yet marked :meth:`done`.
+
+    The pool draws tasks from a handler thread, which blocks here
+    until a slot frees up.
+    """
+
+    def __init__(self, tasks, max_in_flight):
+        self._tasks = iter(tasks)
+        self._slots = Semaphore(max_in_flight)
+        self._closed = False
+
+    def __iter__(self):
+        while True:
+            self._slots.acquire()  # pylint: disable=consider-using-with
+            if self._closed:
+                return
+            try:
+                task = next(self._tasks)
+            except StopIteration:
+                return
+            yield task
+
+    def done(self):
+        """Frees the slot of a finished task."""
+        self._slots.release()
+
+    def close(self):
+        """Stops drawing tasks, waking a blocked handler thread."""
+        self._closed = True
+        self._slots.release()
+
+
 def wrapped_strategy(strategy, logging_queue, *args):
     """
     This wrapper ensures we configure logging to use the
@@ -91,3 +313,37 @@ def wrapped_strategy(strategy, logging_queue, *args):
     """
     configure_multiprocess_logging(logging_queue)
     return strategy(*args)
+
+
+def wrapped_task(task):
+    """
+    :func:`wrapped_strategy` for `imap_unordered`, taking and returning
+    the index of the run so the results can be put back in order.
+    """
+    i, args = task
+    return i, wrapped_strategy(*args)
+
+
+# per-process state of workers started by `init_worker`
+_worker = {}
+
+
+def init_worker(logging_queue, strategy, param_sampler, price_sampler):
+    """
+    Pool initializer of the `worker_markets` mode: configures logging
+    and keeps the run inputs shared by all tasks of the worker.
+    """
+    configure_multiprocess_logging(logging_queue)
+    _worker.update(
+        strategy=strategy, param_sampler=param_sampler, price_sampler=price_sampler
+    )
+
+
+def worker_market_task(task):
+    """
+    Runs the strategy on a market built in the worker from the
+    template of :func:`init_worker`'s param_sampler.
+    """
+    i, params = task
+    sim_market = _worker["param_sampler"].make_market(params)
+    return i, _worker["strategy"](sim_market, params, _worker["price_sampler"])
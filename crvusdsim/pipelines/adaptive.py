@@ -0,0 +1,145 @@
+"""
+Adaptive parameter search by successive halving.
+
+Instead of running every point of a parameter grid on the full price
+path, :func:`successive_halving` runs all candidates on a prefix of the
+path, keeps the best `1 / eta` of them according to an interim score, and
+reruns the survivors on an `eta` times longer prefix until the full path
+is reached.
+"""
+from copy import copy
+from math import ceil
+
+from curvesim.exceptions import CurvesimValueError
+from curvesim.logging import get_logger
+
+from . import run_pipeline
+
+logger = get_logger(__name__)
+
+
+def arb_loss(result):
+    """
+    Final `arb_profits_percent` of a "pool" mode run, i.e. the share of
+    the pool value lost to arbitrageurs (lower is better).
+    """
+    state_data = result[3]
+    return state_data["arb_profits_percent"].iloc[-1]
+
+
+def health_violations(result):
+    """
+    Liquidated users plus open loans with negative health at the end of a
+    "controller" or "N" mode run (lower is better).
+    """
+    last = result[3].iloc[-1]
+    n_liquidated = last["liquidation_count"]
+    # the health of liquidated users is logged after that of open loans
+    n_open = len(last["users_health"]) - n_liquidated
+    return n_liquidated + sum(h < 0 for h in last["users_health"][:n_open])
+
+
+DEFAULT_SCORES = {
+    "pool": arb_loss,
+    "controller": health_violations,
+    "N": health_violations,
+}
+
+
+def successive_halving(
+    param_sampler,
+    price_sampler,
+    strategy,
+    score=None,
+    eta=3,
+    min_fraction=None,
+    **kwargs,
+):
+    """
+    Runs the candidates of `param_sampler` with successive halving and
+    returns the full-path results of the survivors, as :func:`run_pipeline`.
+
+    Parameters
+    ----------
+    param_sampler : :class:`~crvusdsim.iterators.params_samplers.ParameterizedLLAMMAPoolIterator`
+        Parameter sampler whose `parameter_sequence` holds the candidates.
+
+    price_sampler : :class:`~crvusdsim.iterators.price_samplers.PriceVolume`
+        Price sampler providing `head(n)` for the path prefixes.
+
+    strategy: callable
+        A function dictating what happens at each timestep.
+
+    score : callable, optional
+        Maps the metrics of one run to a number, lower being better.
+        Defaults to :func:`arb_loss` in "pool" mode and
+        :func:`health_violations` in "controller" and "N" modes.
+
+    eta : int, default=3
+        Pruning factor: each round keeps `ceil(n / eta)` candidates
+        and extends the path prefix `eta` times.
+
+    min_fraction : float, optional
+        Fraction of the price path used in the first round, defaults to
+        `eta ** -k` with `k` the number of rounds needed to get down to
+        a single candidate.
+
+    **kwargs
+        Passed to :func:`run_pipeline` (ncpu, executor, result_cache, ...).
+
+    Returns
+    -------
+    results : tuple
+        Contains the metrics produced by the strategy for the survivors.
+    """
+    assert eta >= 2, "eta must be at least 2"
+    sim_mode = getattr(param_sampler, "sim_mode", None)
+    score = score or DEFAULT_SCORES.get(sim_mode)
+    if score is None:
+        raise CurvesimValueError(
+            f"No default score for sim_mode {sim_mode}, pass an explicit `score`"
+        )
+
+    candidates = list(param_sampler.parameter_sequence)
+    if min_fraction is None:
+        rounds = 0
+        while eta**rounds < len(candidates):
+            rounds += 1
+        min_fraction = eta**-rounds
+
+    n_samples = len(price_sampler.prices)
+    fraction = min_fraction
+    while fraction < 1 and len(candidates) > 1:
+        n = max(2, ceil(n_samples * fraction))
+        results = run_pipeline(
+            _with_candidates(param_sampler, candidates),
+            price_sampler.head(n),
+            strategy,
+            **kwargs,
+        )
+        scores = [score(result) for result in zip(*results)]
+        # NaN scores rank last
+        ranked = sorted(
+            range(len(candidates)), key=lambda i: (scores[i] != scores[i], scores[i])
+        )
+        survivors = sorted(ranked[: ceil(len(candidates) / eta)])
+
+        logger.info(
+            "Successive halving: kept %d of %d candidates after %d samples",
+            len(survivors),
+            len(candidates),
+            n,
+        )
+        candidates = [candidates[i] for i in survivors]
+        fraction *= eta
+
+    return run_pipeline(
+        _with_candidates(param_sampler, candidates), price_sampler, strategy, **kwargs
+    )
+
+
+def _with_candidates(param_sampler, candidates):
+    """Shallow copy of `param_sampler` running only `candidates`."""
+    param_sampler = copy(param_sampler)
+    param_sampler.parameter_sequence = candidates
+    return param_sampler
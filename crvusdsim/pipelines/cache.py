@@ -0,0 +1,168 @@
+"""
+On-disk cache of pipeline run results.
+
+Each run is keyed by a hash of the market it runs on (template and
+parameters), the price data, the strategy and the package version, and its
+`compute_metrics` output is stored as soon as it finishes. Rerunning a sweep
+only computes the runs missing from the cache, so interrupted sweeps resume
+where they stopped and extended sweeps only run the new points.
+"""
+import io
+import os
+import pickle
+import tempfile
+from hashlib import sha256
+
+import pandas as pd
+
+from curvesim.logging import get_logger
+
+from crvusdsim.pool.crvusd.utils.BlocktimestampMixins import BlocktimestampMixins
+from crvusdsim.version import __version__
+
+logger = get_logger(__name__)
+
+# Simulated clocks, set from the wall clock when a market is created
+# and reset to the first price timestamp by `prepare_for_run`.
+CLOCK_ATTRS = (
+    "_block_timestamp",
+    "last_timestamp",
+    "last_prices_timestamp",
+    "rate_time",
+    "prev_p_o_time",
+)
+
+
+class _FingerprintPickler(pickle.Pickler):
+    """
+    Pickler leaving out the simulated clocks of contracts, and the
+    attributes of `exclude` (`{id(obj): attribute names}`).
+    """
+
+    def __init__(self, file, exclude=None):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.exclude = exclude or {}
+
+    def reducer_override(self, obj):
+        if isinstance(obj, BlocktimestampMixins):
+            names = CLOCK_ATTRS + tuple(self.exclude.get(id(obj), ()))
+        elif id(obj) in self.exclude:
+            names = tuple(self.exclude[id(obj)])
+        else:
+            return NotImplemented
+        func, args, state, *rest = obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
+        if isinstance(state, tuple):
+            state = tuple(_without(s, names) for s in state)
+        else:
+            state = _without(state, names)
+        return (func, args, state, *rest)
+
+
+def _without(state, names):
+    if not isinstance(state, dict):
+        return state
+    return {k: v for k, v in state.items() if k not in names}
+
+
+def fingerprint(obj, exclude=None) -> str:
+    """
+    Hash of the pickled `obj` with the simulated clocks left out, so
+    markets built from the same metadata hash alike.
+
+    Parameters
+    ----------
+    obj :
+        Object to hash.
+
+    exclude : dict, optional
+        Attribute names to leave out, by `id` of the object holding them.
+    """
+    buf = io.BytesIO()
+    _FingerprintPickler(buf, exclude).dump(obj)
+    return sha256(buf.getvalue()).hexdigest()
+
+
+def data_fingerprint(price_sampler) -> str:
+    """
+    Hash of the price/volume (and peg price) data of `price_sampler`,
+    or of the pickled sampler when it has no `prices` frame.
+    """
+    if not isinstance(getattr(price_sampler, "prices", None), pd.DataFrame):
+        return fingerprint(price_sampler)
+
+    frames = [price_sampler.prices, getattr(price_sampler, "volumes", None)]
+    peg_prices = getattr(price_sampler, "peg_prices", None) or {}
+    for symbols in sorted(peg_prices):
+        frames += [symbols, peg_prices[symbols]]
+
+    h = sha256()
+    for frame in frames:
+        if isinstance(frame, pd.DataFrame):
+            h.update(repr(list(frame.columns)).encode())
+            h.update(pd.util.hash_pandas_object(frame).to_numpy().tobytes())
+        else:
+            h.update(repr(frame).encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of pickled run results, one file per run key.
+
+    Results are written atomically, so a crash never leaves a partial
+    entry behind.
+    """
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def run_keys(self, param_sampler, price_sampler, strategy):
+        """
+        Returns a function mapping the `(params, sim_market)` of a run
+        to its key. `sim_market` is only hashed for param samplers
+        without a `sim_market_template`.
+        """
+        common = (
+            __version__,
+            type(strategy).__module__,
+            type(strategy).__qualname__,
+            fingerprint(strategy),
+            data_fingerprint(price_sampler),
+        )
+        template = getattr(param_sampler, "sim_market_template", None)
+        if template is not None:
+            common += (fingerprint(template), getattr(param_sampler, "sim_mode", None))
+
+        def run_key(params, sim_market):
+            market = () if template is not None else (fingerprint(sim_market),)
+            payload = repr(common + market + (sorted(params.items()),))
+            return sha256(payload.encode()).hexdigest()
+
+        return run_key
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        with open(self._path(key), "rb") as f:
+            return pickle.load(f)
+
+    def put(self, key, result):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def clear(self):
+        """Deletes every cached result."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                os.unlink(os.path.join(self.directory, name))
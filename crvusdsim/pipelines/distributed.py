@@ -0,0 +1,616 @@
+"""
+Work queues for running pipeline sweeps on several hosts.
+
+With a `work_queue`, :func:`~crvusdsim.pipelines.run_pipeline` acts as the
+coordinator of a sweep: it publishes the inputs shared by all runs
+(strategy, param_sampler with its market template, price_sampler) once as
+the sweep's template, then one small task per run carrying the sweep id
+and the run's params. Workers started with :func:`run_worker` on any host
+pull the tasks, build the market from the template, run the strategy and
+push the pickled metrics back.
+
+The transport is pluggable through :class:`WorkQueue`:
+
+- :class:`DirectoryQueue` uses a directory shared by all hosts (e.g. NFS),
+- :class:`QueueServer` serves an in-process :class:`MemoryQueue` over TCP
+  to :class:`TCPQueue` clients.
+
+A claimed task is leased to its worker for `lease_timeout` seconds: if no
+result was pushed by then (e.g. the worker died), the task is queued again
+for another worker. The lease must therefore exceed the longest run; a run
+that outlives it is simply run twice, and the coordinator keeps the first
+result.
+
+Examples
+--------
+On the coordinator:
+
+>>> with QueueServer(("0.0.0.0", 7340), authkey=b"secret") as server:
+...     autosim("wsteth", sim_mode="pool", A=A_grid, work_queue=server.queue)
+
+and on each worker host:
+
+.. code-block:: bash
+
+    python -m crvusdsim.pipelines.distributed --connect coordinator:7340 --authkey secret
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+import traceback
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict, deque
+from hashlib import sha1
+from multiprocessing.connection import Client, Listener
+from threading import Condition, Thread
+from uuid import uuid4
+
+from curvesim.exceptions import CurvesimValueError
+from curvesim.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class WorkQueue(ABC):
+    """
+    Transport between a sweep coordinator and its workers.
+
+    Templates, tasks and results are opaque pickled bytes, keyed by the
+    sweep id and the index of the run in the sweep.
+    """
+
+    @abstractmethod
+    def publish(self, sweep_id, template):
+        """Stores the template shared by the tasks of `sweep_id`."""
+
+    @abstractmethod
+    def template(self, sweep_id):
+        """Returns the template of `sweep_id`, or None once discarded."""
+
+    @abstractmethod
+    def put_task(self, sweep_id, i, task):
+        """Queues the task of run `i` of `sweep_id`."""
+
+    @abstractmethod
+    def get_task(self, timeout=None):
+        """
+        Claims the next task of any sweep, returning `(sweep_id, i, task)`,
+        or None if there was none within `timeout` seconds.
+        """
+
+    @abstractmethod
+    def put_result(self, sweep_id, i, result):
+        """Pushes the result of run `i` of `sweep_id`, releasing its task."""
+
+    @abstractmethod
+    def get_result(self, sweep_id, timeout=None):
+        """
+        Pops a result of `sweep_id`, returning `(i, result)`, or None if
+        there was none within `timeout` seconds.
+        """
+
+    @abstractmethod
+    def discard(self, sweep_id):
+        """Drops the template, queued tasks and results of `sweep_id`."""
+
+
+class MemoryQueue(WorkQueue):
+    """Thread-safe in-process queue, served to other hosts by :class:`QueueServer`."""
+
+    def __init__(self, lease_timeout=3600):
+        """
+        Parameters
+        ----------
+        lease_timeout : float, default=3600
+            Seconds after which a claimed task without result is queued
+            again, None to never requeue.
+        """
+        self.lease_timeout = lease_timeout
+        self._templates = {}
+        self._tasks = deque()
+        self._claimed = {}
+        self._results = defaultdict(deque)
+        self._changed = Condition()
+
+    def publish(self, sweep_id, template):
+        with self._changed:
+            self._templates[sweep_id] = template
+
+    def template(self, sweep_id):
+        with self._changed:
+            return self._templates.get(sweep_id)
+
+    def put_task(self, sweep_id, i, task):
+        with self._changed:
+            self._tasks.append((sweep_id, i, task))
+            self._changed.notify_all()
+
+    def _requeue_expired(self, now):
+        """Queues the expired claims again, returning the next expiry."""
+        next_expiry = None
+        for key, (expiry, task) in list(self._claimed.items()):
+            if expiry <= now:
+                del self._claimed[key]
+                self._tasks.append((*key, task))
+                logger.warning("Lease of run %d of sweep %s expired", key[1], key[0])
+            elif next_expiry is None or expiry < next_expiry:
+                next_expiry = expiry
+        return next_expiry
+
+    def get_task(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while True:
+                now = time.monotonic()
+                next_expiry = self._requeue_expired(now)
+                if self._tasks:
+                    sweep_id, i, task = self._tasks.popleft()
+                    if self.lease_timeout is not None:
+                        self._claimed[sweep_id, i] = (now + self.lease_timeout, task)
+                    return sweep_id, i, task
+                if deadline is not None and now >= deadline:
+                    return None
+                waits = [t - now for t in (deadline, next_expiry) if t is not None]
+                self._changed.wait(min(waits) if waits else None)
+
+    def put_result(self, sweep_id, i, result):
+        with self._changed:
+            self._claimed.pop((sweep_id, i), None)
+            if sweep_id in self._templates:
+                self._results[sweep_id].append((i, result))
+                self._changed.notify_all()
+
+    def get_result(self, sweep_id, timeout=None):
+        with self._changed:
+            if self._changed.wait_for(lambda: self._results.get(sweep_id), timeout):
+                return self._results[sweep_id].popleft()
+        return None
+
+    def discard(self, sweep_id):
+        with self._changed:
+            self._templates.pop(sweep_id, None)
+            self._results.pop(sweep_id, None)
+            self._tasks = deque(t for t in self._tasks if t[0] != sweep_id)
+            self._claimed = {
+                key: claim for key, claim in self._claimed.items() if key[0] != sweep_id
+            }
+
+
+class DirectoryQueue(WorkQueue):
+    """
+    Queue kept as files in a directory shared by the coordinator and workers.
+
+    Files are written atomically and tasks are claimed by renaming them, so
+    any number of workers can poll the same directory. A claimed task stays
+    in the "claimed" subdirectory until its result is pushed; workers move
+    claims whose modification time is older than `lease_timeout` back to
+    the tasks.
+    """
+
+    def __init__(self, directory, poll_interval=0.2, lease_timeout=3600):
+        """
+        Parameters
+        ----------
+        directory : str
+            Queue directory, created if missing.
+
+        poll_interval : float, default=0.2
+            Seconds between two polls of the directory while waiting.
+
+        lease_timeout : float, default=3600
+            Seconds after which a claimed task without result is queued
+            again, None to never requeue.
+        """
+        self.directory = str(directory)
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+        self._claims = {}
+        for sub in ("templates", "tasks", "claimed", "results"):
+            os.makedirs(os.path.join(self.directory, sub), exist_ok=True)
+
+    def _path(self, *parts):
+        return os.path.join(self.directory, *parts)
+
+    def _write(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _poll(self, attempt, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            found = attempt()
+            if found is not None:
+                return found
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def publish(self, sweep_id, template):
+        self._write(self._path("templates", sweep_id + ".pkl"), template)
+        os.makedirs(self._path("results", sweep_id), exist_ok=True)
+
+    def template(self, sweep_id):
+        try:
+            with open(self._path("templates", sweep_id + ".pkl"), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put_task(self, sweep_id, i, task):
+        self._write(self._path("tasks", f"{sweep_id}-{i:09d}.pkl"), task)
+
+    def _requeue_expired(self):
+        if self.lease_timeout is None:
+            return
+        expired = time.time() - self.lease_timeout
+        for claim in os.listdir(self._path("claimed")):
+            path = self._path("claimed", claim)
+            try:
+                if os.path.getmtime(path) > expired:
+                    continue
+                # claims are named "<token>-<task name>"
+                os.rename(path, self._path("tasks", claim.split("-", 1)[1]))
+            except FileNotFoundError:
+                continue  # released, or requeued by another worker
+            logger.warning("Lease of task %s expired", claim)
+
+    def _claim_task(self):
+        self._requeue_expired()
+        for name in sorted(os.listdir(self._path("tasks"))):
+            if not name.endswith(".pkl"):
+                continue
+            claimed = self._path("claimed", f"{uuid4().hex}-{name}")
+            try:
+                os.rename(self._path("tasks", name), claimed)
+            except FileNotFoundError:
+                continue  # claimed by another worker
+            # the lease starts now, not when the task was queued
+            os.utime(claimed)
+            with open(claimed, "rb") as f:
+                task = f.read()
+            sweep_id, i = name[: -len(".pkl")].rsplit("-", 1)
+            self._claims[sweep_id, int(i)] = claimed
+            return sweep_id, int(i), task
+        return None
+
+    def get_task(self, timeout=None):
+        return self._poll(self._claim_task, timeout)
+
+    def put_result(self, sweep_id, i, result):
+        results_dir = self._path("results", sweep_id)
+        if os.path.isdir(results_dir):
+            self._write(os.path.join(results_dir, f"{i:09d}.pkl"), result)
+        claimed = self._claims.pop((sweep_id, i), None)
+        if claimed is not None:
+            try:
+                os.unlink(claimed)
+            except FileNotFoundError:
+                pass  # lease expired and requeued
+
+    def _pop_result(self, sweep_id):
+        results_dir = self._path("results", sweep_id)
+        for name in sorted(os.listdir(results_dir)):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(results_dir, name)
+            with open(path, "rb") as f:
+                result = f.read()
+            os.unlink(path)
+            return int(name[: -len(".pkl")]), result
+        return None
+
+    def get_result(self, sweep_id, timeout=None):
+        return self._poll(lambda: self._pop_result(sweep_id), timeout)
+
+    def discard(self, sweep_id):
+        for name in os.listdir(self._path("tasks")):
+            if name.startswith(sweep_id + "-"):
+                try:
+                    os.unlink(self._path("tasks", name))
+                except FileNotFoundError:
+                    pass
+        for claim in os.listdir(self._path("claimed")):
+            if claim.split("-", 1)[1].startswith(sweep_id + "-"):
+                try:
+                    os.unlink(self._path("claimed", claim))
+                except FileNotFoundError:
+                    pass
+        results_dir = self._path("results", sweep_id)
+        if os.path.isdir(results_dir):
+            for name in os.listdir(results_dir):
+                os.unlink(os.path.join(results_dir, name))
+            try:
+                os.rmdir(results_dir)
+            except OSError:
+                pass  # a late result is being written
+        try:
+            os.unlink(self._path("templates", sweep_id + ".pkl"))
+        except FileNotFoundError:
+            pass
+
+
+_QUEUE_METHODS = (
+    "publish",
+    "template",
+    "put_task",
+    "get_task",
+    "put_result",
+    "get_result",
+    "discard",
+)
+
+
+class QueueServer:
+    """
+    Serves a :class:`MemoryQueue` over TCP to :class:`TCPQueue` clients,
+    from background threads of the coordinator process.
+
+    The coordinator uses :attr:`queue` directly.
+    """
+
+    def __init__(self, address=("localhost", 0), authkey=None, lease_timeout=3600):
+        """
+        Parameters
+        ----------
+        address : tuple, default=("localhost", 0)
+            `(host, port)` to listen on; port 0 picks a free port,
+            see :attr:`address`.
+
+        authkey : bytes, optional
+            Key the clients must present, defaults to a random one.
+
+        lease_timeout : float, default=3600
+            Lease of the claimed tasks, see :class:`MemoryQueue`.
+        """
+        self.queue = MemoryQueue(lease_timeout=lease_timeout)
+        self.authkey = authkey or os.urandom(32)
+        self._listener = Listener(address, authkey=self.authkey)
+        self.address = self._listener.address
+        self._stopped = False
+        self._thread = Thread(target=self._accept, daemon=True)
+        self._thread.start()
+        logger.info("Serving work queue on %s:%d", *self.address)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _accept(self):
+        while not self._stopped:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError):
+                continue  # failed handshake, or closed listener
+            Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn:
+            while True:
+                try:
+                    method, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if method not in _QUEUE_METHODS:
+                    error = CurvesimValueError(f"Unknown queue method {method}")
+                    reply = (False, error)
+                else:
+                    try:
+                        reply = (True, getattr(self.queue, method)(*args))
+                    except Exception as e:  # pylint: disable=broad-exception-caught
+                        logger.error("Queue method %s failed", method, exc_info=True)
+                        reply = (False, e)
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    return
+                except Exception:  # pylint: disable=broad-exception-caught
+                    # unpicklable exception
+                    conn.send((False, RuntimeError(traceback.format_exc())))
+
+    def close(self):
+        """Stops accepting connections."""
+        self._stopped = True
+        try:
+            # wake up the blocked `accept`
+            Client(self.address, authkey=self.authkey).close()
+        except OSError:
+            pass
+        self._thread.join()
+        self._listener.close()
+
+
+class TCPQueue(WorkQueue):
+    """Client of the :class:`MemoryQueue` of a :class:`QueueServer`."""
+
+    def __init__(self, address, authkey):
+        """
+        Parameters
+        ----------
+        address : tuple
+            `(host, port)` of the server.
+
+        authkey : bytes
+            Key of the server.
+        """
+        self._conn = Client(tuple(address), authkey=authkey)
+
+    def _call(self, method, *args):
+        self._conn.send((method, args))
+        ok, value = self._conn.recv()
+        if not ok:
+            raise value
+        return value
+
+    def close(self):
+        self._conn.close()
+
+    def publish(self, sweep_id, template):
+        return self._call("publish", sweep_id, template)
+
+    def template(self, sweep_id):
+        return self._call("template", sweep_id)
+
+    def put_task(self, sweep_id, i, task):
+        return self._call("put_task", sweep_id, i, task)
+
+    def get_task(self, timeout=None):
+        return self._call("get_task", timeout)
+
+    def put_result(self, sweep_id, i, result):
+        return self._call("put_result", sweep_id, i, result)
+
+    def get_result(self, sweep_id, timeout=None):
+        return self._call("get_result", sweep_id, timeout)
+
+    def discard(self, sweep_id):
+        return self._call("discard", sweep_id)
+
+
+def run_sweep(
+    work_queue, strategy, param_sampler, price_sampler, runs, on_result, max_in_flight
+):
+    """
+    Coordinator side of :func:`~crvusdsim.pipelines.run_pipeline` with a
+    `work_queue`: publishes the template and the `(i, params, sim_market)`
+    runs, calling `on_result(i, metrics)` as their results come back.
+
+    `sim_market` is only sent with the task when `param_sampler` is None;
+    otherwise the workers build it with `param_sampler.make_market`.
+    """
+    template = pickle.dumps((strategy, param_sampler, price_sampler))
+    sweep_id = sha1(template).hexdigest()[:16] + uuid4().hex[:8]
+    work_queue.publish(sweep_id, template)
+    logger.info("Published sweep %s (%d bytes)", sweep_id, len(template))
+
+    runs = iter(runs)
+    pending = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and (
+                max_in_flight is None or len(pending) < max_in_flight
+            ):
+                try:
+                    i, params, sim_market = next(runs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                work_queue.put_task(sweep_id, i, pickle.dumps((params, sim_market)))
+                pending.add(i)
+
+            if not pending:
+                return
+
+            popped = work_queue.get_result(sweep_id, timeout=60)
+            if popped is None:
+                logger.info("Sweep %s: waiting on %d runs", sweep_id, len(pending))
+                continue
+            i, result = popped
+            if i not in pending:
+                continue  # rerun after an expired lease
+            pending.remove(i)
+            ok, metrics = pickle.loads(result)
+            if not ok:
+                raise metrics
+            on_result(i, metrics)
+    finally:
+        work_queue.discard(sweep_id)
+
+
+def run_worker(work_queue, max_tasks=None, idle_timeout=None, max_cached=2):
+    """
+    Runs tasks from `work_queue` until `max_tasks` are done or no task
+    arrived for `idle_timeout` seconds (forever by default).
+
+    Parameters
+    ----------
+    work_queue : :class:`WorkQueue`
+        Queue to pull tasks from.
+
+    max_tasks : int, optional
+        Number of tasks after which to return.
+
+    idle_timeout : float, optional
+        Seconds without tasks after which to return.
+
+    max_cached : int, default=2
+        Number of sweep templates kept unpickled.
+
+    Returns
+    -------
+    int
+        Number of tasks run.
+    """
+    templates = OrderedDict()
+    n_tasks = 0
+    while max_tasks is None or n_tasks < max_tasks:
+        task = work_queue.get_task(timeout=idle_timeout)
+        if task is None:
+            break
+        sweep_id, i, payload = task
+
+        if sweep_id in templates:
+            templates.move_to_end(sweep_id)
+        else:
+            template = work_queue.template(sweep_id)
+            if template is None:
+                continue  # sweep was discarded
+            templates[sweep_id] = pickle.loads(template)
+            while len(templates) > max_cached:
+                templates.popitem(last=False)
+        strategy, param_sampler, price_sampler = templates[sweep_id]
+
+        try:
+            params, sim_market = pickle.loads(payload)
+            if param_sampler is not None:
+                sim_market = param_sampler.make_market(params)
+            result = (True, strategy(sim_market, params, price_sampler))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Run %d of sweep %s failed", i, sweep_id, exc_info=True)
+            result = (False, e)
+        try:
+            result = pickle.dumps(result)
+        except Exception:  # pylint: disable=broad-exception-caught
+            result = pickle.dumps((False, RuntimeError(traceback.format_exc())))
+        work_queue.put_result(sweep_id, i, result)
+        n_tasks += 1
+    return n_tasks
+
+
+def main(argv=None):
+    """Command-line entry point of a worker."""
+    parser = argparse.ArgumentParser(
+        prog="python -m crvusdsim.pipelines.distributed",
+        description="Run pipeline tasks from a work queue",
+    )
+    transport = parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument("--dir", help="directory of a DirectoryQueue")
+    transport.add_argument("--connect", help="host:port of a QueueServer")
+    parser.add_argument("--authkey", default="", help="key of the QueueServer")
+    parser.add_argument("--max-tasks", type=int, default=None)
+    parser.add_argument("--idle-timeout", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    if args.dir:
+        work_queue = DirectoryQueue(args.dir)
+    else:
+        host, port = args.connect.rsplit(":", 1)
+        work_queue = TCPQueue((host, int(port)), authkey=args.authkey.encode())
+    n_tasks = run_worker(
+        work_queue, max_tasks=args.max_tasks, idle_timeout=args.idle_timeout
+    )
+    logger.info("Worker ran %d tasks", n_tasks)
+
+
+if __name__ == "__main__":
+    main()
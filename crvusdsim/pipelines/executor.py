@@ -0,0 +1,188 @@
+"""
+Persistent worker pool for repeated pipeline runs.
+
+A :class:`PipelineExecutor` keeps its worker processes (and their
+imports) and logging queue alive across :func:`~crvusdsim.pipelines.run_pipeline`
+calls. The inputs shared by the runs of a call (strategy, param_sampler,
+price_sampler) are pickled once into a shared memory block. Workers
+unpickle each part once and keep the most recent ones cached: the market
+template of the param_sampler under its :func:`~crvusdsim.pipelines.cache.fingerprint`,
+so sweeps over the same market reuse it whatever their parameters, and
+the other parts by content hash. Shared price samplers are attached per
+task and detached after it, since their block only lives for one call.
+"""
+import os
+import pickle
+from collections import OrderedDict
+from copy import copy
+from contextlib import ExitStack, contextmanager
+from hashlib import sha1
+from multiprocessing import Pool as cpu_pool
+from multiprocessing import resource_tracker, shared_memory
+
+from curvesim.logging import (
+    configure_multiprocess_logging,
+    get_logger,
+    multiprocessing_logging_queue,
+)
+
+from .cache import fingerprint
+
+logger = get_logger(__name__)
+
+# per-process state of executor workers
+_cache = OrderedDict()
+_max_cached = 0
+
+
+class PipelineExecutor:
+    """
+    Opt-in persistent executor for :func:`~crvusdsim.pipelines.run_pipeline`,
+    e.g. through `pipeline(executor=...)` or `autosim(executor=...)`.
+
+    Runs one pipeline at a time; close it (or use it as a context manager)
+    when done.
+
+    Examples
+    --------
+    The workers build the market template once, and reuse it for each call:
+
+    >>> with PipelineExecutor(ncpu=8) as executor:
+    ...     for A in (50, 100, 150):
+    ...         autosim("wsteth", sim_mode="pool", A=[A], executor=executor)
+    """
+
+    def __init__(self, ncpu=None, max_cached=8):
+        """
+        Parameters
+        ----------
+        ncpu : int, default=os.cpu_count()
+            Number of worker processes.
+
+        max_cached : int, default=8
+            Number of shared inputs (market templates, strategies, ...)
+            each worker keeps unpickled.
+        """
+        self.ncpu = ncpu or os.cpu_count()
+        # workers must share the parent's tracker, or each of them
+        # reports the blocks it attached to as leaked when it exits
+        resource_tracker.ensure_running()
+        self._stack = ExitStack()
+        self.logging_queue = self._stack.enter_context(multiprocessing_logging_queue())
+        self.pool = cpu_pool(
+            self.ncpu,
+            initializer=init_executor_worker,
+            initargs=(self.logging_queue, max_cached),
+        )
+        self._stack.callback(self.pool.terminate)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextmanager
+    def share(self, **parts):
+        """
+        Pickles `parts` into a shared memory block for the duration of
+        the context, yielding the reference that :func:`load_shared`
+        turns back into the dict of parts in a worker.
+
+        The market template of a `param_sampler` is shared as a part of
+        its own, and its `parameter_sequence` is left out: the workers
+        only get the parameters of their runs.
+        """
+        parts = dict(parts)
+        keys = {}
+        param_sampler = parts.get("param_sampler")
+        template = getattr(param_sampler, "sim_market_template", None)
+        if template is not None:
+            param_sampler = copy(param_sampler)
+            param_sampler.sim_market_template = None
+            param_sampler.parameter_sequence = None
+            parts["param_sampler"] = param_sampler
+            parts["market_template"] = template
+            keys["market_template"] = "market:" + fingerprint(template)
+
+        blobs = {name: pickle.dumps(obj) for name, obj in parts.items()}
+        size = sum(len(blob) for blob in blobs.values())
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            layout = []
+            offset = 0
+            for name, blob in blobs.items():
+                shm.buf[offset : offset + len(blob)] = blob
+                if hasattr(parts[name], "detach"):
+                    key = None  # per-call shared memory proxy
+                else:
+                    key = keys.get(name) or sha1(blob).hexdigest()
+                layout.append((name, key, offset, len(blob)))
+                offset += len(blob)
+            yield shm.name, tuple(layout)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        """Waits for the workers to exit and stops the logging queue."""
+        self.pool.close()
+        self.pool.join()
+        self._stack.close()
+
+
+def init_executor_worker(logging_queue, max_cached):
+    """Pool initializer of :class:`PipelineExecutor` workers."""
+    global _max_cached  # pylint: disable=global-statement
+    configure_multiprocess_logging(logging_queue)
+    _max_cached = max_cached
+
+
+def load_shared(ref):
+    """
+    Returns the parts shared by :meth:`PipelineExecutor.share`, reusing
+    the ones this worker already unpickled.
+    """
+    name, layout = ref
+    parts = {}
+    shm = None
+    try:
+        for part, key, offset, size in layout:
+            if key is not None and key in _cache:
+                _cache.move_to_end(key)
+                parts[part] = _cache[key]
+                continue
+            if shm is None:
+                shm = shared_memory.SharedMemory(name=name)
+            parts[part] = pickle.loads(shm.buf[offset : offset + size])
+            if key is not None:
+                _cache[key] = parts[part]
+    finally:
+        if shm is not None:
+            shm.close()
+
+    while len(_cache) > max(_max_cached, len(layout)):
+        _cache.popitem(last=False)
+
+    template = parts.pop("market_template", None)
+    if template is not None:
+        parts["param_sampler"] = copy(parts["param_sampler"])
+        parts["param_sampler"].sim_market_template = template
+    return parts
+
+
+def executor_task(task):
+    """
+    Runs the strategy of the shared inputs on one market, carried by the
+    task or built in the worker when a param_sampler is shared.
+    """
+    i, (ref, params, sim_market) = task
+    shared = load_shared(ref)
+    price_sampler = shared["price_sampler"]
+    try:
+        if shared["param_sampler"] is not None:
+            sim_market = shared["param_sampler"].make_market(params)
+        return i, shared["strategy"](sim_market, params, price_sampler)
+    finally:
+        if hasattr(price_sampler, "detach"):
+            price_sampler.detach()
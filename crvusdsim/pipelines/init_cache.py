@@ -0,0 +1,116 @@
+"""
+Per-process cache of markets initialised by a bands strategy.
+
+Initialising the bands of a market (e.g. the price steps of
+:meth:`~crvusdsim.templates.BandsStrategy.BandsStrategy.find_active_band_by_step`
+or the loans of :class:`~crvusdsim.pipelines.simple.bands_strategy.SimpleUsersBandsStrategy`)
+costs the same for every parameter variant of a sweep, and variants that
+only differ in parameters the initialisation ignores end up in the same
+state. Bands strategies list those parameters in `init_independent_params`;
+:class:`InitStateCache` keys initialised markets by everything else (the
+market without these parameters, the other run parameters, the bands
+strategy and its kwargs, and the prices) and hands out copies of them with
+the variant's own values of the independent parameters.
+"""
+from collections import OrderedDict
+from copy import deepcopy
+from hashlib import sha256
+
+import pandas as pd
+
+from curvesim.logging import get_logger
+
+from .cache import fingerprint
+
+logger = get_logger(__name__)
+
+
+def init_target(sim_market, sim_mode):
+    """Returns the object holding the variable params of `sim_mode`."""
+    if sim_mode == "pool":
+        return sim_market.pool
+    if sim_mode == "controller":
+        return sim_market.controller
+    if sim_mode == "rate":
+        return sim_market.policy
+    return None
+
+
+class InitStateCache:
+    """
+    LRU cache of initialised markets, holding copies the runs cannot modify.
+    """
+
+    def __init__(self, max_size=4):
+        """
+        Parameters
+        ----------
+        max_size : int, default=4
+            Number of initialised markets kept.
+        """
+        self.max_size = max_size
+        self._markets = OrderedDict()
+
+    def key(
+        self,
+        sim_market,
+        sim_mode,
+        parameters,
+        bands_strategy_class,
+        bands_strategy_kwargs,
+        prices,
+    ):
+        """
+        Returns the key of the initialised state of `sim_market`, which
+        ignores the `init_independent_params` of `bands_strategy_class`.
+        """
+        independent = bands_strategy_class.init_independent_params
+        target = init_target(sim_market, sim_mode)
+        exclude = {id(target): independent} if target is not None else None
+
+        h = sha256()
+        h.update(fingerprint(sim_market, exclude=exclude).encode())
+        h.update(fingerprint((bands_strategy_class, bands_strategy_kwargs)).encode())
+        relevant = sorted(
+            (k, v) for k, v in (parameters or {}).items() if k not in independent
+        )
+        h.update(repr((sim_mode, relevant)).encode())
+        h.update(repr(list(prices.columns)).encode())
+        h.update(pd.util.hash_pandas_object(prices).to_numpy().tobytes())
+        return h.hexdigest()
+
+    def get(self, key, sim_market, sim_mode, bands_strategy_class):
+        """
+        Returns a copy of the initialised market of `key`, with the
+        independent params of `sim_market`, or None when not cached.
+        """
+        if key not in self._markets:
+            return None
+        self._markets.move_to_end(key)
+        initialised = deepcopy(self._markets[key])
+
+        target = init_target(sim_market, sim_mode)
+        if target is not None:
+            initialised_target = init_target(initialised, sim_mode)
+            for name in bands_strategy_class.init_independent_params:
+                if hasattr(target, name):
+                    setattr(initialised_target, name, getattr(target, name))
+        return initialised
+
+    def put(self, key, sim_market):
+        """Stores a copy of the initialised `sim_market`."""
+        self._markets[key] = deepcopy(sim_market)
+        self._markets.move_to_end(key)
+        while len(self._markets) > self.max_size:
+            self._markets.popitem(last=False)
+
+    def clear(self):
+        """Drops every cached market."""
+        self._markets.clear()
+
+    def __len__(self):
+        return len(self._markets)
+
+
+# shared by the strategies of this process
+init_states = InitStateCache()
@@ -0,0 +1,198 @@
+"""
+Throughput and progress instrumentation of simulation runs.
+
+Each :class:`~crvusdsim.templates.Strategy` run keeps a :class:`RunStats`
+with its counters (samples, trades, liquidations, state log snapshots and
+their pickled size) and the wall time spent in each phase of a step. The
+stats are logged every `report_interval` seconds and at the end of the run,
+with the counters attached to the log record, so updates from pipeline
+workers reach the parent process through the multiprocessing logging queue.
+
+:class:`ProgressMonitor` collects these updates in the parent, across
+workers, and passes them to an optional callback:
+
+>>> with ProgressMonitor(callback=print) as monitor:
+...     autosim("wsteth", sim_mode="pool", A=[50, 100, 150])
+>>> monitor.summary().sort_values("samples_per_second")
+"""
+import logging
+import os
+import socket
+from time import perf_counter
+from uuid import uuid4
+
+import pandas as pd
+
+from curvesim.logging import get_logger
+
+logger = get_logger(__name__)
+
+PHASES = (
+    "price_sampler",
+    "stableswap",
+    "oracle_update",
+    "trader_compute",
+    "trade_execution",
+    "after_trades",
+    "state_log",
+)
+COUNTERS = ("samples", "trades", "liquidations", "snapshots", "snapshot_bytes")
+
+
+class RunStats:
+    """
+    Counters and per-phase wall times of one simulation run.
+
+    Phases are timed with :meth:`lap`, which charges the time elapsed
+    since the previous lap to the given phase.
+    """
+
+    def __init__(self, parameters, n_samples, report_interval=30):
+        """
+        Parameters
+        ----------
+        parameters : dict
+            Parameters of the run.
+
+        n_samples : int
+            Number of samples of the run, for the ETA.
+
+        report_interval : float, default=30
+            Seconds between two progress reports, None for final reports only.
+        """
+        self.run_id = uuid4().hex[:12]
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.parameters = parameters
+        self.n_samples = n_samples
+        self.report_interval = report_interval
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+        self.start = self._last = perf_counter()
+        self._next_report = (
+            self.start + report_interval if report_interval is not None else None
+        )
+
+    def lap(self, phase=None):
+        """Charges the time since the last lap to `phase`."""
+        now = perf_counter()
+        if phase is not None:
+            self.phase_times[phase] += now - self._last
+        self._last = now
+
+    def step(self, trades=0, liquidations=0, snapshot_bytes=0):
+        """
+        Counts a processed sample with its trades, liquidations and
+        recorded state snapshot, reporting progress when due.
+        """
+        counters = self.counters
+        counters["samples"] += 1
+        counters["trades"] += trades
+        counters["liquidations"] += liquidations
+        counters["snapshots"] += 1
+        counters["snapshot_bytes"] += snapshot_bytes
+        if self._next_report is not None and self._last >= self._next_report:
+            self._next_report = self._last + self.report_interval
+            self.report()
+
+    def snapshot(self, finished=False):
+        """Returns the current stats as a flat dict."""
+        elapsed = perf_counter() - self.start
+        samples = self.counters["samples"]
+        rate = samples / elapsed if elapsed > 0 else 0.0
+        remaining = self.n_samples - samples
+        return {
+            "run_id": self.run_id,
+            "worker": self.worker,
+            "parameters": self.parameters,
+            "finished": finished,
+            "n_samples": self.n_samples,
+            **self.counters,
+            "elapsed": elapsed,
+            "samples_per_second": rate,
+            "eta": remaining / rate if rate > 0 else None,
+            **{phase + "_time": t for phase, t in self.phase_times.items()},
+        }
+
+    def report(self, finished=False):
+        """Logs the current stats, attached to the record as `run_stats`."""
+        stats = self.snapshot(finished)
+        if finished:
+            slowest = max(PHASES, key=self.phase_times.__getitem__)
+            logger.info(
+                "Finished %s: %d samples in %.1fs (%.1f/s), %d trades, "
+                "%d liquidations, %d snapshots (%d bytes), mostly in %s",
+                self.parameters,
+                stats["samples"],
+                stats["elapsed"],
+                stats["samples_per_second"],
+                stats["trades"],
+                stats["liquidations"],
+                stats["snapshots"],
+                stats["snapshot_bytes"],
+                slowest,
+                extra={"run_stats": stats},
+            )
+        else:
+            logger.info(
+                "%s: %d/%d samples (%.1f/s), ETA %.0fs",
+                self.parameters,
+                stats["samples"],
+                self.n_samples,
+                stats["samples_per_second"],
+                stats["eta"] or 0,
+                extra={"run_stats": stats},
+            )
+        return stats
+
+
+class ProgressMonitor(logging.Handler):
+    """
+    Collects the :class:`RunStats` reports of all runs, in this process and
+    in pipeline workers, keeping the latest one of each run.
+
+    Must be entered (or added to the root logger) before the pipeline
+    starts its workers, e.g. before creating a
+    :class:`~crvusdsim.pipelines.executor.PipelineExecutor`: the logging
+    queue only forwards records to the handlers present when it starts.
+    """
+
+    def __init__(self, callback=None):
+        """
+        Parameters
+        ----------
+        callback : callable, optional
+            Called with the stats dict of every report.
+        """
+        super().__init__()
+        self.callback = callback
+        self.runs = {}
+
+    def __enter__(self):
+        logging.getLogger().addHandler(self)
+        return self
+
+    def __exit__(self, *exc):
+        logging.getLogger().removeHandler(self)
+
+    def emit(self, record):
+        stats = getattr(record, "run_stats", None)
+        if stats is None:
+            return
+        self.runs[stats["run_id"]] = stats
+        if self.callback is not None:
+            self.callback(stats)
+
+    def summary(self):
+        """
+        Returns the latest stats of each run as a DataFrame, one row
+        per run.
+        """
+        return pd.DataFrame(list(self.runs.values()))
+
+    def totals(self):
+        """Sums the counters and phase times of all runs."""
+        summary = self.summary()
+        columns = list(COUNTERS) + [phase + "_time" for phase in PHASES]
+        if summary.empty:
+            return pd.Series(0, index=columns)
+        return summary[columns].sum()
@@ -1,5 +1,6 @@
 import os
 
+from curvesim.exceptions import CurvesimValueError
 from curvesim.logging import get_logger
 from curvesim.templates import SimAssets
 
@@ -9,6 +10,7 @@ from crvusdsim.iterators.params_samplers import (
 )
 from crvusdsim.metrics.results.sim_results import SimResults
 from crvusdsim.pipelines import run_pipeline
+from crvusdsim.pipelines.adaptive import successive_halving
 from crvusdsim.metrics import init_metrics, make_results
 from crvusdsim.pipelines.common import (
     DEFAULT_CONTROLLER_METRICS,
@@ -22,6 +24,7 @@ from crvusdsim.pipelines.common import (
 from crvusdsim.pipelines.common import DEFAULT_POOL_PARAMS, TEST_PARAMS
 from crvusdsim.pipelines.simple.strategy import SimpleStrategy
 from crvusdsim.pool import get_sim_market
+from crvusdsim.pool.crvusd.price_oracle import PriceOracle, PriceOraclePath
 from crvusdsim.iterators.price_samplers import PriceVolume
 
 logger = get_logger(__name__)
@@ -46,6 +49,11 @@ def pipeline(  # pylint: disable=too-many-locals
     prices_max_interval=10 * 60,
     profit_threshold=0 * 10**18,
     ncpu=None,
+    executor=None,
+    result_cache=None,
+    search="grid",
+    search_kwargs=None,
+    work_queue=None,
 ) -> SimResults:
     """
     Implements the simple arbitrage pipeline.  This is a very simplified version
@@ -119,6 +127,28 @@ def pipeline(  # pylint: disable=too-many-locals
     profit_threshold: int, default=0
         Profit threshold for arbitrageurs, trades with profits below this value will not be executed
 
+    executor : :class:`~crvusdsim.pipelines.executor.PipelineExecutor`, optional
+        Persistent worker pool reused across calls, replaces `ncpu`.
+
+    result_cache : str, optional
+        Directory caching the result of each run, see
+        :class:`~crvusdsim.pipelines.cache.ResultCache`. Reruns only
+        simulate the parameters missing from the cache.
+
+    search : str, default="grid"
+        "grid" runs every combination of `variable_params` on the full price
+        path. "halving" runs them on a prefix of the path and only continues
+        the best ones, see :func:`~crvusdsim.pipelines.adaptive.successive_halving`;
+        the results then only hold the surviving parameters.
+
+    search_kwargs : dict, optional
+        Keyword arguments of the "halving" search (score, eta, min_fraction).
+
+    work_queue : :class:`~crvusdsim.pipelines.distributed.WorkQueue`, optional
+        Publish the runs to workers on this or other hosts instead of
+        running them on `ncpu` local cores, see
+        :mod:`crvusdsim.pipelines.distributed`.
+
 
 
     Returns
@@ -176,6 +206,12 @@ def pipeline(  # pylint: disable=too-many-locals
         pegcoins = [stable_pool.assets for stable_pool in sim_market.stableswap_pools]
         price_sampler.load_pegcoins_prices(src=src, pegcoins=pegcoins)
 
+    if isinstance(sim_market.price_oracle, PriceOracle):
+        # computed once, shared by every variant copied from sim_market
+        sim_market.price_oracle.use_path(
+            PriceOraclePath.from_series(price_sampler.prices)
+        )
+
     param_sampler = ParameterizedLLAMMAPoolIterator(
         sim_market,
         sim_mode=sim_mode,
@@ -201,7 +237,25 @@ def pipeline(  # pylint: disable=too-many-locals
         profit_threshold=profit_threshold,
     )
 
-    output = run_pipeline(param_sampler, price_sampler, strategy, ncpu=ncpu)
+    run_kwargs = {
+        "ncpu": ncpu,
+        "worker_markets": True,
+        "executor": executor,
+        "result_cache": result_cache,
+        "work_queue": work_queue,
+    }
+    if search == "grid":
+        output = run_pipeline(param_sampler, price_sampler, strategy, **run_kwargs)
+    elif search == "halving":
+        output = successive_halving(
+            param_sampler,
+            price_sampler,
+            strategy,
+            **(search_kwargs or {}),
+            **run_kwargs,
+        )
+    else:
+        raise CurvesimValueError(f"Unknown search {search}, use 'grid' or 'halving'")
 
     results = make_results(
         *output, _metrics, prices=price_sampler.prices, sim_mode=sim_mode
@@ -13,6 +13,10 @@ DEFAULT_USER_ADDRESS = "default_user_address"
 
 
 class SimpleUsersBandsStrategy(BandsStrategy):
+    # the loans are created at the first price timestamp, before
+    # any interest accrues
+    init_independent_params = frozenset({"rate0"})
+
     def __init__(
         self,
         pool: SimLLAMMAPool,
@@ -27,9 +31,6 @@ class SimpleUsersBandsStrategy(BandsStrategy):
         self.debt_ratios = debt_ratios
 
     def do_strategy(self):
-        # reset controller loans
-        self.controller.n_loans = 0
-
         self.pool.active_band = self.init_index
         self.pool.max_band = self.max_index
         self.pool.min_band = self.min_index
@@ -66,6 +67,10 @@ class SimpleUsersBandsStrategy(BandsStrategy):
 
 
 class IinitYBandsStrategy(BandsStrategy):
+    # fees are off while the bands are adjusted, but `fee` still
+    # sizes the trades of `get_amount_for_price`
+    init_independent_params = frozenset({"admin_fee"})
+
     def __init__(
         self,
         pool: SimLLAMMAPool,
@@ -183,9 +188,6 @@ class UserLoansBandsStrategy(BandsStrategy):
         self.pool.price_oracle_contract._price_last = p
         self.pool.price_oracle_contract._price_oracle = p
 
-        # reset controller
-        self.controller.n_loans = 0
-
         y_per_user = self.total_y / self.total_users
         N = self.max_index - self.min_index + 1
 
@@ -118,6 +118,10 @@ class SimMarketInstance:
             new_peg_keepers[i].FACTORY = new_factory
             new_peg_keepers[i].AGGREGATOR = new_aggregator
             new_aggregator.add_price_pair(new_stableswap_pools[i])
+        for pk in new_peg_keepers:
+            # only holds the copies of the policies made by `deepcopy(pk)`
+            pk._debt_observers = []
+        new_policy._bind_peg_keepers(new_peg_keepers)
 
         # add_market in new factory
         new_factory._add_market_without_creating(
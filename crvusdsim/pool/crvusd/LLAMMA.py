@@ -1,10 +1,13 @@
 """
 Mainly a module to house the `Curve Stablecoin`, a LLAMMA implementation in Python.
 """
+from bisect import bisect_left
 from collections import defaultdict
 import time
-from math import isqrt, prod
-from typing import List, Tuple
+from math import floor, log, prod
+from typing import Iterable, List, Tuple
+
+import numpy as np
 
 from curvesim.exceptions import CalculationError, CryptoPoolError
 from curvesim.logging import get_logger
@@ -16,6 +19,7 @@ from crvusdsim.pool.crvusd.stablecoin import StableCoin
 
 from .clac import exp, ln_int
 from .vyper_func import (
+    isqrt,
     pow_mod256,
     shift,
     unsafe_add,
@@ -72,6 +76,7 @@ class LLAMMAPool(
         "rate",
         "rate_time",
         "rate_mul",
+        "_rate_cache",  # ((ts, rate, rate_time, rate_mul, BASE_PRICE), (rate_mul, base_price))
         "active_band",
         "min_band",
         "max_band",
@@ -207,6 +212,7 @@ class LLAMMAPool(
         self.rate = 0 if rate is None else rate
         self.rate_time = self._block_timestamp
         self.rate_mul = 10**18 if rate_mul is None else rate_mul
+        self._rate_cache = None
 
         self.active_band = 0 if active_band is None else active_band
         self.min_band = 0 if min_band is None else min_band
@@ -330,16 +336,38 @@ class LLAMMAPool(
         """
         return max(self.fee, self._price_oracle_ro()[1])
 
-    def _rate_mul(self) -> int:
+    def _rate_state(self) -> Tuple[int, int]:
         """
-        @notice Rate multiplier which is 1.0 + integral(rate, dt)
-        @return Rate multiplier in units where 1.0 == 1e18
+        (rate_mul, base_price) at the current timestamp.
+
+        Cached on all their inputs, so the band walks and health checks
+        of a simulation step share one computation.
         """
-        return unsafe_div(
+        key = (
+            self._block_timestamp,
+            self.rate,
+            self.rate_time,
+            self.rate_mul,
+            self.BASE_PRICE,
+        )
+        cache = self._rate_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        rate_mul: int = unsafe_div(
             self.rate_mul
             * (10**18 + self.rate * (self._block_timestamp - self.rate_time)),
             10**18,
         )
+        state = (rate_mul, self.BASE_PRICE * rate_mul // 10**18)
+        self._rate_cache = (key, state)
+        return state
+
+    def _rate_mul(self) -> int:
+        """
+        @notice Rate multiplier which is 1.0 + integral(rate, dt)
+        @return Rate multiplier in units where 1.0 == 1e18
+        """
+        return self._rate_state()[0]
 
     def get_rate_mul(self) -> int:
         """
@@ -357,7 +385,7 @@ class LLAMMAPool(
         Price which corresponds to band 0.
         Base price grows with time to account for interest rate (which is 0 by default)
         """
-        return self.BASE_PRICE * self._rate_mul() // 10**18
+        return self._rate_state()[1]
 
     def get_base_price(self) -> int:
         """
@@ -475,6 +503,73 @@ class LLAMMAPool(
         """
         return self._p_oracle_up(n + 1)
 
+    def band_for_price(self, p: int) -> int:
+        """
+        Band containing oracle price `p`, i.e. the `n` with
+        `p_oracle_down(n) < p <= p_oracle_up(n)`.
+
+        The float logarithm only seeds the search; the band is then found
+        by bisection over `p_oracle_up`, so it is exact at band edges.
+
+        Parameters
+        ----------
+        p : int
+            Price at 1e18 base
+
+        Returns
+        -------
+        int
+            Band number
+        """
+        assert p > 0, "Price must be positive"
+        n: int = floor(log(p / self._base_price(), self.Aminus1 / self.A))
+        lo: int = n - 1
+        hi: int = n + 1
+        step: int = 1
+        while self._p_oracle_up(lo) < p:
+            lo -= step
+            step *= 2
+        step = 1
+        while self._p_oracle_up(hi) >= p:
+            hi += step
+            step *= 2
+        # p_oracle_up(lo) >= p > p_oracle_up(hi)
+        while hi - lo > 1:
+            mid: int = (lo + hi) // 2
+            if self._p_oracle_up(mid) >= p:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def bands_for_prices(self, prices: Iterable[int]) -> np.ndarray:
+        """
+        Vectorised `band_for_price`.
+
+        The `p_oracle_up` ladder covering the prices is built once and
+        every price is located in it by binary search.
+
+        Parameters
+        ----------
+        prices : Iterable[int]
+            Prices at 1e18 base
+
+        Returns
+        -------
+        numpy.ndarray
+            Band number of each price
+        """
+        prices = [int(p) for p in prices]
+        if len(prices) == 0:
+            return np.array([], dtype=np.int64)
+        lo: int = self.band_for_price(max(prices))
+        hi: int = self.band_for_price(min(prices))
+        # ascending: ladder[i] == p_oracle_up(hi - i)
+        ladder: List[int] = [self._p_oracle_up(n) for n in range(hi, lo - 1, -1)]
+        return np.array(
+            [hi - bisect_left(ladder, p) for p in prices], dtype=np.int64
+        )
+
     def _get_y0(self, x: int, y: int, p_o: int, p_o_up: int) -> int:
         """
         Calculate y0 for the invariant based on current liquidity in band.
@@ -11,6 +11,8 @@ __all__ = [
     "MonetaryPolicy",
     "CurveStableSwapPool",
     "ERC20",
+    "set_fast_mode",
+    "is_fast_mode",
 ]
 
 from .LLAMMA import LLAMMAPool
@@ -20,3 +22,4 @@ from .price_oracle import AggregateStablePrice, PriceOracle
 from .mpolicies import MonetaryPolicy
 from .stableswap import CurveStableSwapPool
 from .utils import ERC20
+from .fastpath import is_fast_mode, set_fast_mode
@@ -1,8 +1,13 @@
 __all__ = [
     "ln_int",
     "log2",
+    "exp",
+    "exp_decay",
+    "clear_caches",
 ]
 
+from functools import lru_cache
+
 from ..vyper_func import (
     pow_mod256,
     shift,
@@ -14,6 +19,14 @@ from ..vyper_func import (
 
 MAX_EXP = 1000 * 10**18
 
+# ln_int, log2 and exp are pure, and in price-sampled sims they are
+# called with a handful of distinct arguments (A ratios, fixed dt),
+# so their results are memoised in bounded LRU caches.
+# The uncached functions are available as `f.__wrapped__`.
+CACHE_SIZE = 2**16
+
+
+@lru_cache(maxsize=CACHE_SIZE)
 def ln_int(_x: int) -> int:
     """
     @notice Logarithm ln() function based on log2. Not very gas-efficient but brief
@@ -24,14 +37,14 @@ def ln_int(_x: int) -> int:
     x: int = _x
     res: int = 0
     for i in range(8):
-        t: int = 2**(7 - i)
+        t: int = 2 ** (7 - i)
         p: int = 2**t
         if x >= p * 10**18:
             x //= p
             res += t * 10**18
     d: int = 10**18
     for i in range(59):  # 18 decimals: math.log2(10**10) == 59.7
-        if (x >= 2 * 10**18):
+        if x >= 2 * 10**18:
             res += d
             x //= 2
         x = x * x // 10**18
@@ -41,6 +54,7 @@ def ln_int(_x: int) -> int:
     return res * 10**18 // 1442695040888963328
 
 
+@lru_cache(maxsize=CACHE_SIZE)
 def log2(_x: int) -> int:
     """
     @notice int(1e18 * log2(_x / 1e18))
@@ -62,7 +76,7 @@ def log2(_x: int) -> int:
         t = unsafe_div(t, 2)
     d: int = 10**18
     for i in range(34):  # 10 decimals: math.log(10**10, 2) == 33.2. Need more?
-        if (x >= 2 * 10**18):
+        if x >= 2 * 10**18:
             res = unsafe_add(res, d)
             x = unsafe_div(x, 2)
         x = unsafe_div(unsafe_mul(x, x), 10**18)
@@ -73,11 +87,13 @@ def log2(_x: int) -> int:
     else:
         return res
 
+
+@lru_cache(maxsize=CACHE_SIZE)
 def exp(power: int) -> int:
     # This implementation is borrowed from transmissions11 and Remco Bloemen:
     # https://github.com/transmissions11/solmate/blob/main/src/utils/SignedWadMath.sol
     # Method: wadExp
-    
+
     if power <= -42139678854452767551:
         return 0
 
@@ -89,24 +105,58 @@ def exp(power: int) -> int:
 
     k: int = unsafe_div(
         unsafe_add(
-            unsafe_div(unsafe_mul(x, 2**96), 54916777467707473351141471128),
-            2**95),
-        2**96)
+            unsafe_div(unsafe_mul(x, 2**96), 54916777467707473351141471128), 2**95
+        ),
+        2**96,
+    )
     x = unsafe_sub(x, unsafe_mul(k, 54916777467707473351141471128))
 
     y: int = unsafe_add(x, 1346386616545796478920950773328)
-    y = unsafe_add(unsafe_div(unsafe_mul(y, x), 2**96), 57155421227552351082224309758442)
+    y = unsafe_add(
+        unsafe_div(unsafe_mul(y, x), 2**96), 57155421227552351082224309758442
+    )
     p: int = unsafe_sub(unsafe_add(y, x), 94201549194550492254356042504812)
-    p = unsafe_add(unsafe_div(unsafe_mul(p, y), 2**96), 28719021644029726153956944680412240)
+    p = unsafe_add(
+        unsafe_div(unsafe_mul(p, y), 2**96), 28719021644029726153956944680412240
+    )
     p = unsafe_add(unsafe_mul(p, x), (4385272521454847904659076985693276 * 2**96))
 
     q: int = x - 2855989394907223263936484059900
-    q = unsafe_add(unsafe_div(unsafe_mul(q, x), 2**96), 50020603652535783019961831881945)
-    q = unsafe_sub(unsafe_div(unsafe_mul(q, x), 2**96), 533845033583426703283633433725380)
-    q = unsafe_add(unsafe_div(unsafe_mul(q, x), 2**96), 3604857256930695427073651918091429)
-    q = unsafe_sub(unsafe_div(unsafe_mul(q, x), 2**96), 14423608567350463180887372962807573)
-    q = unsafe_add(unsafe_div(unsafe_mul(q, x), 2**96), 26449188498355588339934803723976023)
+    q = unsafe_add(
+        unsafe_div(unsafe_mul(q, x), 2**96), 50020603652535783019961831881945
+    )
+    q = unsafe_sub(
+        unsafe_div(unsafe_mul(q, x), 2**96), 533845033583426703283633433725380
+    )
+    q = unsafe_add(
+        unsafe_div(unsafe_mul(q, x), 2**96), 3604857256930695427073651918091429
+    )
+    q = unsafe_sub(
+        unsafe_div(unsafe_mul(q, x), 2**96), 14423608567350463180887372962807573
+    )
+    q = unsafe_add(
+        unsafe_div(unsafe_mul(q, x), 2**96), 26449188498355588339934803723976023
+    )
 
     return shift(
         unsafe_mul(unsafe_div(p, q), 3822833074963236453042738258902158003155416615667),
-        unsafe_sub(k, 195))
\ No newline at end of file
+        unsafe_sub(k, 195),
+    )
+
+
+@lru_cache(maxsize=1024)
+def exp_decay(dt: int, ma_time: int) -> int:
+    """
+    EMA weight of the previous value after `dt` seconds,
+    `exp(-unsafe_div(dt * 10**18, ma_time))`, keyed on the integer `dt`.
+
+    Matches the rounding of `PriceOracle`; callers which floor the
+    negative power instead must keep calling `exp` directly.
+    """
+    return exp(-1 * unsafe_div(dt * 10**18, ma_time))
+
+
+def clear_caches():
+    """Empty the memoisation caches of the wad math functions."""
+    for f in (ln_int, log2, exp, exp_decay):
+        f.cache_clear()
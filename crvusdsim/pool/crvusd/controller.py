@@ -1,8 +1,6 @@
 """
 Mainly a module to house the `Curve Stablecoin`, a Controller implementation in Python.
 """
-from collections import defaultdict
-from functools import partial
 from typing import Callable, List, Tuple
 from math import floor, sqrt, isqrt, log as math_log
 
@@ -14,6 +12,7 @@ from crvusdsim.pool.snapshot import ControllerSnapshot
 
 from .LLAMMA import LLAMMAPool
 from .clac import ln_int, log2
+from .loan_book import DiscountMapping, LoanBook, LoanMapping, LoansMapping
 from .vyper_func import (
     shift,
     unsafe_add,
@@ -35,6 +34,7 @@ MIN_FEE = 10**6  # 1e-12, still needs to be above 0
 MAX_FEE = 10**17  # 10%
 DEAD_SHARES = 1000
 MAX_ETH_GAS = 10000  # Forward this much gas to ETH transfers (2300 is what send() does)
+Y_EFFECTIVE_TABLE_SIZE = 2**14  # Entries kept by `get_y_effective` before reset
 
 
 class Loan:
@@ -80,12 +80,11 @@ class Controller(
         "STABLECOIN",
         "FACTORY",
         "collateral_token",
+        "loan_book",
         "loan",
         "liquidation_discounts",
         "_total_debt",
         "loans",
-        "loan_ix",
-        "n_loans",
         "minted",
         "redeemed",
         "monetary_policy",
@@ -98,6 +97,7 @@ class Controller(
         "Aminus1",
         "LOG2_A_RATIO",
         "SQRT_BAND_RATIO",
+        "_y_effective_table",
     )
 
     def __init__(
@@ -147,21 +147,17 @@ class Controller(
         self.STABLECOIN = stablecoin
         self.FACTORY = factory
 
-        self.loan = loan if loan is not None else defaultdict(Loan)
-        self.liquidation_discounts = (
-            liquidation_discounts
-            if liquidation_discounts is not None
-            else defaultdict(partial(type(liquidation_discount), liquidation_discount))
+        self.loan_book = LoanBook()
+        self.loan = LoanMapping(self.loan_book, Loan)
+        self.loans = LoansMapping(self.loan_book)  # address[]
+        self.liquidation_discounts = DiscountMapping(
+            self.loan_book, liquidation_discount
         )
+        if loan is not None:
+            self._load_loans(loan, loan_ix, liquidation_discounts, liquidation_discount)
 
         self._total_debt = total_debt if total_debt is not None else Loan()
 
-        self.loans = loans if loans is not None else defaultdict(str)  # address[]
-        self.loan_ix = (
-            loan_ix if loan_ix is not None else defaultdict(int)
-        )  # HashMap[address, uint256]
-        self.n_loans = n_loans if n_loans is not None else len(self.loans)
-
         self.minted = minted if minted is not None else 0
         self.redeemed = redeemed if redeemed is not None else 0
 
@@ -181,6 +177,7 @@ class Controller(
             unsafe_div(10**36 * self.A, unsafe_sub(self.A, 1))
         )
         self.LOG2_A_RATIO = log2(self.A * 10**18 // unsafe_sub(self.A, 1))
+        self._reset_y_effective_table()
 
         self.COLLATERAL_TOKEN: str = self.AMM.COLLATERAL_TOKEN
         self.COLLATERAL_PRECISION: int = self.AMM.COLLATERAL_PRECISION
@@ -189,6 +186,45 @@ class Controller(
         if debt_ceiling > 0:
             self.STABLECOIN._mint(self.address, debt_ceiling)
 
+    def _load_loans(
+        self,
+        loan: dict,
+        loan_ix: dict,
+        liquidation_discounts: dict,
+        liquidation_discount: int,
+    ):
+        """
+        Fill the loan book from `user -> Loan` (and optionally
+        `user -> loan index`, `user -> liquidation discount`) dicts.
+        """
+        users = list(loan.keys())
+        if loan_ix is not None:
+            users.sort(key=lambda user: loan_ix.get(user, 0))
+        for user in users:
+            _loan: Loan = loan[user]
+            if _loan.initial_debt == 0:
+                continue
+            discount: int = liquidation_discount
+            if liquidation_discounts is not None and user in liquidation_discounts:
+                discount = liquidation_discounts[user]
+            self.loan_book.add(
+                user,
+                _loan.initial_debt,
+                _loan.rate_mul,
+                _loan.initial_collateral,
+                _loan.timestamp,
+                discount,
+            )
+
+    @property
+    def loan_ix(self) -> dict:
+        """`user -> loan index`, HashMap[address, uint256]"""
+        return self.loan_book.index
+
+    @property
+    def n_loans(self) -> int:
+        return len(self.loan_book)
+
     def _rate_mul_w(self) -> int:
         """
         Getter for rate_mul (the one which is 1.0+) from the AMM
@@ -208,11 +244,12 @@ class Controller(
         @return (debt, rate_mul)
         """
         rate_mul: int = self._rate_mul_w()
-        loan: Loan = self.loan[user]
-        if loan.initial_debt == 0:
+        book: LoanBook = self.loan_book
+        ix: int = book.index.get(user)
+        if ix is None or book.initial_debt[ix] == 0:
             return (0, rate_mul)
         else:
-            return (loan.initial_debt * rate_mul // loan.rate_mul, rate_mul)
+            return (book.initial_debt[ix] * rate_mul // book.rate_mul[ix], rate_mul)
 
     def _debt_ro(self, user: str) -> int:
         """
@@ -228,12 +265,13 @@ class Controller(
         int
             Value of debt
         """
-        rate_mul: int = self.AMM.get_rate_mul()
-        loan: Loan = self.loan[user]
-        if loan.initial_debt == 0:
+        book: LoanBook = self.loan_book
+        ix: int = book.index.get(user)
+        if ix is None or book.initial_debt[ix] == 0:
             return 0
         else:
-            return loan.initial_debt * rate_mul // loan.rate_mul
+            rate_mul: int = self.AMM.get_rate_mul()
+            return book.initial_debt[ix] * rate_mul // book.rate_mul[ix]
 
     def debt(self, user: str) -> int:
         """
@@ -314,14 +352,30 @@ class Controller(
             // (self.SQRT_BAND_RATIO * N)
         )
 
-        y_effective: int = d_y_effective
+        key = (self.A, N, d_y_effective)
+        y_effective: int = self._y_effective_table.get(key)
+        if y_effective is not None:
+            return y_effective
+
+        y_effective = d_y_effective
         for i in range(1, MAX_TICKS_UINT):
             if i == N:
                 break
             d_y_effective = unsafe_div(d_y_effective * self.Aminus1, self.A)
             y_effective = unsafe_add(y_effective, d_y_effective)
+
+        if len(self._y_effective_table) >= Y_EFFECTIVE_TABLE_SIZE:
+            self._y_effective_table.clear()
+        self._y_effective_table[key] = y_effective
         return y_effective
 
+    def _reset_y_effective_table(self):
+        """
+        Drop the (A, N, d_y_effective) -> y_effective table used by
+        `get_y_effective` so entries for a previous `A` do not accumulate.
+        """
+        self._y_effective_table = {}
+
     def _calculate_debt_n1(self, collateral: int, debt: int, N: int) -> int:
         """
         Calculate the upper band number for the deposit to sit in to support
@@ -488,6 +542,91 @@ class Controller(
             10**18 - 10**14,
         )
 
+    def max_borrowable_grid(
+        self, collaterals: List[int], Ns: List[int], current_debt: int = 0
+    ) -> List[List[int]]:
+        """
+        Evaluate `max_borrowable` over every (collateral, N) pair.
+
+        `max_p_base` and the borrowing cap are computed once for the current
+        state and shared by all cells, so the result is identical to calling
+        `max_borrowable` for each pair.
+
+        Parameters
+        ----------
+        collaterals : List[int]
+            Collateral amounts against which to borrow
+        Ns : List[int]
+            Numbers of bands to have the deposit into
+        current_debt : int
+            Current debt of the user (if any)
+
+        Returns
+        -------
+        List[List[int]]
+            Maximum amounts of stablecoin to borrow,
+            indexed as `[collateral_index][N_index]`
+        """
+        p_base: int = self.max_p_base()
+        cap: int = self.STABLECOIN.balanceOf[self.address] + current_debt
+
+        grid: List[List[int]] = []
+        for collateral in collaterals:
+            row: List[int] = []
+            for N in Ns:
+                y_effective: int = self.get_y_effective(
+                    collateral * self.COLLATERAL_PRECISION, N, self.loan_discount
+                )
+                x: int = unsafe_sub(
+                    max(unsafe_div(y_effective * p_base, 10**18), 1), 1
+                )
+                x = unsafe_div(x * (10**18 - 10**14), 10**18)
+                row.append(min(x, cap))
+            grid.append(row)
+        return grid
+
+    def min_collateral_grid(self, debts: List[int], Ns: List[int]) -> List[List[int]]:
+        """
+        Evaluate `min_collateral` over every (debt, N) pair.
+
+        `max_p_base` is computed once and the effective collateral of one
+        unit is computed once per N, then broadcast across all debts.
+
+        Parameters
+        ----------
+        debts : List[int]
+            The debts to support
+        Ns : List[int]
+            Numbers of bands to deposit into
+
+        Returns
+        -------
+        List[List[int]]
+            Minimal collateral required, indexed as `[debt_index][N_index]`
+        """
+        p_base: int = self.max_p_base()
+        y_effectives: List[int] = [
+            self.get_y_effective(10**18, N, self.loan_discount) for N in Ns
+        ]
+
+        grid: List[List[int]] = []
+        for debt in debts:
+            row: List[int] = []
+            for N, y_effective in zip(Ns, y_effectives):
+                row.append(
+                    unsafe_div(
+                        unsafe_div(
+                            debt * 10**18 / p_base * 10**18 / y_effective
+                            + N * (N + 2 * DEAD_SHARES),
+                            self.COLLATERAL_PRECISION,
+                        )
+                        * 10**18,
+                        10**18 - 10**14,
+                    )
+                )
+            grid.append(row)
+        return grid
+
     def calculate_debt_n1(self, collateral: int, debt: int, N: int) -> int:
         """
         Calculate the upper band number for the deposit to sit in to support
@@ -569,20 +708,15 @@ class Controller(
         n2: int = n1 + N - 1
 
         rate_mul: int = self._rate_mul_w()
-        self.loan[user].initial_debt = debt
-        self.loan[user].rate_mul = rate_mul
-
-        # SIM_INTERFACE
-        self.loan[user].initial_collateral = collateral
-        self.loan[user].timestamp = self._block_timestamp
-
         liquidation_discount: int = self.liquidation_discount
-        self.liquidation_discounts[user] = liquidation_discount
-
-        n_loans: int = self.n_loans
-        self.loans[n_loans] = user
-        self.loan_ix[user] = n_loans
-        self.n_loans = unsafe_add(n_loans, 1)
+        self.loan_book.add(
+            user,
+            debt,
+            rate_mul,
+            collateral,  # SIM_INTERFACE
+            self._block_timestamp,  # SIM_INTERFACE
+            liquidation_discount,
+        )
 
         self._total_debt.initial_debt = (
             self._total_debt.initial_debt * rate_mul // self._total_debt.rate_mul + debt
@@ -777,15 +911,8 @@ class Controller(
 
         # self.n_loans = last_loan_ix
 
-        # delete defaultdict key
-        loan_ix: int = self.loan_ix[_for]
-        assert self.loans[loan_ix] == _for, "should never fail but safety first"
-
-        self.loan.pop(_for)
-        self.loans.pop(loan_ix)
-        self.loan_ix.pop(_for)
-
-        self.n_loans -= 1
+        # swap-remove in the loan book
+        self.loan_book.remove(_for)
 
     def repay(
         self,
@@ -1323,11 +1450,12 @@ class Controller(
         #     if ix >= n_loans or i == limit:
         #         break
         #     user: str = self.loans[ix]
-        for user in list(self.loan.keys()):
-            debt: int = self._debt_ro(user)
-            health: int = self._health(
-                user, debt, True, self.liquidation_discounts[user]
-            )
+        book: LoanBook = self.loan_book
+        users: List[str] = list(book.users)
+        debts: List[int] = book.debts(self.AMM.get_rate_mul())
+        discounts: List[int] = list(book.liquidation_discount)
+        for user, debt, discount in zip(users, debts, discounts):
+            health: int = self._health(user, debt, True, discount)
             if health < 0:
                 xy: int[2] = self.AMM.get_sum_xy(user)
                 out.append(
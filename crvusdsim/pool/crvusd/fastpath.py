@@ -0,0 +1,71 @@
+"""
+Debug/fast switch for the hot LLAMMA methods.
+
+In fast mode the methods listed in `HOT_METHODS` are replaced by copies
+with the `vyper_func.unsafe_*` helpers inlined (see
+`vyper_func.inline.inline_unsafe`). Debug mode restores the original
+methods, whose `unsafe_div` asserts on a zero divisor.
+
+The initial mode comes from the CRVUSDSIM_MODE env var
+("fast" by default, or "debug"). Methods whose source is not available
+(e.g. byte-compiled-only installs) keep their original implementation.
+"""
+import os
+
+from curvesim.logging import get_logger
+
+from .LLAMMA import LLAMMAPool
+from .vyper_func.inline import inline_unsafe
+
+logger = get_logger(__name__)
+
+HOT_METHODS = {
+    LLAMMAPool: [
+        "_get_y0",
+        "_get_p",
+        "_get_xy_up_by_ticks",
+        "calc_swap_out",
+        "calc_swap_in",
+        "get_amount_for_price",
+    ],
+}
+
+_originals = {}
+_inlined = {}
+_fast = False
+
+
+def set_fast_mode(enabled: bool = True):
+    """
+    Switch the hot methods between the inlined (fast) and the
+    original (debug) implementations.
+    """
+    global _fast  # pylint: disable=global-statement
+    for cls, names in HOT_METHODS.items():
+        for name in names:
+            key = (cls, name)
+            if key not in _originals:
+                _originals[key] = cls.__dict__[name]
+            if enabled:
+                if key not in _inlined:
+                    try:
+                        _inlined[key] = inline_unsafe(_originals[key])
+                    except (OSError, TypeError) as e:
+                        logger.warning(
+                            "Can't inline %s.%s (%s), keeping the debug implementation",
+                            cls.__name__,
+                            name,
+                            e,
+                        )
+                        _inlined[key] = _originals[key]
+                setattr(cls, name, _inlined[key])
+            else:
+                setattr(cls, name, _originals[key])
+    _fast = enabled
+
+
+def is_fast_mode() -> bool:
+    return _fast
+
+
+set_fast_mode(os.environ.get("CRVUSDSIM_MODE", "fast") != "debug")
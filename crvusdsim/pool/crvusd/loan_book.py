@@ -0,0 +1,263 @@
+"""
+Columnar loan book of the Controller.
+
+Loans are stored in parallel lists indexed by an integer loan id,
+with swap-remove deletion. `LoanMapping`, `LoansMapping` and
+`DiscountMapping` expose the book through the dict interfaces
+the Controller historically used (`loan`, `loans`, `liquidation_discounts`).
+"""
+from collections.abc import Mapping
+from typing import Callable, Dict, List
+
+
+class LoanBook:
+    """
+    Loans of a Controller as parallel lists.
+
+    `users[ix]` owns the loan with id `ix`, and `index[user] == ix`.
+    Removing a loan moves the last loan into the freed id,
+    so ids are always `0..len(book)-1`.
+    """
+
+    __slots__ = (
+        "users",
+        "index",
+        "initial_debt",
+        "rate_mul",
+        "initial_collateral",
+        "timestamp",
+        "liquidation_discount",
+    )
+
+    def __init__(self):
+        self.users: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.initial_debt: List[int] = []
+        self.rate_mul: List[int] = []
+        self.initial_collateral: List[int] = []
+        self.timestamp: List[int] = []
+        self.liquidation_discount: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def __contains__(self, user: str) -> bool:
+        return user in self.index
+
+    def add(
+        self,
+        user: str,
+        initial_debt: int,
+        rate_mul: int,
+        initial_collateral: int,
+        timestamp: int,
+        liquidation_discount: int,
+    ) -> int:
+        """
+        Append a loan and return its id.
+        """
+        assert user not in self.index, "Loan already created"
+        ix: int = len(self.users)
+        self.users.append(user)
+        self.index[user] = ix
+        self.initial_debt.append(initial_debt)
+        self.rate_mul.append(rate_mul)
+        self.initial_collateral.append(initial_collateral)
+        self.timestamp.append(timestamp)
+        self.liquidation_discount.append(liquidation_discount)
+        return ix
+
+    def remove(self, user: str):
+        """
+        Remove the loan of `user`, moving the last loan into its id.
+        """
+        ix: int = self.index.pop(user)
+        last: int = len(self.users) - 1
+        columns = (
+            self.users,
+            self.initial_debt,
+            self.rate_mul,
+            self.initial_collateral,
+            self.timestamp,
+            self.liquidation_discount,
+        )
+        if ix != last:
+            for column in columns:
+                column[ix] = column[last]
+            self.index[self.users[ix]] = ix
+        for column in columns:
+            column.pop()
+
+    def debts(self, rate_mul: int) -> List[int]:
+        """
+        Current debt of every loan, in loan id order.
+
+        Parameters
+        ----------
+        rate_mul : int
+            Current rate_mul of the AMM
+
+        Returns
+        -------
+        List[int]
+            `initial_debt * rate_mul // loan_rate_mul` for each loan
+        """
+        return [
+            d * rate_mul // r for d, r in zip(self.initial_debt, self.rate_mul)
+        ]
+
+    def copy(self) -> "LoanBook":
+        book = LoanBook()
+        book.restore(self)
+        return book
+
+    def restore(self, other: "LoanBook"):
+        """
+        Overwrite this book in place with a copy of `other`,
+        keeping the list and dict objects the facades refer to.
+        """
+        self.users[:] = other.users
+        self.index.clear()
+        self.index.update(other.index)
+        self.initial_debt[:] = other.initial_debt
+        self.rate_mul[:] = other.rate_mul
+        self.initial_collateral[:] = other.initial_collateral
+        self.timestamp[:] = other.timestamp
+        self.liquidation_discount[:] = other.liquidation_discount
+
+
+class LoanView:
+    """Read/write view of one user's loan in a `LoanBook`."""
+
+    __slots__ = ("_book", "_user")
+
+    def __init__(self, book: LoanBook, user: str):
+        self._book = book
+        self._user = user
+
+    def _get(self, column: str) -> int:
+        return getattr(self._book, column)[self._book.index[self._user]]
+
+    def _set(self, column: str, value: int):
+        getattr(self._book, column)[self._book.index[self._user]] = value
+
+    @property
+    def initial_debt(self) -> int:
+        return self._get("initial_debt")
+
+    @initial_debt.setter
+    def initial_debt(self, value: int):
+        self._set("initial_debt", value)
+
+    @property
+    def rate_mul(self) -> int:
+        return self._get("rate_mul")
+
+    @rate_mul.setter
+    def rate_mul(self, value: int):
+        self._set("rate_mul", value)
+
+    @property
+    def initial_collateral(self) -> int:
+        return self._get("initial_collateral")
+
+    @initial_collateral.setter
+    def initial_collateral(self, value: int):
+        self._set("initial_collateral", value)
+
+    @property
+    def timestamp(self) -> int:
+        return self._get("timestamp")
+
+    @timestamp.setter
+    def timestamp(self, value: int):
+        self._set("timestamp", value)
+
+
+class LoanMapping(Mapping):
+    """
+    `user -> loan` facade over a `LoanBook`.
+
+    Unknown users read as an empty loan from `default_factory`,
+    which is not stored in the book.
+    """
+
+    __slots__ = ("_book", "_default_factory")
+
+    def __init__(self, book: LoanBook, default_factory: Callable):
+        self._book = book
+        self._default_factory = default_factory
+
+    def __getitem__(self, user: str):
+        if user in self._book.index:
+            return LoanView(self._book, user)
+        return self._default_factory()
+
+    def __contains__(self, user: str) -> bool:
+        return user in self._book.index
+
+    def get(self, user: str, default=None):
+        if user in self._book.index:
+            return LoanView(self._book, user)
+        return default
+
+    def __iter__(self):
+        return iter(self._book.users)
+
+    def __len__(self) -> int:
+        return len(self._book)
+
+
+class LoansMapping(Mapping):
+    """`loan id -> user` facade over a `LoanBook`."""
+
+    __slots__ = ("_book",)
+
+    def __init__(self, book: LoanBook):
+        self._book = book
+
+    def __getitem__(self, ix: int) -> str:
+        if 0 <= ix < len(self._book.users):
+            return self._book.users[ix]
+        raise KeyError(ix)
+
+    def __iter__(self):
+        return iter(range(len(self._book.users)))
+
+    def __len__(self) -> int:
+        return len(self._book)
+
+    def values(self):
+        return list(self._book.users)
+
+
+class DiscountMapping(Mapping):
+    """
+    `user -> liquidation discount` facade over a `LoanBook`.
+
+    Unknown users read as `default`.
+    """
+
+    __slots__ = ("_book", "default")
+
+    def __init__(self, book: LoanBook, default: int):
+        self._book = book
+        self.default = default
+
+    def __getitem__(self, user: str) -> int:
+        ix = self._book.index.get(user)
+        if ix is None:
+            return self.default
+        return self._book.liquidation_discount[ix]
+
+    def __setitem__(self, user: str, value: int):
+        self._book.liquidation_discount[self._book.index[user]] = value
+
+    def __contains__(self, user: str) -> bool:
+        return user in self._book.index
+
+    def __iter__(self):
+        return iter(self._book.users)
+
+    def __len__(self) -> int:
+        return len(self._book)
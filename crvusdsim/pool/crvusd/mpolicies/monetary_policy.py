@@ -49,7 +49,7 @@ class MonetaryPolicy:
 
         self.PRICE_ORACLE = price_oracle_contract
         self.CONTROLLER_FACTORY = controller_factory_contract
-        self.peg_keepers = peg_keepers
+        self._bind_peg_keepers(peg_keepers)
 
         assert sigma >= MIN_SIGMA
         assert sigma <= MAX_SIGMA
@@ -62,6 +62,21 @@ class MonetaryPolicy:
     def set_admin(self, admin: str):
         pass
 
+    def _bind_peg_keepers(self, peg_keepers: List[PegKeeper]):
+        """
+        Set the peg keepers and subscribe to their debt changes,
+        so that `pk_debt` is kept up to date without summing over them.
+        """
+        self.peg_keepers = peg_keepers
+        self.pk_debt = 0
+        for pk in peg_keepers:
+            if self not in pk._debt_observers:
+                pk._debt_observers.append(self)
+            self.pk_debt += pk.debt
+
+    def _add_pk_debt(self, delta: int):
+        self.pk_debt += delta
+
     def add_peg_keeper(self, pk: PegKeeper):
         # assert msg.sender == self.admin
         # assert pk.address != empty(address)
@@ -70,6 +85,8 @@ class MonetaryPolicy:
             assert _pk != pk, "Already added"
 
         self.peg_keepers.append(pk)
+        pk._debt_observers.append(self)
+        self.pk_debt += pk.debt
 
     def remove_peg_keeper(self, pk: PegKeeper):
         # assert msg.sender == self.admin
@@ -79,16 +96,16 @@ class MonetaryPolicy:
             if _pk == pk:
                 del_ix = i
             break
-        del self.peg_keepers[del_ix]
+        pk = self.peg_keepers.pop(del_ix)
+        pk._debt_observers.remove(self)
+        self.pk_debt -= pk.debt
 
     def calculate_rate(self, _for: Controller, _price: int) -> int:
         sigma: int = self.sigma
         target_debt_fraction: int = self.target_debt_fraction
 
         p: int = _price
-        pk_debt: int = 0
-        for pk in self.peg_keepers:
-            pk_debt += pk.debt
+        pk_debt: int = self.pk_debt
 
         power: int = int(
             (10**18 - p) * 10**18 // sigma
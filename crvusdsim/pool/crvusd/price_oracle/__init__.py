@@ -1,8 +1,9 @@
 __all__ = [
     "PriceOracle",
+    "PriceOraclePath",
     "AggregateStablePrice",
     "PricePair",
 ]
 
-from .price_oracle import PriceOracle
+from .price_oracle import PriceOracle, PriceOraclePath
 from .aggregate_stable_price import AggregateStablePrice, PricePair
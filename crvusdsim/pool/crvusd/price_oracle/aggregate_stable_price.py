@@ -3,21 +3,15 @@ AggregatorStablePrice - aggregator of stablecoin prices for crvUSD
 """
 
 from collections import defaultdict
-from typing import List
+from typing import List, Tuple
 from numpy import mean
 from crvusdsim.iterators.price_samplers.price_volume import PriceVolume
 
 from crvusdsim.pool.crvusd.stableswap import CurveStableSwapPool
 from curvesim.utils import override
 
+from ..clac import exp
 from ..utils import BlocktimestampMixins
-from ..vyper_func import (
-    shift,
-    unsafe_add,
-    unsafe_div,
-    unsafe_mul,
-    unsafe_sub,
-)
 
 MAX_PAIRS = 20
 MIN_LIQUIDITY = 100_000 * 10**18  # Only take into account pools with enough liquidity
@@ -55,6 +49,7 @@ class AggregateStablePrice(BlocktimestampMixins):
         self.price_pairs = defaultdict(PricePair)
         self.n_price_pairs = 0
         self.last_tvl = defaultdict(int)
+        self._price_cache = None
 
     def set_admin(self, _admin: str):
         # We are not doing commit / apply because the owner will be a voting DAO anyway
@@ -94,56 +89,8 @@ class AggregateStablePrice(BlocktimestampMixins):
         self.n_price_pairs = n_max
 
     def exp(self, power: int) -> int:
-        if power <= -42139678854452767551:
-            return 0
-
-        if power >= 135305999368893231589:
-            raise "exp overflow"
-
-        x: int = unsafe_div(unsafe_mul(power, 2**96), 10**18)
-
-        k: int = unsafe_div(
-            unsafe_add(
-                unsafe_div(unsafe_mul(x, 2**96), 54916777467707473351141471128),
-                2**95,
-            ),
-            2**96,
-        )
-        x = unsafe_sub(x, unsafe_mul(k, 54916777467707473351141471128))
-
-        y: int = unsafe_add(x, 1346386616545796478920950773328)
-        y = unsafe_add(
-            unsafe_div(unsafe_mul(y, x), 2**96), 57155421227552351082224309758442
-        )
-        p: int = unsafe_sub(unsafe_add(y, x), 94201549194550492254356042504812)
-        p = unsafe_add(
-            unsafe_div(unsafe_mul(p, y), 2**96), 28719021644029726153956944680412240
-        )
-        p = unsafe_add(unsafe_mul(p, x), (4385272521454847904659076985693276 * 2**96))
-
-        q: int = x - 2855989394907223263936484059900
-        q = unsafe_add(
-            unsafe_div(unsafe_mul(q, x), 2**96), 50020603652535783019961831881945
-        )
-        q = unsafe_sub(
-            unsafe_div(unsafe_mul(q, x), 2**96), 533845033583426703283633433725380
-        )
-        q = unsafe_add(
-            unsafe_div(unsafe_mul(q, x), 2**96), 3604857256930695427073651918091429
-        )
-        q = unsafe_sub(
-            unsafe_div(unsafe_mul(q, x), 2**96), 14423608567350463180887372962807573
-        )
-        q = unsafe_add(
-            unsafe_div(unsafe_mul(q, x), 2**96), 26449188498355588339934803723976023
-        )
-
-        return shift(
-            unsafe_mul(
-                unsafe_div(p, q), 3822833074963236453042738258902158003155416615667
-            ),
-            unsafe_sub(k, 195),
-        )
+        assert power < 135305999368893231589, "exp overflow"
+        return exp(power)
 
     def _ema_tvl(self) -> List[int]:
         tvls: List[int] = []
@@ -213,20 +160,51 @@ class AggregateStablePrice(BlocktimestampMixins):
             wp_sum += w * prices[i]
         return wp_sum // w_sum
 
+    def _version(self) -> tuple:
+        """
+        Everything `price()` depends on: the clock, the stored EMA state
+        and the oracle versions of the stableswap pools.
+        """
+        n: int = self.n_price_pairs
+        return (
+            self._block_timestamp,
+            self.last_timestamp,
+            self.SIGMA,
+            tuple(self.last_tvl[i] for i in range(n)),
+            tuple(
+                (self.price_pairs[i].is_inverse, self.price_pairs[i].pool._oracle_version())
+                for i in range(n)
+            ),
+        )
+
+    def _cached_price(self) -> Tuple[List[int], int]:
+        """
+        `(ema_tvl, price)`, recomputed only when `_version()` changed,
+        so the several reads per simulation step share one computation.
+        The last result is kept in `_price_cache` as `(version, ema_tvl, price)`.
+        """
+        version = self._version()
+        cache = self._price_cache
+        if cache is not None and cache[0] == version:
+            return cache[1], cache[2]
+        ema_tvl: List[int] = self._ema_tvl()
+        p: int = self._price(ema_tvl)
+        self._price_cache = (version, ema_tvl, p)
+        return ema_tvl, p
+
     def price(self) -> int:
-        return self._price(self._ema_tvl())
+        return self._cached_price()[1]
 
     def price_w(self) -> int:
         if self.last_timestamp == self._block_timestamp:
             return self.last_price
         else:
-            ema_tvl: List[int] = self._ema_tvl()
+            ema_tvl, p = self._cached_price()
             self.last_timestamp = self._block_timestamp
             for i in range(MAX_PAIRS):
                 if i == len(ema_tvl):
                     break
                 self.last_tvl[i] = ema_tvl[i]
-            p: int = self._price(ema_tvl)
             self.last_price = p
             return p
 
@@ -4,7 +4,7 @@ Provides the base implementation for the
 
 TODO - add Chainlink price limits.
 """
-from typing import List
+from typing import Dict, List, Tuple
 from abc import ABC
 from dataclasses import dataclass
 from curvesim.pool.sim_interface import SimCurveCryptoPool
@@ -18,6 +18,23 @@ from ....sim_interface import SimCurveStableSwapPool
 PRECISION = 10**18
 
 
+def _tricrypto_version(pool: SimCurveCryptoPool) -> tuple:
+    """
+    Everything the oracle reads from a TriCrypto pool:
+    its EMA price oracle inputs, `tokens` and `virtual_price`.
+    """
+    return (
+        pool._block_timestamp,  # pylint: disable=protected-access
+        pool.last_prices_timestamp,
+        tuple(pool._price_oracle),  # pylint: disable=protected-access
+        tuple(pool.last_prices),
+        tuple(pool.price_scale),
+        pool.ma_half_time,
+        pool.tokens,
+        pool.virtual_price,
+    )
+
+
 @dataclass
 class StakedOracle:
     """
@@ -99,6 +116,11 @@ class Oracle(ABC, BlocktimestampMixins):
         )
         self.bound_size = bound_size
 
+        # SIM INTERFACE: `(version, price)` of the last `_raw_price`,
+        # and optional precomputed TriCrypto prices, see `use_tricrypto_prices`.
+        self._price_cache: Tuple[tuple, int] | None = None
+        self._tricrypto_prices: Dict[int, Tuple[int, ...]] | None = None
+
     @property
     def _price_last(self):
         """
@@ -111,7 +133,7 @@ class Oracle(ABC, BlocktimestampMixins):
         Get the EMA for the TVL of each TriCrypto pool.
         """
         last_timestamp = self.last_timestamp
-        last_tvl = self.last_tvl
+        last_tvl = self.last_tvl.copy()
 
         if last_timestamp < self._block_timestamp:
             alpha = exp(
@@ -146,9 +168,7 @@ class Oracle(ABC, BlocktimestampMixins):
         weighted_price = 0
         weights = 0
         for i in range(self.n_pools):
-            p_crypto_r = self.tricrypto[i].price_oracle()[
-                self.tricrypto_ix[i]
-            ]  # d_usdt/d_collat
+            p_crypto_r = self._p_crypto(i)  # d_usdt/d_collat
             p_stable_r = self.stableswap[i].price_oracle()  # d_usdt/d_crvusd
             p_stable_agg = agg_price  # d_usd/d_crvusd
             if self._is_inverse[i]:
@@ -171,6 +191,75 @@ class Oracle(ABC, BlocktimestampMixins):
 
         return crv_p
 
+    def _p_crypto(self, i: int) -> int:
+        """
+        Collateral price of the i-th TriCrypto pool, from the precomputed
+        series when one covers the current timestamp.
+        """
+        if self._tricrypto_prices is not None:
+            prices = self._tricrypto_prices.get(self._block_timestamp)
+            if prices is not None:
+                return prices[i]
+        return self.tricrypto[i].price_oracle()[self.tricrypto_ix[i]]
+
+    def _version(self, tvls: List[int], agg_price: int) -> tuple:
+        """
+        Everything `_raw_price(tvls, agg_price)` depends on.
+        Child classes with extra inputs extend it.
+        """
+        tricrypto_prices = None
+        if self._tricrypto_prices is not None:
+            tricrypto_prices = self._tricrypto_prices.get(self._block_timestamp)
+        return (
+            tuple(tvls),
+            agg_price,
+            tricrypto_prices,
+            tuple(_tricrypto_version(pool) for pool in self.tricrypto)
+            if tricrypto_prices is None
+            else None,
+            tuple(spool._oracle_version() for spool in self.stableswap),  # pylint: disable=protected-access
+            self.use_chainlink,
+            self.chainlink_aggregator.price if self.use_chainlink else None,
+            self.bound_size,
+        )
+
+    def _cached_raw_price(self, tvls: List[int], agg_price: int) -> int:
+        """
+        `_raw_price`, recomputed only when its inputs changed, so the
+        repeated `price()` reads of a simulation step share one evaluation.
+        """
+        version = self._version(tvls, agg_price)
+        cache = self._price_cache
+        if cache is not None and cache[0] == version:
+            self.last_price = cache[1]
+            return cache[1]
+        p = self._raw_price(tvls, agg_price)
+        self._price_cache = (version, p)
+        return p
+
+    def use_tricrypto_prices(self, prices) -> None:
+        """
+        Read TriCrypto collateral prices from a precomputed series
+        instead of each pool's EMA oracle, at the timestamps it covers.
+
+        Parameters
+        ----------
+        prices : pandas.DataFrame or None
+            Prices indexed by timestamp, one column per TriCrypto pool
+            in `self.tricrypto` order (d_usd/d_collat, as floats).
+            None switches back to the pools' own oracles.
+        """
+        if prices is None:
+            self._tricrypto_prices = None
+            return
+        assert prices.shape[1] == self.n_pools, "One price column per TriCrypto pool"
+        timestamps = [int(ts.timestamp()) for ts in prices.index]
+        values = [
+            tuple(int(p * 10**18) for p in row)
+            for row in prices.itertuples(index=False, name=None)
+        ]
+        self._tricrypto_prices = dict(zip(timestamps, values))
+
     def raw_price(self) -> int:
         """
         Public method for getting the oracle price.
@@ -178,7 +267,7 @@ class Oracle(ABC, BlocktimestampMixins):
         """
         if self.frozen:
             return self.last_price
-        return self._raw_price(self._ema_tvl(), self.stable_aggregator.price())
+        return self._cached_raw_price(self._ema_tvl(), self.stable_aggregator.price())
 
     def price(self) -> int:
         """
@@ -197,7 +286,7 @@ class Oracle(ABC, BlocktimestampMixins):
         if self.last_timestamp < self._block_timestamp:
             self.last_timestamp = self._block_timestamp
             self.last_tvl = tvls
-        return self._raw_price(
+        return self._cached_raw_price(
             tvls, self.stable_aggregator.price()
         )  # NOTE the Vyper implementation uses `price_w`
 
@@ -28,6 +28,9 @@ class OracleWSTETH(Oracle):
         self.last_price = crv_p
         return crv_p
 
+    def _version(self, tvls: List[int], agg_price: int) -> tuple:
+        return super()._version(tvls, agg_price) + (self.staked_oracle.price,)
+
     def update_staked_oracle(self, new: int) -> None:
         """Update the staked oracle price."""
         self.staked_oracle.update(new)
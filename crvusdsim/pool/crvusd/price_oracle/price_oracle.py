@@ -1,16 +1,136 @@
-from crvusdsim.pool.crvusd.clac import exp
+from typing import Dict, List, Optional
+
+from crvusdsim.pool.crvusd.clac import exp_decay
 from crvusdsim.pool.crvusd.vyper_func import unsafe_div
 from ..utils import BlocktimestampMixins
 
 MA_TIME = 866  # 600 seconds / ln(2)
 
 
+class PriceOraclePath:
+    """
+    Precomputed EMA path of a `PriceOracle` over a price series.
+
+    `oracle_prices[i]` is the oracle price at `timestamps[i]` when the
+    oracle was written (`price_w`) at `timestamps[i - 1]` and its last
+    price was set to `prices[i]`, which is what the simulation does when
+    LLAMMA trades at every sample. The path is read-only, so one instance
+    is shared by all the copies of a market (see `__deepcopy__`).
+    """
+
+    __slots__ = ("timestamps", "prices", "oracle_prices", "index")
+
+    def __init__(self, timestamps: List[int], prices: List[int]):
+        assert len(timestamps) == len(prices), "timestamps/prices length mismatch"
+        self.timestamps: List[int] = timestamps
+        self.prices: List[int] = prices
+        self.index: Dict[int, int] = {ts: i for i, ts in enumerate(timestamps)}
+        self.oracle_prices: List[int] = self._scan(timestamps, prices)
+
+    @staticmethod
+    def _scan(timestamps: List[int], prices: List[int]) -> List[int]:
+        """
+        Exact integer EMA scan, same arithmetic as `PriceOracle._price`.
+        """
+        if len(prices) == 0:
+            return []
+        oracle_prices = [prices[0]]
+        p_o = prices[0]
+        for i in range(1, len(prices)):
+            dt = timestamps[i] - timestamps[i - 1]
+            if dt > 0:
+                alpha = exp_decay(dt, MA_TIME)
+                p_o = unsafe_div(prices[i] * (10**18 - alpha) + alpha * p_o, 10**18)
+            oracle_prices.append(p_o)
+        return oracle_prices
+
+    @classmethod
+    def from_series(cls, prices) -> "PriceOraclePath":
+        """
+        Build the path from a price series.
+
+        Parameters
+        ----------
+        prices : pandas.DataFrame or pandas.Series
+            Price time series indexed by timestamp, e.g. `price_sampler.prices`.
+            For a DataFrame the first column is used, like the strategies do.
+
+        Returns
+        -------
+        PriceOraclePath
+        """
+        if getattr(prices, "ndim", 1) == 2:
+            prices = prices.iloc[:, 0]
+        timestamps = [int(ts.timestamp()) for ts in prices.index]
+        wad_prices = [int(p * 10**18) for p in prices.tolist()]
+        return cls(timestamps, wad_prices)
+
+    def lookup(
+        self, timestamp: int, last_timestamp: int, price_oracle: int, price_last: int
+    ) -> Optional[int]:
+        """
+        Oracle price at `timestamp` from the path, or None when
+        the oracle state is not the one the path assumes.
+        """
+        i = self.index.get(timestamp)
+        if i is None or i == 0:
+            return None
+        if (
+            last_timestamp == self.timestamps[i - 1]
+            and price_oracle == self.oracle_prices[i - 1]
+            and price_last == self.prices[i]
+        ):
+            return self.oracle_prices[i]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
 class PriceOracle(BlocktimestampMixins):
     def __init__(self, p: int):
         super().__init__()
         self._price_last = p
         self._price_oracle = p
         self.last_prices_timestamp = self._block_timestamp
+        self._path: Optional[PriceOraclePath] = None
+
+    @classmethod
+    def from_series(cls, prices) -> "PriceOracle":
+        """
+        Create an oracle with the EMA path of `prices` precomputed.
+
+        Parameters
+        ----------
+        prices : pandas.DataFrame or pandas.Series
+            Price time series indexed by timestamp.
+
+        Returns
+        -------
+        PriceOracle
+            Oracle at the first price of the series.
+        """
+        path = PriceOraclePath.from_series(prices)
+        assert len(path) > 0, "Empty price series"
+        oracle = cls(path.prices[0])
+        oracle._increment_timestamp(timestamp=path.timestamps[0])
+        oracle.last_prices_timestamp = path.timestamps[0]
+        oracle.use_path(path)
+        return oracle
+
+    def use_path(self, path: Optional[PriceOraclePath]):
+        """
+        Read oracle prices from a precomputed path where possible.
+        Results are identical with or without the path: reads fall back to
+        the EMA formula whenever the oracle state diverges from the path.
+        """
+        self._path = path
 
     def set_price(self, p: int):
         self._price_last = p
@@ -27,12 +147,17 @@ class PriceOracle(BlocktimestampMixins):
     def _price(self):
         _price_oracle = self._price_oracle
         if self._block_timestamp > self.last_prices_timestamp:
-            alpha = exp(
-                -1
-                * unsafe_div(
-                    (self._block_timestamp - self.last_prices_timestamp) * 10**18,
-                    MA_TIME,
+            if self._path is not None:
+                p_o = self._path.lookup(
+                    self._block_timestamp,
+                    self.last_prices_timestamp,
+                    _price_oracle,
+                    self._price_last,
                 )
+                if p_o is not None:
+                    return p_o
+            alpha = exp_decay(
+                self._block_timestamp - self.last_prices_timestamp, MA_TIME
             )
             _price_oracle = unsafe_div(
                 self._price_last * (10**18 - alpha) + alpha * self._price_oracle,
@@ -42,6 +42,7 @@ class PegKeeper(BlocktimestampMixins):
         "new_admin_deadline",
         "new_receiver_deadline",
         "FACTORY",
+        "_debt_observers",
     ]
 
     def __init__(
@@ -84,6 +85,8 @@ class PegKeeper(BlocktimestampMixins):
 
         self.last_change = 0
         self.debt = 0
+        # monetary policies aggregating this keeper's debt
+        self._debt_observers = []
         self.caller_share = 0
 
         assert _index < 2
@@ -136,7 +139,7 @@ class PegKeeper(BlocktimestampMixins):
 
         self.last_change = self._block_timestamp
 
-        self.debt += _amount
+        self._change_debt(_amount)
 
     def _withdraw(self, _amount: int):
         debt: int = self.debt
@@ -150,7 +153,16 @@ class PegKeeper(BlocktimestampMixins):
         self.POOL.remove_liquidity_imbalance(amounts, _receiver=self.address)
 
         self.last_change = self._block_timestamp
-        self.debt -= amount
+        self._change_debt(-amount)
+
+    def _change_debt(self, delta: int):
+        """
+        Change debt and push the delta to the monetary policies
+        which aggregate peg keeper debt.
+        """
+        self.debt += delta
+        for policy in self._debt_observers:
+            policy._add_pk_debt(delta)
 
     def _calc_profit(self) -> int:
         lp_balance: int = self.POOL.balanceOf[self.address]
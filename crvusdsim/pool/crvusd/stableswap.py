@@ -5,6 +5,7 @@ StableSwap
 """
 
 from collections import defaultdict
+from functools import lru_cache
 from typing import List, Tuple, Type
 
 from curvesim.pool.base import Pool
@@ -25,6 +26,118 @@ ADMIN_FEE = 5000000000
 LP_PROVIDER = "LP_PROVIDER"
 
 
+# The Newton solvers are pure functions of their integer arguments and
+# are called repeatedly on unchanged balances (get_p, get_dy probes,
+# peg keeper profit checks), so results are memoised per input.
+# Warm-starting the iteration from a previous solution is not done:
+# the stopping rule `|y - y_prev| <= 1` can then land one unit away
+# from the cold-start result.
+NEWTON_CACHE_SIZE = 2**14
+
+
+@lru_cache(maxsize=NEWTON_CACHE_SIZE)
+def _get_D(_xp: Tuple[int, ...], _amp: int, n: int) -> int:
+    """Newton iteration of `CurveStableSwapPool.get_D`."""
+    S: int = 0
+    for x in _xp:
+        S += x
+    if S == 0:
+        return 0
+
+    D: int = S
+    Ann: int = _amp * n
+    for i in range(255):
+        D_P: int = D * D // _xp[0] * D // _xp[1] // (n**n)
+        Dprev: int = D
+        D = (
+            (Ann * S // A_PRECISION + D_P * n)
+            * D
+            // ((Ann - A_PRECISION) * D // A_PRECISION + (n + 1) * D_P)
+        )
+        # Equality with the precision of 1
+        if D > Dprev:
+            if D - Dprev <= 1:
+                return D
+        else:
+            if Dprev - D <= 1:
+                return D
+    # convergence typically occurs in 4 rounds or less, this should be unreachable!
+    # if it does happen the pool is borked and LPs can withdraw via `remove_liquidity`
+    raise
+
+
+@lru_cache(maxsize=NEWTON_CACHE_SIZE)
+def _get_y(
+    i: int, j: int, x: int, xp: Tuple[int, ...], amp: int, D: int, n: int
+) -> int:
+    """Newton iteration of `CurveStableSwapPool.get_y`."""
+    S_: int = 0
+    _x: int = 0
+    y_prev: int = 0
+    c: int = D
+    Ann: int = amp * n
+
+    for _i in range(n):
+        if _i == i:
+            _x = x
+        elif _i != j:
+            _x = xp[_i]
+        else:
+            continue
+        S_ += _x
+        c = c * D // (_x * n)
+
+    c = c * D * A_PRECISION // (Ann * n)
+    b: int = S_ + D * A_PRECISION // Ann  # - D
+    y: int = D
+
+    for _i in range(255):
+        y_prev = y
+        y = (y * y + c) // (2 * y + b - D)
+        # Equality with the precision of 1
+        if y > y_prev:
+            if y - y_prev <= 1:
+                return y
+        else:
+            if y_prev - y <= 1:
+                return y
+    raise
+
+
+@lru_cache(maxsize=NEWTON_CACHE_SIZE)
+def _get_y_D(A: int, i: int, xp: Tuple[int, ...], D: int, n: int) -> int:
+    """Newton iteration of `CurveStableSwapPool.get_y_D`."""
+    S_: int = 0
+    _x: int = 0
+    y_prev: int = 0
+    c: int = D
+    Ann: int = A * n
+
+    for _i in range(n):
+        if _i != i:
+            _x = xp[_i]
+        else:
+            continue
+        S_ += _x
+        c = c * D // (_x * n)
+
+    c = c * D * A_PRECISION // (Ann * n)
+    b: int = S_ + D * A_PRECISION // Ann
+    y: int = D
+
+    for _i in range(255):
+        y_prev = y
+        y = (y * y + c) // (2 * y + b - D)
+        # Equality with the precision of 1
+        if y > y_prev:
+            if y - y_prev <= 1:
+                return y
+        else:
+            if y_prev - y <= 1:
+                return y
+    raise
+
+
 class CurveStableSwapPool(Pool, BlocktimestampMixins):
 
     snapshot_class: Type[Snapshot] = CurveStableSwapPoolSnapshot
@@ -53,6 +166,8 @@ class CurveStableSwapPool(Pool, BlocktimestampMixins):
         "ma_last_time",
         "ma_exp_time",
         "_block_timestamp",
+        "_p_cache",
+        "_ma_cache",
     )
 
     def __init__(
@@ -136,6 +251,8 @@ class CurveStableSwapPool(Pool, BlocktimestampMixins):
         self.ma_price = 10**18
         self.ma_last_time = self._block_timestamp
         self.ma_exp_time = 866  # = 600 / ln(2)
+        self._p_cache = None
+        self._ma_cache = None
 
         self.balanceOf = defaultdict(int)
         self.totalSupply = self.get_D_mem(rates, balances, self.A)
@@ -195,55 +312,12 @@ class CurveStableSwapPool(Pool, BlocktimestampMixins):
         int
             The stableswap invariant, `D`.
         """
-        S: int = 0
-        for x in _xp:
-            S += x
-        if S == 0:
-            return 0
-
-        D: int = S
-        Ann: int = _amp * self.n
-        for i in range(255):
-            D_P: int = D * D // _xp[0] * D // _xp[1] // (self.n**self.n)
-            Dprev: int = D
-            D = (
-                (Ann * S // A_PRECISION + D_P * self.n)
-                * D
-                // ((Ann - A_PRECISION) * D // A_PRECISION + (self.n + 1) * D_P)
-            )
-            # Equality with the precision of 1
-            if D > Dprev:
-                if D - Dprev <= 1:
-                    return D
-            else:
-                if Dprev - D <= 1:
-                    return D
-        # convergence typically occurs in 4 rounds or less, this should be unreachable!
-        # if it does happen the pool is borked and LPs can withdraw via `remove_liquidity`
-        raise
+        return _get_D(tuple(_xp), _amp, self.n)
 
     def get_D_mem(self, _rates: List[int], _balances: List[int], _amp: int) -> int:
         xp: List[int] = self._xp_mem(_rates, _balances)
         return self.get_D(xp, _amp)
 
-    def _get_p(self, xp: List[int], amp: int, D: int) -> int:
-        # dx_0 / dx_1 only, however can have any number of coins in pool
-        ANN: int = amp * self.n
-        Dr: int = D // (self.n**self.n)
-        for i in range(self.n):
-            Dr = Dr * D // xp[i]
-        return (
-            10**18
-            * (ANN * xp[0] // A_PRECISION + Dr * xp[0] // xp[1])
-            // (ANN * xp[0] // A_PRECISION + Dr)
-        )
-
-    def get_p(self) -> int:
-        amp: int = self.A
-        xp: List[int] = self._xp_mem(self.rates, self.balances)
-        D: int = self.get_D(xp, amp)
-        return self._get_p(xp, amp, D)
-
     def add_liquidity(
         self,
         _amounts: List[int],
@@ -368,37 +442,7 @@ class CurveStableSwapPool(Pool, BlocktimestampMixins):
         if _D == 0:
             amp = self.A
             D = self.get_D(xp, amp)
-        S_: int = 0
-        _x: int = 0
-        y_prev: int = 0
-        c: int = D
-        Ann: int = amp * self.n
-
-        for _i in range(self.n):
-            if _i == i:
-                _x = x
-            elif _i != j:
-                _x = xp[_i]
-            else:
-                continue
-            S_ += _x
-            c = c * D // (_x * self.n)
-
-        c = c * D * A_PRECISION // (Ann * self.n)
-        b: int = S_ + D * A_PRECISION // Ann  # - D
-        y: int = D
-
-        for _i in range(255):
-            y_prev = y
-            y = (y * y + c) // (2 * y + b - D)
-            # Equality with the precision of 1
-            if y > y_prev:
-                if y - y_prev <= 1:
-                    return y
-            else:
-                if y_prev - y <= 1:
-                    return y
-        raise
+        return _get_y(i, j, x, tuple(xp), amp, D, self.n)
 
     def get_dy(self, i: int, j: int, dx: int) -> int:
         """
@@ -683,35 +727,7 @@ class CurveStableSwapPool(Pool, BlocktimestampMixins):
         assert i >= 0  # dev: i below zero
         assert i < self.n  # dev: i above N_COINS
 
-        S_: int = 0
-        _x: int = 0
-        y_prev: int = 0
-        c: int = D
-        Ann: int = A * self.n
-
-        for _i in range(self.n):
-            if _i != i:
-                _x = xp[_i]
-            else:
-                continue
-            S_ += _x
-            c = c * D // (_x * self.n)
-
-        c = c * D * A_PRECISION // (Ann * self.n)
-        b: int = S_ + D * A_PRECISION // Ann
-        y: int = D
-
-        for _i in range(255):
-            y_prev = y
-            y = (y * y + c) // (2 * y + b - D)
-            # Equality with the precision of 1
-            if y > y_prev:
-                if y - y_prev <= 1:
-                    return y
-            else:
-                if y_prev - y <= 1:
-                    return y
-        raise
+        return _get_y_D(A, i, tuple(xp), D, self.n)
 
     def _calc_withdraw_one_coin(self, _burn_amount: int, i: int) -> List[int]:
         # First, need to calculate
@@ -816,10 +832,20 @@ class CurveStableSwapPool(Pool, BlocktimestampMixins):
         )
 
     def get_p(self) -> int:
+        """
+        Spot price, cached on the balances, rates and A it is computed
+        from, so repeated reads within a step are a tuple comparison.
+        """
+        key = (tuple(self.balances), tuple(self.rates), self.A)
+        cache = self._p_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
         amp: int = self.A
         xp = self._xp_mem(self.rates, self.balances)
         D: int = self.get_D(xp, amp)
-        return self._get_p(xp, amp, D)
+        p: int = self._get_p(xp, amp, D)
+        self._p_cache = (key, p)
+        return p
 
     def _ma_price(self) -> int:
         ma_last_time: int = self.ma_last_time
@@ -842,7 +868,36 @@ class CurveStableSwapPool(Pool, BlocktimestampMixins):
             return last_ema_price
 
     def price_oracle(self) -> int:
-        return self._ma_price()
+        """
+        EMA price, cached on the EMA state and `_block_timestamp`.
+        """
+        key = (
+            self.last_price,
+            self.ma_price,
+            self.ma_last_time,
+            self.ma_exp_time,
+            self._block_timestamp,
+        )
+        cache = self._ma_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        p: int = self._ma_price()
+        self._ma_cache = (key, p)
+        return p
+
+    def _oracle_version(self) -> tuple:
+        """
+        Everything `price_oracle` and the aggregator's TVL EMA read from
+        this pool. Equal versions give equal oracle results.
+        """
+        return (
+            self.totalSupply,
+            self.last_price,
+            self.ma_price,
+            self.ma_last_time,
+            self.ma_exp_time,
+            self._block_timestamp,
+        )
 
     def save_p_from_price(self, last_price: int):
         """
@@ -4,8 +4,39 @@ __all__ = [
     "unsafe_sub",
     "unsafe_mul",
     "unsafe_dev",
+    "isqrt",
+    "get_int_backend",
+    "set_int_backend",
 ]
 
+import os
+
+from .backend import make_backend
+
+# Big-int backend of `isqrt`, see `set_int_backend`.
+# The initial one can be picked with the CRVUSDSIM_INT_BACKEND env var.
+_int_backend = make_backend(os.environ.get("CRVUSDSIM_INT_BACKEND", "python"))
+
+
+def get_int_backend():
+    return _int_backend
+
+
+def set_int_backend(backend):
+    """
+    Select the big-int backend, by name ("python", "gmpy2") or instance.
+    Worker processes started after this call inherit it when forked.
+    """
+    global _int_backend  # pylint: disable=global-statement
+    if isinstance(backend, str):
+        backend = make_backend(backend)
+    _int_backend = backend
+
+
+def isqrt(x: int) -> int:
+    return _int_backend.isqrt(x)
+
+
 
 def shift(n: int, s: int) -> int:
     if s >= 0:
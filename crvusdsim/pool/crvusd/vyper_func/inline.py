@@ -0,0 +1,92 @@
+"""
+Source-level inlining of the `unsafe_*` helpers.
+
+`inline_unsafe(func)` recompiles a function with every
+`unsafe_add/sub/mul/div(x, y)` call replaced by the bare operator,
+which removes a Python call per operation from the hot loops.
+The only behavioural difference is the zero divisor of `unsafe_div`,
+which raises ZeroDivisionError instead of AssertionError.
+"""
+import ast
+import inspect
+import textwrap
+
+INLINE_OPS = {
+    "unsafe_add": ast.Add,
+    "unsafe_sub": ast.Sub,
+    "unsafe_mul": ast.Mult,
+    "unsafe_div": ast.FloorDiv,
+}
+
+
+class _InlineUnsafe(ast.NodeTransformer):
+    def __init__(self):
+        self.count = 0
+
+    def visit_Call(self, node: ast.Call):
+        self.generic_visit(node)
+        if (
+            isinstance(node.func, ast.Name)
+            and node.func.id in INLINE_OPS
+            and len(node.args) == 2
+            and not node.keywords
+        ):
+            self.count += 1
+            return ast.copy_location(
+                ast.BinOp(
+                    left=node.args[0],
+                    op=INLINE_OPS[node.func.id](),
+                    right=node.args[1],
+                ),
+                node,
+            )
+        return node
+
+
+def inline_unsafe(func):
+    """
+    Return a copy of `func` with the `unsafe_*` helper calls inlined.
+
+    The copy shares the globals of `func`'s module and keeps its
+    file name and line numbers, so tracebacks point at the original source.
+    `func` must not use zero-argument `super()`.
+
+    Parameters
+    ----------
+    func : function
+        Plain function or method (undecorated).
+
+    Returns
+    -------
+    function
+        The inlined function, with the original as `__debug_impl__`.
+
+    Raises
+    ------
+    OSError, TypeError
+        When the source of `func` is not available.
+    """
+    source = textwrap.dedent(inspect.getsource(func))
+    tree = ast.parse(source)
+    fdef = tree.body[0]
+    assert isinstance(fdef, ast.FunctionDef), "Can only inline plain functions"
+    assert not fdef.decorator_list, "Can only inline undecorated functions"
+    assert not any(
+        isinstance(node, ast.Name) and node.id == "super" for node in ast.walk(fdef)
+    ), "Can't inline a function using super()"
+
+    transformer = _InlineUnsafe()
+    tree = ast.fix_missing_locations(transformer.visit(tree))
+    ast.increment_lineno(tree, func.__code__.co_firstlineno - 1)
+    code = compile(tree, inspect.getsourcefile(func), "exec")
+
+    namespace = {}
+    exec(code, func.__globals__, namespace)  # pylint: disable=exec-used
+    inlined = namespace[func.__name__]
+    inlined.__qualname__ = func.__qualname__
+    inlined.__module__ = func.__module__
+    inlined.__defaults__ = func.__defaults__
+    inlined.__kwdefaults__ = func.__kwdefaults__
+    inlined.__debug_impl__ = func
+    inlined.__inlined_calls__ = transformer.count
+    return inlined
@@ -63,6 +63,7 @@ class SimController(Controller):
                 unsafe_div(10**36 * self.A, unsafe_sub(self.A, 1))
             )
             self.LOG2_A_RATIO = log2(self.A * 10**18 // unsafe_sub(self.A, 1))
+            self._reset_y_effective_table()
 
         self.COLLATERAL_TOKEN: str = new_pool.COLLATERAL_TOKEN
         self.COLLATERAL_PRECISION: int = new_pool.COLLATERAL_PRECISION
@@ -92,12 +93,34 @@ class SimController(Controller):
         """
         super().prepare_for_run(prices)
 
-    def after_trades(self, do_liquidate=False):
-        if do_liquidate:
-            users_to_liquidate = self.users_to_liquidate()
+    def after_trades(self, do_liquidate=False, batch=True):
+        """
+        Liquidate all unhealthy positions after the trades of a step.
+
+        Parameters
+        ----------
+        do_liquidate : bool
+            Whether to liquidate unhealthy positions
+        batch : bool
+            Use `liquidate_sim_batch` instead of calling `liquidate_sim`
+            for each position. Both give the same final state.
+
+        Returns
+        -------
+        int
+            Number of liquidated positions.
+        """
+        if not do_liquidate:
+            return 0
+
+        users_to_liquidate = self.users_to_liquidate()
+        if batch:
+            self.liquidate_sim_batch(users_to_liquidate)
+        else:
             for i in range(len(users_to_liquidate)):
                 position = users_to_liquidate[i]
                 self.liquidate_sim(position)
+        return len(users_to_liquidate)
 
     def _before_liquidate(self, position: Position):
         user = position.user
@@ -127,6 +150,108 @@ class SimController(Controller):
         self._before_liquidate(position)
         self.liquidate(liquidator, position.user, min_x)
 
+    def liquidate_sim_batch(
+        self, positions: List[Position], liquidator=DEFAULT_LIQUIDATOR
+    ):
+        """
+        Fully liquidate `positions` in order, with the same final state
+        as calling `liquidate_sim` for each of them.
+
+        Bands are still withdrawn per user, but the rate is only written
+        where it can change the result (before the first and the last
+        liquidation), and token mints and transfers are netted and applied
+        once at the end.
+
+        Parameters
+        ----------
+        positions : List[Position]
+            Positions to liquidate, e.g. from `users_to_liquidate`
+        liquidator : str
+            Address of the liquidator
+        """
+        if len(positions) == 0:
+            return
+
+        amm_address: str = self.AMM.address
+        amm_collateral: int = self.COLLATERAL_TOKEN.balanceOf[amm_address]
+
+        stablecoin_mint: int = 0  # minted to liquidator
+        amm_to_controller: int = 0
+        liquidator_to_amm: int = 0
+        amm_to_liquidator: int = 0
+        collateral_mint: int = 0  # minted to AMM
+        collateral_out: int = 0  # AMM to liquidator
+        redeemed: int = 0
+
+        rate_mul: int = 0
+        last: int = len(positions) - 1
+        for i, position in enumerate(positions):
+            # `rate_write` only depends on total debt here, and `rate_mul`
+            # does not move within the same timestamp.
+            if i == 0 or i == last:
+                rate_mul = self._rate_mul_w()
+
+            user = position.user
+            to_repay = position.debt - position.x
+            if to_repay > 0:
+                stablecoin_mint += to_repay
+            self._before_liquidate(position)
+
+            health_limit: int = self.liquidation_discounts[user]
+            loan = self.loan[user]
+            debt: int = 0
+            if loan.initial_debt != 0:
+                debt = loan.initial_debt * rate_mul // loan.rate_mul
+
+            if health_limit != 0:
+                assert (
+                    self._health(user, debt, True, health_limit) < 0
+                ), "Not enough rekt"
+            assert debt > 0
+
+            xy: List[int] = self.AMM.withdraw(user, 10**18)  # [stable, collateral]
+
+            amm_to_controller += min(xy[0], debt)
+            if debt > xy[0]:
+                liquidator_to_amm += unsafe_sub(debt, xy[0])
+            elif xy[0] > debt:
+                amm_to_liquidator += unsafe_sub(xy[0], debt)
+
+            # replay `_withdraw_collateral`, which mints the full amount
+            # whenever the AMM balance falls short of it
+            if amm_collateral < xy[1]:
+                collateral_mint += xy[1]
+                amm_collateral += xy[1]
+            amm_collateral -= xy[1]
+            collateral_out += xy[1]
+
+            redeemed += debt
+            loan.initial_debt = 0
+            loan.rate_mul = rate_mul
+            self._remove_from_list(user)
+
+            d: int = (
+                self._total_debt.initial_debt * rate_mul // self._total_debt.rate_mul
+            )
+            self._total_debt.initial_debt = unsafe_sub(max(d, debt), debt)
+            self._total_debt.rate_mul = rate_mul
+
+        if stablecoin_mint > 0:
+            self.STABLECOIN._mint(liquidator, stablecoin_mint)
+        if amm_to_controller > 0:
+            self.STABLECOIN.transferFrom(amm_address, self.address, amm_to_controller)
+        if liquidator_to_amm > 0:
+            self.STABLECOIN.transferFrom(liquidator, amm_address, liquidator_to_amm)
+        if amm_to_liquidator > 0:
+            self.STABLECOIN.transferFrom(amm_address, liquidator, amm_to_liquidator)
+        if collateral_mint > 0:
+            self.COLLATERAL_TOKEN._mint(amm_address, collateral_mint)
+        assert self.COLLATERAL_TOKEN.transferFrom(
+            amm_address, liquidator, collateral_out
+        )
+
+        self.redeemed += redeemed
+
     def calc_debt_by_health(
         self, collateral_amount: int, n1: int, n2: int, health: int
     ):
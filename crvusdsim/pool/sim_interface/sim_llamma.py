@@ -1,7 +1,6 @@
 """Module to house the `SimPool` extension of the `LLAMMAPool`."""
 
 from collections import defaultdict
-from math import isqrt
 from typing import Tuple
 
 from curvesim.exceptions import SimPoolError
@@ -10,7 +9,7 @@ from curvesim.utils import cache, override
 from curvesim.pool.sim_interface.asset_indices import AssetIndicesMixin
 from crvusdsim.pool.crvusd.conf import ARBITRAGUR_ADDRESS
 
-from crvusdsim.pool.crvusd.vyper_func import unsafe_div, unsafe_sub
+from crvusdsim.pool.crvusd.vyper_func import isqrt, unsafe_div, unsafe_sub
 
 from ..crvusd.LLAMMA import LLAMMAPool
 
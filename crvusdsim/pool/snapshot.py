@@ -151,16 +151,12 @@ class LLAMMASnapshot(Snapshot):
 
 
 class ControllerSnapshot(Snapshot):
-    """Snapshot that saves Controller loans, loan_ix, n_loans, etc..."""
+    """Snapshot that saves Controller loan book, total debt, etc..."""
 
     def __init__(
         self,
-        loan,
-        liquidation_discounts,
+        loan_book,
         _total_debt,
-        loans,
-        loan_ix,
-        n_loans,
         minted,
         redeemed,
         liquidation_discount,
@@ -169,14 +165,10 @@ class ControllerSnapshot(Snapshot):
         collateral_snapshot,
         _block_timestamp,
     ):
-        self.loan = loan
-        self.liquidation_discounts = liquidation_discounts
+        self.loan_book = loan_book
         self._total_debt = Loan()
         self._total_debt.initial_debt = _total_debt.initial_debt
         self._total_debt.rate_mul = _total_debt.rate_mul
-        self.loans = loans
-        self.loan_ix = loan_ix
-        self.n_loans = n_loans
         self.minted = minted
         self.redeemed = redeemed
         self.liquidation_discount = liquidation_discount
@@ -188,14 +180,10 @@ class ControllerSnapshot(Snapshot):
 
     @classmethod
     def create(cls, controller):
-        loan = controller.loan.copy()
-        liquidation_discounts = controller.liquidation_discounts.copy()
+        loan_book = controller.loan_book.copy()
         _total_debt = Loan()
         _total_debt.initial_debt = controller._total_debt.initial_debt
         _total_debt.rate_mul = controller._total_debt.rate_mul
-        loans = controller.loans.copy()
-        loan_ix = controller.loan_ix.copy()
-        n_loans = controller.n_loans
 
         minted = controller.minted
         redeemed = controller.redeemed
@@ -208,12 +196,8 @@ class ControllerSnapshot(Snapshot):
         collateral_snapshot = controller.COLLATERAL_TOKEN.get_snapshot()
 
         return cls(
-            loan,
-            liquidation_discounts,
+            loan_book,
             _total_debt,
-            loans,
-            loan_ix,
-            n_loans,
             minted,
             redeemed,
             liquidation_discount,
@@ -224,13 +208,9 @@ class ControllerSnapshot(Snapshot):
         )
 
     def restore(self, controller):
-        controller.loan = self.loan
-        controller.liquidation_discounts = self.liquidation_discounts.copy()
+        controller.loan_book.restore(self.loan_book)
         controller._total_debt.initial_debt = self._total_debt.initial_debt
         controller._total_debt.rate_mul = self._total_debt.rate_mul
-        controller.loans = self.loans.copy()
-        controller.loan_ix = self.loan_ix.copy()
-        controller.n_loans = self.n_loans
 
         controller.minted = self.minted
         controller.redeemed = self.redeemed
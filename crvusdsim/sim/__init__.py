@@ -101,6 +101,18 @@ def autosim(
     ncpu : int, default=os.cpu_count()
         Number of cores to use.
 
+    executor : :class:`~crvusdsim.pipelines.executor.PipelineExecutor`, optional
+        Persistent worker pool to reuse across calls instead of starting
+        `ncpu` new processes each time.
+
+    result_cache : str, optional
+        Directory caching the result of each run; reruns only simulate
+        the parameters missing from it.
+
+    work_queue : :class:`~crvusdsim.pipelines.distributed.WorkQueue`, optional
+        Queue distributing the runs to workers on any number of hosts,
+        see :mod:`crvusdsim.pipelines.distributed`.
+
     env: str, default='prod'
         Environment for the Curve subgraph, which pulls pool and volume snapshots.
 
@@ -1,10 +1,20 @@
 
-from math import floor, isqrt, log, log2, sqrt
 from abc import ABC, abstractmethod
 from pandas import DataFrame
 from crvusdsim.pool.sim_interface.sim_llamma import SimLLAMMAPool
 
 class BandsStrategy(ABC):
+    """
+    Class Attributes
+    ----------------
+    init_independent_params : frozenset
+        Run parameters :meth:`do_strategy` ignores: runs differing only in
+        these share their initialised market, see
+        :mod:`crvusdsim.pipelines.init_cache`.
+    """
+
+    init_independent_params = frozenset()
+
     def __init__(
         self, pool: SimLLAMMAPool, prices, controller=None, parameters=None, **kwargs
     ):
@@ -19,19 +29,19 @@ class BandsStrategy(ABC):
             Controller, default is None
         """
 
-        A = pool.A
         base_price = pool.get_base_price()
         init_price = int(prices.iloc[0, :].tolist()[0] * 10**18)
         max_price = int(prices.iloc[:, 0].max() * 10**18)
         min_price = int(prices.iloc[:, 0].min() * 10**18)
-        init_index = floor(log(init_price / base_price, (A - 1) / A))
-        min_index = floor(log(max_price / base_price, (A - 1) / A))
-        max_index = floor(log(min_price / base_price, (A - 1) / A)) + 1
+        init_index, min_index, max_index = pool.bands_for_prices(
+            [init_price, max_price, min_price]
+        ).tolist()
 
-        if abs(pool.p_oracle_up(min_index) / max_price) - 1 < 5e-3:
+        # Spare band above when max_price is within 0.5% of its band's top,
+        # and always two bands below the band of min_price.
+        if pool.p_oracle_up(min_index) * 200 < max_price * 201:
             min_index -= 1
-        if abs(pool.p_oracle_up(max_index) / min_price) - 1 < 5e-3:
-            max_index += 1
+        max_index += 2
 
         pool.min_band = min_index
         pool.max_band = max_index
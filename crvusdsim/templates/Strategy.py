@@ -1,8 +1,11 @@
+import pickle
 from abc import ABC, abstractmethod
 from typing import List
 
 from curvesim.logging import get_logger
 from crvusdsim.iterators.price_samplers.price_volume import PriceVolumeSample
+from crvusdsim.pipelines.init_cache import init_states
+from crvusdsim.pipelines.instrumentation import RunStats
 from crvusdsim.templates import Trader
 
 from crvusdsim.pool import SimMarketInstance
@@ -23,6 +26,12 @@ class Strategy(ABC):
         Class for creating trader instances.
     state_log_class : :class:`~curvesim.metrics.StateLog`
         Class for creating state logger instances.
+    report_interval : float
+        Seconds between two progress reports of a run, see
+        :class:`~crvusdsim.pipelines.instrumentation.RunStats`.
+    cache_init_states : bool
+        Reuse the markets initialised by the bands strategy across the
+        runs of a process, see :mod:`crvusdsim.pipelines.init_cache`.
 
     Attributes
     ----------
@@ -36,6 +45,8 @@ class Strategy(ABC):
     stableswap_trader_class = None
     pegkeeper_caller_class = None
     state_log_class = None
+    report_interval = 30
+    cache_init_states = True
 
     def __init__(self, metrics, sim_mode="rate", bands_strategy_class=None, bands_strategy_kwargs=None):
         """
@@ -74,6 +85,8 @@ class Strategy(ABC):
 
         """
         # pylint: disable=not-callable
+        prices = price_sampler.prices
+        sim_market = self._init_bands(sim_market, parameters, prices)
         (
             pool,
             controller,
@@ -106,25 +119,6 @@ class Strategy(ABC):
 
         logger.info("[%s] Simulating with %s", pool.symbol, parameters)
 
-        prices = price_sampler.prices
-
-        if self.bands_strategy_class is not None:
-            _kwargs = {}
-            if self.bands_strategy_kwargs is not None:
-                _kwargs = self.bands_strategy_kwargs
-            # close exchange fees when adjust bands
-            pool.fees_switch = False
-            bands_strategy = self.bands_strategy_class(
-                pool,
-                prices,
-                controller,
-                parameters,
-                **_kwargs,
-            )
-            bands_strategy.do_strategy()
-
-            pool.fees_switch = True
-
         aggregator.prepare_for_run(price_sampler)
         for pk in sim_market.peg_keepers:
             pk.prepare_for_run(prices)
@@ -136,12 +130,20 @@ class Strategy(ABC):
                 _symbols = (stable_pool.assets.symbols[0], "crvUSD")
                 stable_pool.prepare_for_run(price_sampler.peg_prices[_symbols])
 
+        stats = RunStats(parameters, len(prices), self.report_interval)
+        llamma_trader.stats = stats
         for sample in price_sampler:
+            stats.lap("price_sampler")
             stableswap_trade_datas = []
+            stableswap_trades = 0
             if sample.peg_prices is not None:
                 stableswap_trade_datas = self._process_stableswap(
                     stableswap_pools, sample, stableswap_traders
                 )
+                stableswap_trades = sum(
+                    len(data["trades"]) for data in stableswap_trade_datas.values() if data
+                )
+                stats.lap("stableswap")
 
             _ts = sample.timestamp.timestamp()
             aggregator.prepare_for_trades(_ts)
@@ -152,19 +154,83 @@ class Strategy(ABC):
             pool.price_oracle_contract.set_price(_p)
             pool.prepare_for_trades(_ts)
             controller.prepare_for_trades(_ts)
+            stats.lap("oracle_update")
 
+            # the base Trader laps "trader_compute" between its two halves,
+            # traders overriding process_time_sample only "trade_execution"
             trader_args = self._get_trader_inputs(sample)
             trade_data = llamma_trader.process_time_sample(*trader_args)
+            stats.lap("trade_execution")
+
+            n_liquidated = controller.after_trades(
+                do_liquidate=self.sim_mode in ["controller"]
+            )
+            stats.lap("after_trades")
 
-            controller.after_trades(do_liquidate=self.sim_mode in ["controller"])
             state_log.update(
                 price_sample=sample,
                 trade_data=trade_data,
                 stableswap_trade_datas=stableswap_trade_datas,
             )
+            snapshot = state_log.state_per_trade[-1]["state_data"]
+            stats.step(
+                trades=len(trade_data["trades"]) + stableswap_trades,
+                liquidations=n_liquidated,
+                snapshot_bytes=len(pickle.dumps(snapshot)),
+            )
+            stats.lap("state_log")
 
+        stats.report(finished=True)
         return state_log.compute_metrics()
 
+    def _init_bands(self, sim_market: SimMarketInstance, parameters, prices):
+        """
+        Runs the bands strategy on `sim_market`, or returns a copy of a
+        market this process already initialised the same way (see
+        :mod:`crvusdsim.pipelines.init_cache`).
+        """
+        if self.bands_strategy_class is None:
+            return sim_market
+
+        _kwargs = {}
+        if self.bands_strategy_kwargs is not None:
+            _kwargs = self.bands_strategy_kwargs
+
+        key = None
+        if self.cache_init_states:
+            key = init_states.key(
+                sim_market,
+                self.sim_mode,
+                parameters,
+                self.bands_strategy_class,
+                _kwargs,
+                prices,
+            )
+            cached = init_states.get(
+                key, sim_market, self.sim_mode, self.bands_strategy_class
+            )
+            if cached is not None:
+                logger.debug("Reusing initialised bands for %s", parameters)
+                return cached
+
+        pool = sim_market.pool
+        # close exchange fees when adjust bands
+        pool.fees_switch = False
+        bands_strategy = self.bands_strategy_class(
+            pool,
+            prices,
+            sim_market.controller,
+            parameters,
+            **_kwargs,
+        )
+        bands_strategy.do_strategy()
+
+        pool.fees_switch = True
+
+        if key is not None:
+            init_states.put(key, sim_market)
+        return sim_market
+
     @abstractmethod
     def _get_trader_inputs(self, sample):
         """
@@ -52,6 +52,10 @@ class Trader(ABC):
     Computes, executes, and reports out arbitrage trades.
     """
 
+    # :class:`~crvusdsim.pipelines.instrumentation.RunStats` of the current
+    # run, set by the strategy to time the trade computation
+    stats = None
+
     def __init__(self, pool):
         """
         Parameters
@@ -111,6 +115,8 @@ class Trader(ABC):
         :meth:`~curvesim.pipelines.templates.Strategy._get_trader_inputs`.
         """
         trades, additional_data = self.compute_trades(*args)
+        if self.stats is not None:
+            self.stats.lap("trader_compute")
         trade_results = self.do_trades(trades)
 
         return {"trades": trade_results, **additional_data}
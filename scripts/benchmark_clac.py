@@ -0,0 +1,61 @@
+"""
+Microbenchmark of the memoised wad math in `crvusdsim.pool.crvusd.clac`.
+
+Replays the argument mix of a price-sampled simulation (EMA decays with a
+fixed timestep, A ratios, debt bands) against the cached functions and
+their uncached `__wrapped__` originals, and checks every result is
+bit-identical before reporting timings.
+
+    python scripts/benchmark_clac.py
+"""
+import random
+from timeit import timeit
+
+from crvusdsim.pool.crvusd.clac import clear_caches, exp, exp_decay, ln_int, log2
+from crvusdsim.pool.crvusd.vyper_func import unsafe_div
+
+MA_TIME = 866
+N_CALLS = 100_000
+
+
+def workload(seed=0):
+    rng = random.Random(seed)
+    # 10m sampling with occasional gaps, as in PriceVolume data
+    dts = [600 if rng.random() < 0.95 else rng.choice([1200, 1800, 3600]) for _ in range(N_CALLS)]
+    powers = [-1 * unsafe_div(dt * 10**18, MA_TIME) for dt in dts]
+    a_ratios = [A * 10**18 // (A - 1) for A in rng.choices(range(20, 201), k=N_CALLS)]
+    return dts, powers, a_ratios
+
+
+def check_exact(dts, powers, a_ratios):
+    for dt, power, a_ratio in zip(dts, powers, a_ratios):
+        assert exp(power) == exp.__wrapped__(power)
+        assert exp_decay(dt, MA_TIME) == exp.__wrapped__(power)
+        assert ln_int(a_ratio) == ln_int.__wrapped__(a_ratio)
+        assert log2(a_ratio) == log2.__wrapped__(a_ratio)
+
+
+def main():
+    dts, powers, a_ratios = workload()
+    check_exact(dts, powers, a_ratios)
+    print(f"bit-exact on {N_CALLS} calls per function")
+
+    cases = [
+        ("exp", lambda: [exp.__wrapped__(p) for p in powers], lambda: [exp(p) for p in powers]),
+        (
+            "exp(dt)",
+            lambda: [exp.__wrapped__(-1 * unsafe_div(dt * 10**18, MA_TIME)) for dt in dts],
+            lambda: [exp_decay(dt, MA_TIME) for dt in dts],
+        ),
+        ("ln_int", lambda: [ln_int.__wrapped__(x) for x in a_ratios], lambda: [ln_int(x) for x in a_ratios]),
+        ("log2", lambda: [log2.__wrapped__(x) for x in a_ratios], lambda: [log2(x) for x in a_ratios]),
+    ]
+    for name, uncached, cached in cases:
+        clear_caches()
+        t0 = timeit(uncached, number=1)
+        t1 = timeit(cached, number=1)
+        print(f"{name:>8}: {t0:.3f}s -> {t1:.3f}s ({t0 / t1:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark of the inlined (fast) LLAMMA hot methods against the
+original (debug) ones, see `crvusdsim.pool.crvusd.fastpath`.
+
+Builds a LLAMMA with liquidity in 50 bands, checks that both modes give
+identical quotes, then times quoting and arbitrage-size searches.
+
+    python scripts/benchmark_fastpath.py
+"""
+from timeit import timeit
+
+from crvusdsim.pool.crvusd import LLAMMAPool, PriceOracle, set_fast_mode
+from crvusdsim.pool.crvusd.stablecoin import StableCoin
+from crvusdsim.pool.crvusd.utils import ERC20
+
+INIT_PRICE = 2000 * 10**18
+USER = "benchmark_user"
+N_QUOTES = 2000
+
+
+def make_amm():
+    collateral = ERC20(address="WETH_address", name="WETH", symbol="WETH", decimals=18)
+    amm = LLAMMAPool(
+        A=100,
+        BASE_PRICE=INIT_PRICE,
+        fee=6 * 10**15,
+        admin_fee=0,
+        price_oracle_contract=PriceOracle(INIT_PRICE),
+        collateral=collateral,
+        borrowed_token=StableCoin(),
+    )
+    deposit = 1000 * 10**18
+    collateral._mint(USER, deposit)
+    collateral.transfer(USER, amm.address, deposit)
+    amm.deposit_range(USER, deposit, 1, 50)
+    return amm
+
+
+def workload(amm):
+    p = amm.get_p()
+    out = []
+    for k in range(N_QUOTES):
+        amount = (k + 1) * 10**21
+        out.append(amm.get_dy(0, 1, amount))
+        out.append(amm.get_amount_for_price(p * (1000 - k % 200) // 1000))
+    return out
+
+
+def main():
+    amm = make_amm()
+    results = {}
+    times = {}
+    for fast in (False, True):
+        set_fast_mode(fast)
+        results[fast] = workload(amm)
+        times[fast] = timeit(lambda: workload(amm), number=3) / 3
+    assert results[True] == results[False], "fast mode differs from debug mode"
+    print(f"identical results on {2 * N_QUOTES} calls")
+    print(
+        f"debug {times[False]:.3f}s -> fast {times[True]:.3f}s "
+        f"({times[False] / times[True]:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark of the big-int backends of `crvusdsim.pool.crvusd.vyper_func`.
+
+Draws band states at the scale `LLAMMAPool._get_y0` sees (wad balances
+and prices around 2000), checks that both backends give identical
+results, then times the `_get_y0` square root alone, whole `_get_y0`
+calls, and a 10**36-scale `a * b // c` through GMP for comparison (the
+reason products stay on CPython ints). Needs `gmpy2`.
+
+    python scripts/benchmark_int_backend.py
+"""
+import math
+import random
+from timeit import repeat
+
+import gmpy2
+
+from crvusdsim.pool.crvusd import LLAMMAPool, PriceOracle
+from crvusdsim.pool.crvusd.stablecoin import StableCoin
+from crvusdsim.pool.crvusd.utils import ERC20
+from crvusdsim.pool.crvusd.vyper_func import get_int_backend, set_int_backend
+
+INIT_PRICE = 2000 * 10**18
+N_BANDS = 1000
+NUMBER = 50
+REPEAT = 5
+
+
+def make_amm():
+    collateral = ERC20(address="WETH_address", name="WETH", symbol="WETH", decimals=18)
+    return LLAMMAPool(
+        A=100,
+        BASE_PRICE=INIT_PRICE,
+        fee=6 * 10**15,
+        admin_fee=0,
+        price_oracle_contract=PriceOracle(INIT_PRICE),
+        collateral=collateral,
+        borrowed_token=StableCoin(),
+    )
+
+
+def workload(amm, seed=0):
+    rng = random.Random(seed)
+    bands = []
+    for _ in range(N_BANDS):
+        p_o = rng.randint(1500, 2500) * 10**18
+        p_o_up = p_o * rng.randint(95, 105) // 100
+        x = rng.randint(1, 10**6) * 10**18
+        y = rng.randint(1, 10**3) * 10**18
+        bands.append((x, y, p_o, p_o_up))
+
+    discriminants = []
+    for x, y, p_o, p_o_up in bands:
+        b = p_o_up * amm.Aminus1 * x // p_o + amm.A * p_o**2 // p_o_up * y // 10**18
+        discriminants.append(b**2 + 4 * amm.A * p_o * y // 10**18 * x)
+    return bands, discriminants
+
+
+def best(func):
+    return min(repeat(func, number=NUMBER, repeat=REPEAT))
+
+
+def best_once(func):
+    return min(repeat(func, number=NUMBER, repeat=1))
+
+
+def main():
+    amm = make_amm()
+    bands, discriminants = workload(amm)
+    initial = get_int_backend()
+
+    results = {}
+    for name in ("python", "gmpy2"):
+        set_int_backend(name)
+        results[name] = [amm._get_y0(*band) for band in bands]
+    assert results["python"] == results["gmpy2"]
+    assert [math.isqrt(d) for d in discriminants] == [
+        int(gmpy2.isqrt(d)) for d in discriminants
+    ]
+    print(f"bit-exact on {N_BANDS} band states")
+
+    mpz = gmpy2.mpz
+    cases = [
+        (
+            "isqrt",
+            lambda: [math.isqrt(d) for d in discriminants],
+            lambda: [int(gmpy2.isqrt(d)) for d in discriminants],
+        ),
+        (
+            "a*b//c",
+            lambda: [p_o_up * 99 * x // p_o for x, _, p_o, p_o_up in bands],
+            lambda: [int(mpz(p_o_up * 99) * x // p_o) for x, _, p_o, p_o_up in bands],
+        ),
+    ]
+    for name, python, gmp in cases:
+        t0, t1 = best(python), best(gmp)
+        print(f"{name:>8}: {t0:.3f}s -> {t1:.3f}s ({t0 / t1:.2f}x)")
+
+    # interleave the backends so drifting machine load hits both
+    times = {"python": [], "gmpy2": []}
+    for _ in range(REPEAT):
+        for name in times:
+            set_int_backend(name)
+            times[name].append(best_once(lambda: [amm._get_y0(*b) for b in bands]))
+    t0, t1 = min(times["python"]), min(times["gmpy2"])
+    print(f"{'_get_y0':>8}: {t0:.3f}s -> {t1:.3f}s ({t0 / t1:.2f}x)")
+
+    set_int_backend(initial)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from copy import deepcopy
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from crvusdsim.pool.crvusd import fastpath, is_fast_mode, set_fast_mode
+from crvusdsim.pool.crvusd.LLAMMA import LLAMMAPool
+from test.conftest import create_amm
+
+
+def _run(amm, user, deposit_amount, n1, dn, trade_frac, p_frac):
+    amm.COLLATERAL_TOKEN._mint(user, deposit_amount)
+    amm.COLLATERAL_TOKEN.transfer(user, amm.address, deposit_amount)
+    amm.deposit_range(user, deposit_amount, n1, n1 + dn)
+    amm._increment_timestamp(timedelta=600)
+    amount = int(deposit_amount * amm.get_p() // 10**18 * trade_frac)
+    out = [amm.get_dxdy(0, 1, amount), amm.get_dydx(0, 1, amount // 3)]
+    out.append(amm.exchange(0, 1, amount, 0))
+    target, pump = amm.get_amount_for_price(int(amm.get_p() * p_frac))
+    out.append((target, pump))
+    out.append(amm.get_p())
+    out.append(amm.get_y_up(user))
+    return out
+
+
+@given(
+    n1=st.integers(min_value=1, max_value=50),
+    dn=st.integers(min_value=0, max_value=49),
+    deposit_amount=st.integers(min_value=10**12, max_value=10**20),
+    trade_frac=st.floats(min_value=0.0, max_value=1.0),
+    p_frac=st.floats(min_value=0.5, max_value=2),
+)
+@settings(max_examples=50, deadline=None)
+def test_fast_mode_identical(accounts, n1, dn, deposit_amount, trade_frac, p_frac):
+    was_fast = is_fast_mode()
+    amm, _ = create_amm()
+    amm_debug = deepcopy(amm)
+    try:
+        set_fast_mode(True)
+        assert LLAMMAPool.calc_swap_out.__inlined_calls__ > 0
+        fast = _run(amm, accounts[0], deposit_amount, n1, dn, trade_frac, p_frac)
+        set_fast_mode(False)
+        assert not hasattr(LLAMMAPool.calc_swap_out, "__debug_impl__")
+        debug = _run(amm_debug, accounts[0], deposit_amount, n1, dn, trade_frac, p_frac)
+    finally:
+        set_fast_mode(was_fast)
+    assert fast == debug
+
+
+def test_fast_mode_without_sources(monkeypatch, caplog):
+    def no_source(func):
+        raise OSError("could not get source code")
+
+    was_fast = is_fast_mode()
+    monkeypatch.setattr(fastpath, "inline_unsafe", no_source)
+    monkeypatch.setattr(fastpath, "_inlined", {})
+    try:
+        set_fast_mode(True)
+        assert not hasattr(LLAMMAPool.calc_swap_out, "__debug_impl__")
+        assert "Can't inline LLAMMAPool.calc_swap_out" in caplog.text
+    finally:
+        monkeypatch.undo()
+        set_fast_mode(was_fast)
@@ -1,4 +1,10 @@
+from copy import deepcopy
 from time import time
+
+import numpy as np
+import pandas as pd
+
+from crvusdsim.pool.crvusd.price_oracle import PriceOracle, PriceOraclePath
 from test.conftest import create_amm
 from test.utils import approx
 
@@ -32,3 +38,73 @@ def test_p_current_updown():
         p_current_down = p_oracle**3 / p_base_up**2
         assert approx(amm.p_current_up(i), p_current_up, 1e-10)
         assert approx(amm.p_current_down(i), p_current_down, 1e-10)
+
+
+def _price_series(n=500, seed=7):
+    rng = np.random.default_rng(seed)
+    index = pd.to_datetime(1_700_000_000 + np.cumsum(rng.choice([300, 600, 1200], n)), unit="s")
+    values = 2000 * np.exp(np.cumsum(rng.normal(0, 0.005, n)))
+    return pd.DataFrame({"ETH/USD": values}, index=index)
+
+
+def test_price_oracle_from_series():
+    prices = _price_series()
+    live = PriceOracle(int(prices.iloc[0, 0] * 10**18))
+    live._increment_timestamp(timestamp=int(prices.index[0].timestamp()))
+    live.last_prices_timestamp = live._block_timestamp
+    fast = PriceOracle.from_series(prices)
+    shared = deepcopy(fast)
+    assert shared._path is fast._path
+
+    for i, (ts, row) in enumerate(prices.iterrows()):
+        _p = int(list(row.to_dict().values())[0] * 10**18)
+        for oracle in (live, fast, shared):
+            oracle.set_price(_p)
+            oracle._increment_timestamp(timestamp=ts.timestamp())
+        assert fast.price() == live.price()
+        # skip some writes so reads must fall back to the EMA formula
+        if i % 7 != 3:
+            assert fast.price_w() == live.price_w()
+        assert shared.price_w() == fast._path.oracle_prices[i]
+
+    # off-path timestamps
+    for oracle in (live, fast):
+        oracle._increment_timestamp(timedelta=100)
+    assert fast.price() == live.price()
+    assert len(PriceOraclePath.from_series(prices.iloc[:, 0])) == len(prices)
+
+
+def test_band_for_price():
+    amm, price_oracle = create_amm()
+    prices = []
+    for n in range(-50, 50):
+        p_up = amm.p_oracle_up(n)
+        p_down = amm.p_oracle_down(n)
+        for p in (p_up, p_up - 1, p_down + 1, (p_up + p_down) // 2):
+            assert amm.band_for_price(p) == n
+            prices.append(p)
+        assert amm.band_for_price(p_down) == n + 1
+    assert amm.bands_for_prices(prices).tolist() == [
+        amm.band_for_price(p) for p in prices
+    ]
+    assert len(amm.bands_for_prices([])) == 0
+
+
+def test_rate_mul_cache():
+    amm, price_oracle = create_amm()
+
+    def uncached():
+        rate_mul = amm.rate_mul * (
+            10**18 + amm.rate * (amm._block_timestamp - amm.rate_time)
+        ) // 10**18
+        return rate_mul, amm.BASE_PRICE * rate_mul // 10**18
+
+    amm.set_rate(10**10)
+    for _ in range(3):
+        amm._increment_timestamp(timedelta=3600)
+        assert (amm.get_rate_mul(), amm.get_base_price()) == uncached()
+        assert amm.p_oracle_up(0) == amm.get_base_price()
+    amm.set_rate(3 * 10**10)
+    assert (amm.get_rate_mul(), amm.get_base_price()) == uncached()
+    amm._increment_timestamp(timedelta=3600)
+    assert (amm.get_rate_mul(), amm.get_base_price()) == uncached()
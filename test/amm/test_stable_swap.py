@@ -3,7 +3,13 @@ from hypothesis import strategies as st
 
 from ..utils import approx
 from ..conftest import STABLE_A,STABLE_N,STABLE_FEE
-from crvusdsim.pool.crvusd.stableswap import CurveStableSwapPool
+from crvusdsim.pool.crvusd.stableswap import (
+    A_PRECISION,
+    CurveStableSwapPool,
+    _get_D,
+    _get_y,
+    _get_y_D,
+)
 
 
 # @given(
@@ -88,3 +94,97 @@ def test_stableswap_imbalance(accounts, stablecoin, other_coins):
     buy_amount = 3.968282314606846e+19
     dx = pool.get_dx(0, 1, buy_amount)
 
+
+
+def reference_get_D(xp, amp, n):
+    """`CurveStableSwapPool.get_D` before the solvers were memoised."""
+    S = sum(xp)
+    if S == 0:
+        return 0
+    D = S
+    Ann = amp * n
+    for _ in range(255):
+        D_P = D * D // xp[0] * D // xp[1] // (n**n)
+        Dprev = D
+        D = (
+            (Ann * S // A_PRECISION + D_P * n)
+            * D
+            // ((Ann - A_PRECISION) * D // A_PRECISION + (n + 1) * D_P)
+        )
+        if abs(D - Dprev) <= 1:
+            return D
+    raise AssertionError("get_D did not converge")
+
+
+def reference_solve_y(x_others, D, amp, n):
+    """Newton iteration shared by `get_y` and `get_y_D` before memoisation."""
+    S_ = 0
+    c = D
+    Ann = amp * n
+    for _x in x_others:
+        S_ += _x
+        c = c * D // (_x * n)
+    c = c * D * A_PRECISION // (Ann * n)
+    b = S_ + D * A_PRECISION // Ann
+    y = D
+    for _ in range(255):
+        y_prev = y
+        y = (y * y + c) // (2 * y + b - D)
+        if abs(y - y_prev) <= 1:
+            return y
+    raise AssertionError("get_y did not converge")
+
+
+def reference_get_y(i, j, x, xp, amp, D, n):
+    others = [x if k == i else xp[k] for k in range(n) if k != j]
+    return reference_solve_y(others, D, amp, n)
+
+
+def reference_get_y_D(amp, i, xp, D, n):
+    return reference_solve_y([xp[k] for k in range(n) if k != i], D, amp, n)
+
+
+@given(
+    dxs=st.lists(st.integers(min_value=1, max_value=10**6), min_size=1, max_size=5),
+)
+@settings(max_examples=20, deadline=None)
+def test_stableswap_newton_cache(stableswaps, dxs):
+    pool = stableswaps[0]
+    for k, dx in enumerate(dxs):
+        i, j = k % 2, 1 - k % 2
+        pool.coins[i]._mint("newton_user", dx * 10**18)
+        pool.exchange(i, j, dx * 10**18, _receiver="newton_user")
+
+        xp = pool._xp()
+        D = pool.get_D(xp, pool.A)
+        assert D == reference_get_D(xp, pool.A, pool.n)
+        assert D == _get_D(tuple(xp), pool.A, pool.n)
+        x = xp[i] + dx * 10**18
+        y = reference_get_y(i, j, x, xp, pool.A, D, pool.n)
+        assert pool.get_y(i, j, x, xp, pool.A, D) == y
+        assert _get_y(i, j, x, tuple(xp), pool.A, D, pool.n) == y
+        y_D = reference_get_y_D(pool.A, j, xp, D - 10**18, pool.n)
+        assert pool.get_y_D(pool.A, j, xp, D - 10**18) == y_D
+        assert _get_y_D(pool.A, j, tuple(xp), D - 10**18, pool.n) == y_D
+
+
+def test_stableswap_price_cache(stableswaps):
+    pool = stableswaps[0]
+
+    def uncached_p():
+        xp = pool._xp()
+        return pool._get_p(xp, pool.A, pool.get_D(xp, pool.A))
+
+    p0 = pool.get_p()
+    assert p0 == uncached_p()
+    assert pool.price_oracle() == pool._ma_price()
+
+    pool._increment_timestamp(timedelta=600)
+    pool.exchange(0, 1, 10000 * 10**18)
+    assert pool.get_p() == uncached_p() != p0
+    assert pool.price_oracle() == pool._ma_price()
+
+    pool._increment_timestamp(timedelta=600)
+    assert pool.price_oracle() == pool._ma_price()
+    pool.balances[1] += 10**18
+    assert pool.get_p() == uncached_p()
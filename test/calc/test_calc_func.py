@@ -1,10 +1,40 @@
+import pytest
 from hypothesis import given, settings
 from hypothesis import strategies as st
 from math import log2
+from crvusdsim.pool.crvusd.clac import exp, exp_decay, ln_int
 from crvusdsim.pool.crvusd.clac import log2 as vyper_log2
+from crvusdsim.pool.crvusd.vyper_func import unsafe_div
+from crvusdsim.pool.crvusd.vyper_func.backend import make_backend
 from ..utils import approx
 
 @given(x=st.integers(min_value=1, max_value=10**12))
 def test_log2(x):
     x *= 10**18
-    assert approx(vyper_log2(x), int(1e18 * log2(x / 1e18)), 1e-10)
\ No newline at end of file
+    assert approx(vyper_log2(x), int(1e18 * log2(x / 1e18)), 1e-10)
+
+
+@given(power=st.integers(min_value=-(43 * 10**18), max_value=136 * 10**18))
+def test_exp_cached(power):
+    assert exp(power) == exp.__wrapped__(power)
+    assert exp(power) == exp.__wrapped__(power)
+
+
+@given(x=st.integers(min_value=1, max_value=10**30))
+def test_ln_log2_cached(x):
+    assert ln_int(x) == ln_int.__wrapped__(x)
+    assert vyper_log2(x) == vyper_log2.__wrapped__(x)
+
+
+@given(dt=st.integers(min_value=0, max_value=10**6))
+def test_exp_decay(dt):
+    assert exp_decay(dt, 866) == exp.__wrapped__(-1 * unsafe_div(dt * 10**18, 866))
+
+
+@given(a=st.integers(min_value=0, max_value=10**80))
+def test_int_backends(a):
+    pytest.importorskip("gmpy2")
+    gmpy2_backend = make_backend("gmpy2")
+    python_backend = make_backend("python")
+    assert gmpy2_backend.isqrt(a) == python_backend.isqrt(a)
+    assert type(gmpy2_backend.isqrt(a)) is int
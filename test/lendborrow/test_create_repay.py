@@ -159,3 +159,44 @@ def test_borrow_more(accounts):
     assert stablecoin.balanceOf[market_amm] == 0
     # assert collateral_token.balanceOf[market_amm] == c_amount
     assert controller.total_debt() == debt + more_debt
+
+
+def test_loan_book_remove_and_snapshot(accounts):
+    controller, market_amm = create_controller_amm()
+    stablecoin = controller.STABLECOIN
+    collateral = controller.COLLATERAL_TOKEN
+    c_amount = 10**18
+    users = ["book_user_%d" % i for i in range(4)]
+
+    for user in users:
+        collateral._mint(user, c_amount)
+        debt = controller.max_borrowable(c_amount, 5) // 2
+        controller.create_loan(user, c_amount, debt, 5)
+    assert controller.n_loans == 4
+    assert [controller.loans[i] for i in range(4)] == users
+
+    snapshot = controller.get_snapshot()
+    debts = {user: controller.debt(user) for user in users}
+
+    # full repay swap-removes the loan: the last loan takes its index
+    stablecoin._mint(users[1], debts[users[1]])
+    controller.repay(debts[users[1]], users[1])
+    assert controller.n_loans == 3
+    assert not controller.loan_exists(users[1])
+    assert users[1] not in controller.loan
+    assert controller.loans[1] == users[3]
+    assert controller.loan_ix[users[3]] == 1
+    assert controller.debt(users[3]) == debts[users[3]]
+
+    # a new loan gets a fresh index and does not overwrite anyone
+    collateral._mint(users[1], c_amount)
+    controller.create_loan(users[1], c_amount, debts[users[1]], 5)
+    assert controller.n_loans == 4
+    assert controller.loan_ix[users[1]] == 3
+    assert controller.loan_book.debts(market_amm.get_rate_mul()) == [
+        controller.debt(user) for user in controller.loans.values()
+    ]
+
+    controller.revert_to_snapshot(snapshot)
+    assert list(controller.loans.values()) == users
+    assert {user: controller.debt(user) for user in users} == debts
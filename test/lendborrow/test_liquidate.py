@@ -1,7 +1,9 @@
+from copy import deepcopy
 import pytest
 from hypothesis import given, settings
 from hypothesis import strategies as st
 
+from crvusdsim.pool.sim_interface.sim_controller import SimController
 from test.conftest import create_controller_amm, stablecoin
 from ..utils import approx
 
@@ -195,3 +197,63 @@ def test_tokens_to_liquidate(accounts, controller_for_liquidation, frac):
         )
     else:
         assert balance != initial_balance - tokens_to_liquidate
+
+
+def _sim_controller_with_bad_loans(n_users):
+    controller, market_amm = create_controller_amm()
+    sim_controller = SimController(
+        stablecoin=controller.STABLECOIN,
+        factory=controller.FACTORY,
+        collateral_token=controller.COLLATERAL_TOKEN.address,
+        loan_discount=controller.loan_discount,
+        liquidation_discount=controller.liquidation_discount,
+        amm=market_amm,
+        monetary_policy=controller.monetary_policy,
+        address=controller.address,
+    )
+    collateral = sim_controller.COLLATERAL_TOKEN
+    price_oracle = market_amm.price_oracle_contract
+
+    for i in range(n_users):
+        user = "batch_user_%d" % i
+        collateral_amount = (i + 1) * 10**18
+        debt = sim_controller.max_borrowable(collateral_amount, N + i % 3)
+        collateral._mint(user, collateral_amount)
+        sim_controller.create_loan(user, collateral_amount, debt, N + i % 3)
+
+    p = price_oracle.price() * 8 // 10
+    price_oracle._price_last = p
+    price_oracle._price_oracle = p
+
+    return sim_controller, deepcopy(sim_controller)
+
+
+def test_liquidate_sim_batch():
+    sequential, batched = _sim_controller_with_bad_loans(6)
+    n_liquidated = len(sequential.users_to_liquidate())
+    assert n_liquidated > 1
+
+    assert sequential.after_trades(do_liquidate=True, batch=False) == n_liquidated
+    assert batched.after_trades(do_liquidate=True, batch=True) == n_liquidated
+    assert batched.after_trades(do_liquidate=True) == 0
+
+    assert len(batched.users_liquidated) == n_liquidated
+    assert dict(batched.loans) == dict(sequential.loans)
+    assert dict(batched.loan_ix) == dict(sequential.loan_ix)
+    assert batched.n_loans == sequential.n_loans
+    assert batched.redeemed == sequential.redeemed
+    assert vars(batched._total_debt) == vars(sequential._total_debt)
+    for user, position in sequential.users_liquidated.items():
+        assert vars(batched.users_liquidated[user]) == vars(position)
+
+    for attr in ["rate", "rate_mul", "min_band", "max_band"]:
+        assert getattr(batched.AMM, attr) == getattr(sequential.AMM, attr)
+    assert dict(batched.AMM.bands_x) == dict(sequential.AMM.bands_x)
+    assert dict(batched.AMM.bands_y) == dict(sequential.AMM.bands_y)
+    for token in ["STABLECOIN", "COLLATERAL_TOKEN"]:
+        a = getattr(batched, token)
+        b = getattr(sequential, token)
+        assert a.totalSupply == b.totalSupply
+        assert {k: v for k, v in a.balanceOf.items() if v} == {
+            k: v for k, v in b.balanceOf.items() if v
+        }
@@ -1,6 +1,8 @@
 import pytest
 from hypothesis import given, settings
 from hypothesis import strategies as st
+from crvusdsim.iterators.params_samplers.pool_mixins import controller_A_params
+from test.conftest import create_controller_amm
 from ..utils import approx
 
 
@@ -41,3 +43,60 @@ def test_min_collateral(controller_and_amm, debt_amount, n):
     controller, pool = controller_and_amm
     min_collateral = controller.min_collateral(debt_amount, n)
     controller.calculate_debt_n1(min_collateral, debt_amount, n)
+
+
+def test_max_borrowable_grid(controller_and_amm):
+    controller, pool = controller_and_amm
+    collaterals = [10**6, 10**15, 10**18, 37 * 10**18 + 1]
+    Ns = [4, 5, 17, 50]
+
+    grid = controller.max_borrowable_grid(collaterals, Ns)
+    for i, collateral in enumerate(collaterals):
+        for j, n in enumerate(Ns):
+            assert grid[i][j] == controller.max_borrowable(collateral, n)
+
+
+def test_min_collateral_grid(controller_and_amm):
+    controller, pool = controller_and_amm
+    debts = [100, 10**18, 3 * 10**21 + 7]
+    Ns = [4, 5, 17, 50]
+
+    grid = controller.min_collateral_grid(debts, Ns)
+    for i, debt in enumerate(debts):
+        for j, n in enumerate(Ns):
+            assert grid[i][j] == controller.min_collateral(debt, n)
+
+
+def _y_effective_loop(controller, collateral, N, discount):
+    d_y_effective = (
+        collateral
+        * (
+            10**18
+            - min(
+                discount + (DEAD_SHARES * 10**18) // max(collateral // N, DEAD_SHARES),
+                10**18,
+            )
+        )
+        // (controller.SQRT_BAND_RATIO * N)
+    )
+    y_effective = d_y_effective
+    for _ in range(1, N):
+        d_y_effective = d_y_effective * controller.Aminus1 // controller.A
+        y_effective += d_y_effective
+    return y_effective
+
+
+@given(
+    collateral_amount=st.integers(min_value=10**6, max_value=10**24),
+    n=st.integers(min_value=4, max_value=50),
+)
+@settings(max_examples=200)
+def test_y_effective_table(collateral_amount, n):
+    controller, _ = create_controller_amm()
+    discount = controller.loan_discount
+    for A in [controller.A, 30, 1000]:
+        controller_A_params(controller, A)
+        for _ in range(2):  # table miss, then table hit
+            assert controller.get_y_effective(
+                collateral_amount, n, discount
+            ) == _y_effective_loop(controller, collateral_amount, n, discount)
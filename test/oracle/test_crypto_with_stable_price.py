@@ -78,3 +78,52 @@ def test_chainlink_limits(frac, market):
     # Raise collateral price, ensure chainlink limits are respected
     price3 = trade(oracle, oracle.tricrypto[i], 0, ix, frac)
     assert approx(price3, price1, 1e-8)
+
+
+@given(
+    frac=st.floats(min_value=0.1, max_value=0.9),
+    market=st.sampled_from(["weth", "wbtc", "wsteth", "sfrxeth"]),
+)
+def test_price_cache(frac, market):
+    oracle = create_crypto_with_stable_price_oracle(market)
+
+    def uncached_price():
+        return oracle._raw_price(oracle._ema_tvl(), oracle.stable_aggregator.price())
+
+    p = oracle.price_w()
+    objects = oracle.tricrypto + oracle.stableswap + [oracle, oracle.stable_aggregator]
+    increment_timestamps(objects, oracle._block_timestamp + 60 * 60)
+    # reads do not move the TVL EMA, and repeated reads hit the cache
+    assert oracle.price() == oracle.price() == uncached_price()
+    cache = oracle._price_cache
+    assert oracle._price_last == oracle.price()
+    assert oracle._price_cache is cache
+
+    i = random.randint(0, len(oracle.stableswap) - 1)
+    p2 = trade(oracle, oracle.stableswap[i], 1, 0, frac)
+    assert p2 == uncached_price() != p
+
+
+def test_tricrypto_prices():
+    import pandas as pd
+
+    oracle = create_crypto_with_stable_price_oracle("weth")
+    p = oracle.price_w()
+    ts = oracle._block_timestamp
+    p_crypto = [
+        pool.price_oracle()[ix] / 1e18
+        for pool, ix in zip(oracle.tricrypto, oracle.tricrypto_ix)
+    ]
+    prices = pd.DataFrame(
+        [p_crypto, [2 * x for x in p_crypto]],
+        index=pd.to_datetime([ts, ts + 600], unit="s"),
+    )
+    oracle.use_tricrypto_prices(prices)
+    assert approx(oracle.price(), p, 1e-12)
+
+    objects = oracle.tricrypto + oracle.stableswap + [oracle, oracle.stable_aggregator]
+    increment_timestamps(objects, ts + 600)
+    assert approx(oracle.price(), 2 * p, 1e-3)
+
+    oracle.use_tricrypto_prices(None)
+    assert approx(oracle.price(), p, 1e-3)
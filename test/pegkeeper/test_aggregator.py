@@ -19,4 +19,25 @@ def test_aggregator(factory, aggregator, stablecoin, other_coins, stableswaps):
 
     after_agg_price = aggregator.price()
 
-    assert after_agg_price > before_agg_price
\ No newline at end of file
+    assert after_agg_price > before_agg_price
+
+def test_aggregator_price_cache(aggregator, stableswaps):
+    def uncached_price():
+        return aggregator._price(aggregator._ema_tvl())
+
+    assert aggregator.price() == uncached_price()
+    cache = aggregator._price_cache
+    assert aggregator.price() == uncached_price()
+    assert aggregator._price_cache is cache
+
+    for pool in stableswaps:
+        pool._increment_timestamp(timedelta=600)
+        pool.exchange(0, 1, 10000 * 10**18)
+        assert aggregator.price() == uncached_price()
+    assert aggregator._price_cache is not cache
+
+    aggregator._increment_timestamp(timedelta=600)
+    p = aggregator.price()
+    assert p == uncached_price()
+    assert aggregator.price_w() == p
+    assert aggregator.price() == uncached_price()
@@ -3,6 +3,7 @@ from hypothesis import given, settings
 from hypothesis import strategies as st
 from crvusdsim.pool.crvusd.conf import ARBITRAGUR_ADDRESS
 from crvusdsim.pool.crvusd.stabilizer.peg_keeper import ACTION_DELAY
+from test.conftest import _create_monetary_policy
 from test.utils import approx
 
 
@@ -19,8 +20,28 @@ def test_pegkeepers_params(
         assert pk.aggregator() == aggregator
 
 
+def test_pegkeepers_shared_policies(aggregator, pegkeepers, factory, monetary_policy):
+    # crvUSD markets share their peg keepers
+    other_policy = _create_monetary_policy(aggregator, pegkeepers, factory)
+    pk = pegkeepers[0]
+    delta = 10**21
+    pk._change_debt(delta)
+    try:
+        assert monetary_policy.pk_debt == sum(pk.debt for pk in pegkeepers)
+        assert other_policy.pk_debt == monetary_policy.pk_debt
+    finally:
+        pk._change_debt(-delta)
+        pk._debt_observers.remove(other_policy)
+
+
 def test_pegkeepers_update(
-    factory, aggregator, stablecoin, other_coins, stableswaps, pegkeepers
+    factory,
+    aggregator,
+    stablecoin,
+    other_coins,
+    stableswaps,
+    pegkeepers,
+    monetary_policy,
 ):
     beneficiary_addr = "_beneficiary_address"
     buy_amount = 1 * 10**5 * 10**18
@@ -54,6 +75,7 @@ def test_pegkeepers_update(
         caller_profit = pk.update(beneficiary_addr)
         assert pool.balanceOf[pk.address] > 0
         assert old_pool_p > pool.get_p(), "price must go down after provide"
+    assert monetary_policy.pk_debt == sum(pk.debt for pk in pegkeepers) > 0
 
     # make crvUSD price under water
     aggregator._increment_timestamp(timedelta=time_delta)
@@ -80,6 +102,7 @@ def test_pegkeepers_update(
         pk = pegkeepers[i]
         caller_profit = pk.update(beneficiary_addr)
         assert caller_profit > 0, "must have profit"
+    assert monetary_policy.pk_debt == sum(pk.debt for pk in pegkeepers)
 
     aggregator._increment_timestamp(timedelta=time_delta)
 
@@ -0,0 +1,96 @@
+import pytest
+import numpy as np
+import pandas as pd
+from curvesim.templates import SimAssets
+
+from crvusdsim.iterators.price_samplers import PriceVolume
+from crvusdsim.pool import get_sim_market
+
+crvUSD_address = "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E".lower()
+wstETH_address = "0x7f39C581F595B53c5cb19bD0b3f8dA6c935E2Ca0".lower()
+USDC_address = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+
+
+def make_price_volume(data_dir, n=200, seed=0) -> PriceVolume:
+    """`PriceVolume` over a local random walk with 15 minute gaps."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2023-08-01", periods=n, freq="15min", tz="UTC")
+    data = pd.DataFrame(
+        {
+            "price": 2000 * np.exp(np.cumsum(rng.normal(0, 0.002, n))),
+            "volume": rng.uniform(1e5, 1e6, n),
+        },
+        index=index,
+    )
+    data.to_csv(data_dir / f"{wstETH_address}-{crvUSD_address}.csv")
+
+    assets = SimAssets(
+        symbols=["crvUSD", "wstETH"],
+        addresses=[crvUSD_address, wstETH_address],
+        chain="mainnet",
+    )
+    sampler = PriceVolume(assets, data_dir=str(data_dir), src="local")
+
+    peg_prices = pd.DataFrame(
+        {"price": 1 + rng.normal(0, 1e-3, len(sampler.prices))},
+        index=sampler.prices.index,
+    )
+    sampler.load_pegcoins_prices(prices={("USDC", "crvUSD"): peg_prices.iloc[::2]})
+    return sampler
+
+
+@pytest.fixture
+def price_sampler(tmp_path):
+    return make_price_volume(tmp_path)
+
+
+def make_pool_metadata():
+    """Minimal market metadata without stableswap pools or peg keepers."""
+    llamma_address = "0x37417b2238aa52d0dd2d6252d989e728e8f706e4"
+    controller_address = "0x100daa78fc509db39ef7d04de0c1abd299f4c6ce"
+    return {
+        "symbol": "wstETH",
+        "llamma_params": {
+            "address": llamma_address,
+            "A": "100",
+            "rate": "0",
+            "rate_mul": str(10**18),
+            "fee": "0.006",
+            "admin_fee": "0",
+            "BASE_PRICE": "2000",
+            "active_band": "0",
+            "min_band": "0",
+            "max_band": "0",
+        },
+        "controller_params": {
+            "address": controller_address,
+            "loan_discount": "0.09",
+            "liquidation_discount": "0.06",
+        },
+        "policy_params": {
+            "address": "0x1e7d3bf98d3f8d8ce193236c3e0ec4b00e32daae",
+            "rate0": 3 * 10**9,
+            "sigma": 2 * 10**16,
+            "fraction": 10 * 10**16,
+        },
+        "price_oracle_params": {"oracle_price": "2000"},
+        "collateral_token_params": {
+            "address": wstETH_address,
+            "precision": "18",
+            "symbol": "wstETH",
+            "name": "wstETH",
+        },
+        "coins": {
+            "addresses": [crvUSD_address, wstETH_address],
+            "names": ["crvUSD", "wstETH"],
+            "decimals": [18, 18],
+        },
+        "stableswap_pools_params": [],
+        "peg_keepers_params": [],
+        "debt_ceilings": {controller_address: 10**7 * 10**18},
+    }
+
+
+@pytest.fixture
+def sim_market():
+    return get_sim_market(make_pool_metadata())
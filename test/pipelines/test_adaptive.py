@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+from curvesim.exceptions import CurvesimValueError
+
+from crvusdsim.iterators.params_samplers import ParameterizedLLAMMAPoolIterator
+from crvusdsim.pipelines import run_pipeline
+from crvusdsim.pipelines.adaptive import health_violations, successive_halving
+
+runs = []
+
+
+def distance_strategy(sim_market, params, price_sampler):
+    """Arb loss grows with the distance of A from 100 and the path length."""
+    n = len(price_sampler.prices)
+    runs.append((params["A"], n))
+    loss = abs(params["A"] - 100) * n
+    state_data = pd.DataFrame({"arb_profits_percent": [0, loss]})
+    return params, None, None, state_data
+
+
+def test_head(price_sampler):
+    n_samples = len(price_sampler.prices)
+    head = price_sampler.head(50)
+    assert head.prices.equals(price_sampler.prices.iloc[:50])
+    assert head.volumes.equals(price_sampler.volumes.iloc[:50])
+
+    peg = head.peg_prices[("USDC", "crvUSD")]
+    full_peg = price_sampler.peg_prices[("USDC", "crvUSD")]
+    assert peg.equals(full_peg[full_peg.index <= head.prices.index[-1]])
+    assert len(peg) < len(full_peg)
+    assert len(price_sampler.prices) == n_samples
+
+
+def test_successive_halving(sim_market, price_sampler):
+    A = [40, 70, 90, 100, 110, 130, 160, 200, 250]
+    param_sampler = ParameterizedLLAMMAPoolIterator(
+        sim_market, sim_mode="pool", variable_params={"A": A}
+    )
+    runs.clear()
+    results = successive_halving(
+        param_sampler, price_sampler, distance_strategy, ncpu=1
+    )
+
+    # 9 candidates on 1/9 of the path, 3 on 1/3, then the best on all of it
+    n = len(price_sampler.prices)
+    ninth, third = -(-n // 9), -(-n // 3)
+    assert [length for _, length in runs] == [ninth] * 9 + [third] * 3 + [n]
+    assert [a for a, length in runs if length == third] == [90, 100, 110]
+    assert [params["A"] for params in results[0]] == [100]
+
+    expected = run_pipeline(
+        ParameterizedLLAMMAPoolIterator(
+            sim_market, sim_mode="pool", variable_params={"A": [100]}
+        ),
+        price_sampler,
+        distance_strategy,
+        ncpu=1,
+    )
+    assert results[3][0].equals(expected[3][0])
+
+
+def test_health_violations():
+    state_data = pd.DataFrame(
+        {
+            # two open loans, one underwater, then two liquidated users
+            "users_health": [[0.1], [0.2, -0.05, -0.3, -0.4]],
+            "liquidation_count": [0, 2],
+        }
+    )
+    assert health_violations((None, None, None, state_data)) == 3
+
+
+def test_successive_halving_rate_mode(sim_market, price_sampler):
+    param_sampler = ParameterizedLLAMMAPoolIterator(
+        sim_market, sim_mode="rate", variable_params={"rate0": [0.05, 0.1]}
+    )
+    with pytest.raises(CurvesimValueError, match="explicit `score`"):
+        successive_halving(param_sampler, price_sampler, distance_strategy, ncpu=1)
@@ -0,0 +1,164 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+from curvesim.exceptions import CurvesimValueError
+
+from crvusdsim.iterators.params_samplers import ParameterizedLLAMMAPoolIterator
+from crvusdsim.pipelines import DirectoryQueue, QueueServer, TCPQueue, run_pipeline
+from crvusdsim.pipelines.distributed import MemoryQueue, run_worker
+from test.pipelines.test_run_pipeline import failing_strategy, market_strategy
+
+
+def tcp_worker(address, authkey):
+    run_worker(TCPQueue(address, authkey), idle_timeout=2)
+
+
+def directory_worker(directory):
+    run_worker(DirectoryQueue(directory, poll_interval=0.01), idle_timeout=2)
+
+
+def dying_worker(make_queue, *args):
+    """Claims a task and dies before pushing its result."""
+    make_queue(*args).get_task(timeout=10)
+    os._exit(1)
+
+
+def late_directory_worker(directory):
+    time.sleep(0.5)
+    run_worker(
+        DirectoryQueue(directory, poll_interval=0.01, lease_timeout=1), idle_timeout=3
+    )
+
+
+def late_tcp_worker(address, authkey):
+    time.sleep(0.5)
+    run_worker(TCPQueue(address, authkey), idle_timeout=3)
+
+
+def start_workers(target, *args, n=2):
+    workers = [multiprocessing.Process(target=target, args=args) for _ in range(n)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+@pytest.mark.parametrize("queue_type", [MemoryQueue, DirectoryQueue])
+def test_work_queue(tmp_path, queue_type):
+    queue = queue_type() if queue_type is MemoryQueue else queue_type(tmp_path)
+    assert queue.get_task(timeout=0) is None
+
+    queue.publish("s1", b"template")
+    for i in range(3):
+        queue.put_task("s1", i, bytes([i]))
+    queue.put_task("s2", 0, b"other")
+    assert queue.template("s1") == b"template"
+
+    assert queue.get_task(timeout=0) == ("s1", 0, bytes([0]))
+    queue.put_result("s1", 0, b"result")
+    queue.put_result("s2", 0, b"unpublished sweep")
+    assert queue.get_result("s1", timeout=0) == (0, b"result")
+    assert queue.get_result("s1", timeout=0) is None
+
+    queue.discard("s1")
+    assert queue.template("s1") is None
+    assert queue.get_task(timeout=0) == ("s2", 0, b"other")
+    assert queue.get_task(timeout=0) is None
+
+
+@pytest.mark.parametrize("queue_type", [MemoryQueue, DirectoryQueue])
+def test_work_queue_lease(tmp_path, queue_type):
+    if queue_type is MemoryQueue:
+        queue = queue_type(lease_timeout=0)
+    else:
+        queue = queue_type(tmp_path, lease_timeout=0)
+    queue.publish("s1", b"template")
+    queue.put_task("s1", 0, b"task")
+
+    # the expired claim is queued again, until a result releases it
+    assert queue.get_task(timeout=0) == ("s1", 0, b"task")
+    assert queue.get_task(timeout=0) == ("s1", 0, b"task")
+    queue.put_result("s1", 0, b"result")
+    assert queue.get_task(timeout=0) is None
+    assert queue.get_result("s1", timeout=0) == (0, b"result")
+
+
+def test_run_pipeline_dead_worker(tmp_path, sim_market):
+    param_sampler = ParameterizedLLAMMAPoolIterator(
+        sim_market, sim_mode="pool", variable_params={"A": [50, 100, 150, 200]}
+    )
+    expected = run_pipeline(param_sampler, None, market_strategy, ncpu=1)
+
+    directory = str(tmp_path)
+    workers = start_workers(dying_worker, DirectoryQueue, directory, n=1)
+    workers += start_workers(late_directory_worker, directory, n=1)
+    results = run_pipeline(
+        param_sampler,
+        None,
+        market_strategy,
+        work_queue=DirectoryQueue(tmp_path, poll_interval=0.01),
+    )
+    assert results == expected
+
+    with QueueServer(lease_timeout=1) as server:
+        address, authkey = server.address, server.authkey
+        workers += start_workers(dying_worker, TCPQueue, address, authkey, n=1)
+        workers += start_workers(late_tcp_worker, address, authkey, n=1)
+        results = run_pipeline(
+            param_sampler, None, market_strategy, work_queue=server.queue
+        )
+        assert results == expected
+
+    for worker in workers:
+        worker.join()
+    assert [worker.exitcode for worker in workers] == [1, 0, 1, 0]
+
+
+def test_queue_server_errors():
+    with QueueServer() as server:
+        client = TCPQueue(server.address, server.authkey)
+        with pytest.raises(CurvesimValueError, match="Unknown queue method"):
+            client._call("close")
+        with pytest.raises(TypeError):
+            client._call("put_task", "s1")
+        # the connection is still served
+        assert client.template("s1") is None
+        client.close()
+
+
+def test_run_pipeline_distributed(tmp_path, sim_market):
+    param_sampler = ParameterizedLLAMMAPoolIterator(
+        sim_market, sim_mode="pool", variable_params={"A": [50, 100, 150, 200]}
+    )
+    expected = run_pipeline(param_sampler, None, market_strategy, ncpu=1)
+
+    workers = start_workers(directory_worker, str(tmp_path))
+    results = run_pipeline(
+        param_sampler,
+        None,
+        market_strategy,
+        work_queue=DirectoryQueue(tmp_path, poll_interval=0.01),
+        max_in_flight=3,
+    )
+    assert results == expected
+
+    with QueueServer() as server:
+        workers += start_workers(tcp_worker, server.address, server.authkey)
+        results = run_pipeline(
+            param_sampler, None, market_strategy, work_queue=server.queue
+        )
+        assert results == expected
+
+        # markets sent with the tasks
+        with pytest.raises(AssertionError, match="boom"):
+            run_pipeline(
+                [(sim_market, {"i": i}) for i in range(6)],
+                None,
+                failing_strategy,
+                work_queue=server.queue,
+            )
+
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
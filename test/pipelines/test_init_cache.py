@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from crvusdsim.iterators.params_samplers import ParameterizedLLAMMAPoolIterator
+from crvusdsim.metrics import init_metrics
+from crvusdsim.pipelines import run_pipeline
+from crvusdsim.pipelines.common import DEFAULT_POOL_METRICS, DEFAULT_RATE_METRICS
+from crvusdsim.pipelines.init_cache import init_states
+from crvusdsim.pipelines.simple.bands_strategy import (
+    IinitYBandsStrategy,
+    SimpleUsersBandsStrategy,
+)
+from crvusdsim.pipelines.simple.strategy import SimpleStrategy
+
+
+@pytest.mark.parametrize(
+    "sim_mode,metrics,bands_strategy_class,bands_strategy_kwargs,variable_params,n_states",
+    [
+        (
+            "rate",
+            DEFAULT_RATE_METRICS,
+            SimpleUsersBandsStrategy,
+            {"debt_ratios": [0.9] * 20, "collateral_amount": 10 * 10**18},
+            {"rate0": [0.05, 0.10, 0.15]},
+            1,
+        ),
+        (
+            "pool",
+            DEFAULT_POOL_METRICS,
+            IinitYBandsStrategy,
+            None,
+            {"admin_fee": [0, 5 * 10**17], "fee": [3 * 10**15, 6 * 10**15]},
+            2,
+        ),
+    ],
+)
+def test_init_cache(
+    sim_market,
+    price_sampler,
+    sim_mode,
+    metrics,
+    bands_strategy_class,
+    bands_strategy_kwargs,
+    variable_params,
+    n_states,
+):
+    strategy = SimpleStrategy(
+        init_metrics(metrics, sim_market=sim_market),
+        sim_mode=sim_mode,
+        bands_strategy_class=bands_strategy_class,
+        bands_strategy_kwargs=bands_strategy_kwargs,
+    )
+    param_sampler = ParameterizedLLAMMAPoolIterator(
+        sim_market, sim_mode=sim_mode, variable_params=variable_params
+    )
+
+    results = {}
+    for cache_init_states in (False, True):
+        init_states.clear()
+        strategy.cache_init_states = cache_init_states
+        results[cache_init_states] = run_pipeline(
+            param_sampler, price_sampler, strategy, ncpu=1
+        )
+
+    # one initialisation per value of the init-dependent params
+    assert len(init_states) == n_states
+    init_states.clear()
+
+    for uncached, cached in zip(results[False], results[True]):
+        for expected, df in zip(uncached, cached):
+            pd.testing.assert_frame_equal(df, expected)
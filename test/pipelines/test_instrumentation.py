@@ -0,0 +1,82 @@
+import pytest
+
+from crvusdsim.iterators.params_samplers import ParameterizedLLAMMAPoolIterator
+from crvusdsim.metrics import init_metrics
+from crvusdsim.pipelines import ProgressMonitor, RunStats, run_pipeline
+from crvusdsim.pipelines.common import DEFAULT_POOL_METRICS
+from crvusdsim.pipelines.instrumentation import PHASES
+from crvusdsim.pipelines.simple.bands_strategy import IinitYBandsStrategy
+from crvusdsim.pipelines.simple.strategy import SimpleStrategy
+from crvusdsim.pipelines.simple.trader import SimpleArbitrageur
+
+processed = []
+
+
+class RecordingArbitrageur(SimpleArbitrageur):
+    def process_time_sample(self, *args):
+        processed.append(args)
+        return super().process_time_sample(*args)
+
+
+class RecordingStrategy(SimpleStrategy):
+    llamma_trader_class = RecordingArbitrageur
+
+
+def test_run_stats():
+    reports = []
+    with ProgressMonitor(callback=reports.append) as monitor:
+        stats = RunStats({"A": 100}, n_samples=3, report_interval=0)
+        stats.lap("oracle_update")
+        stats.step(trades=2, snapshot_bytes=10)
+        stats.lap("trader_compute")
+        stats.step(liquidations=1, snapshot_bytes=10)
+        stats.report(finished=True)
+
+    assert len(reports) == 3
+    assert reports[-1]["finished"]
+    assert [r["samples"] for r in reports] == [1, 2, 2]
+    assert list(monitor.runs) == [stats.run_id]
+
+    totals = monitor.totals()
+    assert totals["trades"] == 2
+    assert totals["liquidations"] == 1
+    assert totals["snapshots"] == 2
+    assert totals["snapshot_bytes"] == 20
+    assert totals["oracle_update_time"] > 0
+
+
+@pytest.mark.parametrize("ncpu", [1, 2])
+def test_strategy_progress(sim_market, price_sampler, ncpu):
+    strategy = SimpleStrategy(
+        init_metrics(DEFAULT_POOL_METRICS, sim_market=sim_market),
+        sim_mode="pool",
+        bands_strategy_class=IinitYBandsStrategy,
+    )
+    param_sampler = ParameterizedLLAMMAPoolIterator(
+        sim_market, sim_mode="pool", variable_params={"A": [50, 100]}
+    )
+    with ProgressMonitor() as monitor:
+        run_pipeline(param_sampler, price_sampler, strategy, ncpu=ncpu)
+
+    summary = monitor.summary()
+    assert summary["finished"].all()
+    assert sorted(p["A"] for p in summary["parameters"]) == [50, 100]
+    assert (summary["samples"] == len(price_sampler.prices)).all()
+    assert (summary["snapshots"] == summary["samples"]).all()
+    assert (summary["snapshot_bytes"] > 0).all()
+    assert summary["worker"].nunique() <= ncpu
+
+    assert (summary["trades"] > 0).all()
+    assert (summary["trader_compute_time"] > 0).all()
+    phase_time = sum(summary[phase + "_time"] for phase in PHASES)
+    assert (phase_time <= summary["elapsed"]).all()
+    assert (phase_time >= 0.95 * summary["elapsed"]).all()
+
+
+def test_strategy_trader_override(sim_market, price_sampler):
+    strategy = RecordingStrategy(
+        init_metrics(DEFAULT_POOL_METRICS, sim_market=sim_market), sim_mode="pool"
+    )
+    processed.clear()
+    strategy(sim_market, {"A": 100}, price_sampler)
+    assert len(processed) == len(price_sampler.prices)
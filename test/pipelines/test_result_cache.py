@@ -0,0 +1,109 @@
+import logging
+
+import pytest
+
+from crvusdsim.iterators.params_samplers import ParameterizedLLAMMAPoolIterator
+from crvusdsim.pipelines import ResultCache, run_pipeline
+from crvusdsim.pipelines.cache import fingerprint
+from crvusdsim.pool import get_sim_market
+from test.pipelines.conftest import make_pool_metadata
+
+calls = []
+fail_on = set()
+
+
+def counting_strategy(sim_market, params, price_sampler):
+    assert params["A"] not in fail_on, "crash"
+    calls.append(params["A"])
+    return sim_market.pool.A, len(price_sampler.prices)
+
+
+def make_param_sampler(sim_market, A):
+    return ParameterizedLLAMMAPoolIterator(
+        sim_market, sim_mode="pool", variable_params={"A": A}
+    )
+
+
+def test_fingerprint():
+    market = get_sim_market(make_pool_metadata())
+    assert fingerprint(market) == fingerprint(get_sim_market(make_pool_metadata()))
+
+    market.pool.fee += 1
+    assert fingerprint(market) != fingerprint(get_sim_market(make_pool_metadata()))
+
+
+def test_result_cache_resume(tmp_path, sim_market, price_sampler, caplog):
+    caplog.set_level(logging.INFO, logger="crvusdsim.pipelines")
+    cache = ResultCache(tmp_path)
+    calls.clear()
+    fail_on.add(150)
+    with pytest.raises(AssertionError, match="crash"):
+        run_pipeline(
+            make_param_sampler(sim_market, [50, 100, 150]),
+            price_sampler,
+            counting_strategy,
+            ncpu=1,
+            result_cache=cache,
+        )
+    assert calls == [50, 100]
+
+    # resumes after the crash, then extends the sweep
+    calls.clear()
+    fail_on.clear()
+    results = run_pipeline(
+        make_param_sampler(sim_market, [50, 100, 150]),
+        price_sampler,
+        counting_strategy,
+        ncpu=1,
+        result_cache=cache,
+    )
+    assert calls == [150]
+    assert results == ((50, 100, 150), (len(price_sampler.prices),) * 3)
+    assert "Reused 2 of 3 cached runs" in caplog.messages
+
+    calls.clear()
+    results = run_pipeline(
+        make_param_sampler(get_sim_market(make_pool_metadata()), [50, 100, 150, 200]),
+        price_sampler,
+        counting_strategy,
+        ncpu=1,
+        result_cache=str(tmp_path),
+    )
+    assert calls == [200]
+    assert results[0] == (50, 100, 150, 200)
+    assert "Reused 3 of 4 cached runs" in caplog.messages
+
+
+def test_result_cache_key(tmp_path, sim_market, price_sampler):
+    cache = ResultCache(tmp_path)
+    run_pipeline(
+        make_param_sampler(sim_market, [50, 100]),
+        price_sampler,
+        counting_strategy,
+        ncpu=2,
+        worker_markets=True,
+        result_cache=cache,
+    )
+    assert len(list(tmp_path.glob("*.pkl"))) == 2
+
+    # other data or another template are cache misses
+    calls.clear()
+    other_prices = price_sampler
+    other_prices.prices = price_sampler.prices.iloc[:-1]
+    run_pipeline(
+        make_param_sampler(sim_market, [50]),
+        other_prices,
+        counting_strategy,
+        ncpu=1,
+        result_cache=cache,
+    )
+    sim_market.controller.loan_discount += 1
+    run_pipeline(
+        make_param_sampler(sim_market, [50]),
+        other_prices,
+        counting_strategy,
+        ncpu=1,
+        result_cache=cache,
+    )
+    assert calls == [50, 50]
+    assert len(list(tmp_path.glob("*.pkl"))) == 4
@@ -0,0 +1,159 @@
+import os
+import pickle
+import time
+
+import pytest
+
+from crvusdsim.iterators.params_samplers import ParameterizedLLAMMAPoolIterator
+from crvusdsim.pipelines import BoundedTasks, PipelineExecutor, run_pipeline
+
+
+def sample_strategy(sim_market, params, price_sampler):
+    return len(price_sampler.prices), float(price_sampler.prices.iloc[-1, 0])
+
+
+def sleepy_strategy(sim_market, params, price_sampler):
+    """Finishes runs out of order."""
+    time.sleep(params["delay"])
+    return params["i"], params["i"] ** 2
+
+
+def failing_strategy(sim_market, params, price_sampler):
+    assert params["i"] != 3, "boom"
+    return params["i"], 0
+
+
+def test_bounded_tasks():
+    drawn = []
+    tasks = BoundedTasks((drawn.append(i) or i for i in range(10)), 3)
+    it = iter(tasks)
+    assert [next(it) for _ in range(3)] == [0, 1, 2]
+    assert drawn == [0, 1, 2]
+
+    tasks.done()
+    assert next(it) == 3
+    tasks.close()
+    assert list(it) == []
+    assert drawn == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("chunksize", [1, 2])
+def test_run_pipeline_ordered(chunksize):
+    n = 8
+    param_sampler = (
+        (None, {"i": i, "delay": 0.02 * ((n - i) % 3)}) for i in range(n)
+    )
+    results = run_pipeline(
+        param_sampler, None, sleepy_strategy, ncpu=2, chunksize=chunksize
+    )
+    assert results == (tuple(range(n)), tuple(i**2 for i in range(n)))
+
+
+def test_run_pipeline_error():
+    param_sampler = [(None, {"i": i}) for i in range(6)]
+    with pytest.raises(AssertionError, match="boom"):
+        run_pipeline(param_sampler, None, failing_strategy, ncpu=2, max_in_flight=2)
+
+
+def market_strategy(sim_market, params, price_sampler):
+    pool, controller = sim_market.pool, sim_market.controller
+    assert controller.AMM is pool
+    return pool.A, controller.A, pool.fee, controller.loan_discount
+
+
+@pytest.mark.parametrize(
+    "sim_mode,variable_params",
+    [
+        ("pool", {"A": [50, 100, 150], "fee": [3 * 10**15, 6 * 10**15]}),
+        ("controller", {"A": [50, 100], "loan_discount": [5 * 10**16, 9 * 10**16]}),
+    ],
+)
+def test_run_pipeline_worker_markets(sim_market, sim_mode, variable_params):
+    param_sampler = ParameterizedLLAMMAPoolIterator(
+        sim_market, sim_mode=sim_mode, variable_params=variable_params
+    )
+    clone = pickle.loads(pickle.dumps(param_sampler))
+    assert type(clone) is type(param_sampler)
+    assert clone.parameter_sequence == param_sampler.parameter_sequence
+
+    expected = run_pipeline(param_sampler, None, market_strategy, ncpu=1)
+    results = run_pipeline(
+        param_sampler, None, market_strategy, ncpu=2, worker_markets=True
+    )
+    assert results == expected
+    assert sim_market.pool.A == 100, "template changed"
+
+
+def test_pipeline_executor(sim_market, price_sampler):
+    param_sampler = ParameterizedLLAMMAPoolIterator(
+        sim_market, sim_mode="pool", variable_params={"A": [50, 100, 150]}
+    )
+    expected = run_pipeline(param_sampler, None, market_strategy, ncpu=1)
+
+    with PipelineExecutor(ncpu=2) as executor:
+        pids = set()
+        for worker_markets in (True, False, True):
+            results = run_pipeline(
+                param_sampler,
+                None,
+                market_strategy,
+                worker_markets=worker_markets,
+                executor=executor,
+            )
+            assert results == expected
+            pid_results = run_pipeline(
+                param_sampler, None, pid_strategy, executor=executor
+            )
+            pids |= set(pid_results[0])
+
+        param_sampler = [(None, {})]
+        shared = run_pipeline(
+            param_sampler, price_sampler, sample_strategy, executor=executor
+        )
+        assert shared == run_pipeline(
+            param_sampler, price_sampler, sample_strategy, ncpu=1
+        )
+
+    assert len(pids) <= 2, "workers were restarted"
+
+
+def pid_strategy(sim_market, params, price_sampler):
+    return os.getpid(), None
+
+
+def cache_strategy(sim_market, params, price_sampler):
+    """Reports the worker's executor cache and shared price attachments."""
+    # pylint: disable-next=import-outside-toplevel
+    from crvusdsim.iterators.price_samplers import shared
+    from crvusdsim.pipelines import executor
+
+    assert len(price_sampler.prices) > 0
+    templates = [key for key in executor._cache if key.startswith("market:")]
+    return sim_market.pool.A, (templates, len(shared._attached))
+
+
+def test_pipeline_executor_template_cache(sim_market, price_sampler):
+    with PipelineExecutor(ncpu=1) as executor:
+        results = []
+        for A in (50, 100):
+            param_sampler = ParameterizedLLAMMAPoolIterator(
+                sim_market, sim_mode="pool", variable_params={"A": [A]}
+            )
+            results.append(
+                run_pipeline(
+                    param_sampler,
+                    price_sampler,
+                    cache_strategy,
+                    worker_markets=True,
+                    executor=executor,
+                )
+            )
+
+    (A_first,), ((templates_first, attached_first),) = results[0]
+    (A_second,), ((templates_second, attached_second),) = results[1]
+    assert (A_first, A_second) == (50, 100)
+    # same market, other parameters: the template is reused
+    assert len(templates_first) == 1
+    assert templates_second == templates_first
+    # only the current call's price block is attached
+    assert attached_first == attached_second == 1
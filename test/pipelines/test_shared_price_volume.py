@@ -0,0 +1,45 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from crvusdsim.iterators.price_samplers import SharedPriceVolume
+from crvusdsim.pipelines import run_pipeline
+
+
+def sample_strategy(sim_market, params, price_sampler):
+    """Picklable stand-in strategy summarising what the worker sees."""
+    total = sum(sample.prices[k] for sample in price_sampler for k in sample.prices)
+    return params["A"], total, type(price_sampler).__name__
+
+
+def test_shared_price_volume(price_sampler):
+    with SharedPriceVolume(price_sampler) as shared:
+        payload = pickle.dumps(shared)
+        assert len(payload) < len(pickle.dumps(price_sampler)) // 10
+
+        proxy = pickle.loads(payload)
+        other = pickle.loads(payload)
+        for attr in ("prices", "volumes", "original_prices", "original_volumes"):
+            pd.testing.assert_frame_equal(
+                getattr(proxy, attr), getattr(price_sampler, attr)
+            )
+        assert proxy.peg_prices.keys() == price_sampler.peg_prices.keys()
+        assert proxy.peg_volumes is None
+        assert list(proxy) == list(price_sampler)
+        assert proxy.total_volumes() == price_sampler.total_volumes()
+
+        # zero-copy and read-only
+        assert np.shares_memory(proxy.prices.to_numpy(), other.prices.to_numpy())
+        with pytest.raises(ValueError):
+            proxy.prices.to_numpy()[0, 0] = 0
+
+
+def test_run_pipeline_shared_sampler(price_sampler):
+    param_sampler = [(None, {"A": A}) for A in (50, 100, 150)]
+    serial = run_pipeline(param_sampler, price_sampler, sample_strategy, ncpu=1)
+    parallel = run_pipeline(param_sampler, price_sampler, sample_strategy, ncpu=2)
+
+    assert serial[:2] == parallel[:2]
+    assert set(parallel[2]) == {"SharedPriceVolume"}
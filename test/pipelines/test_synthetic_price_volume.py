@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from curvesim.templates import SimAssets
+
+from crvusdsim.iterators.params_samplers import ParameterizedLLAMMAPoolIterator
+from crvusdsim.iterators.price_samplers import (
+    GBM,
+    BlockBootstrap,
+    JumpDiffusion,
+    RegimeSwitching,
+    SyntheticPaths,
+)
+from crvusdsim.metrics import init_metrics
+from crvusdsim.pipelines import run_pipeline
+from crvusdsim.pipelines.common import DEFAULT_POOL_METRICS
+from crvusdsim.pipelines.simple.strategy import SimpleStrategy
+
+from .conftest import crvUSD_address, wstETH_address
+
+
+@pytest.fixture
+def assets():
+    return SimAssets(
+        symbols=["crvUSD", "wstETH"],
+        addresses=[crvUSD_address, wstETH_address],
+        chain="mainnet",
+    )
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        GBM(),
+        JumpDiffusion(jump_intensity=1000),
+        RegimeSwitching(),
+        BlockBootstrap(np.random.default_rng(0).normal(0, 0.002, 500), block_size=50),
+    ],
+)
+def test_synthetic_paths(assets, model):
+    def make_paths(**kwargs):
+        return SyntheticPaths(
+            assets, model, 2000, 5, 120, pegcoins=["USDC"], seed=1, **kwargs
+        )
+
+    paths = list(make_paths(batch_size=2))
+    assert len(paths) == 5
+    assert [path.path_id for path in paths] == list(range(5))
+
+    path = paths[3]
+    assert list(path.prices.columns) == [("crvUSD", "wstETH")]
+    assert len(path.prices) == len(path.volumes) == 120
+    assert path.prices.iloc[0, 0] == 2000
+    assert (path.prices > 0).all().all()
+    assert not path.prices.equals(paths[2].prices)
+
+    # seeded, and any path can be regenerated on its own
+    again = make_paths(batch_size=2).path(3)
+    pd.testing.assert_frame_equal(again.prices, path.prices)
+    pd.testing.assert_frame_equal(
+        again.peg_prices[("USDC", "crvUSD")], path.peg_prices[("USDC", "crvUSD")]
+    )
+
+    samples = list(path)
+    assert len(samples) == 120
+    assert samples[5].timestamp == path.prices.index[5]
+    assert samples[5].prices == {("crvUSD", "wstETH"): path.prices.iloc[5, 0]}
+    peg = path.peg_prices[("USDC", "crvUSD")].iloc[5, 0]
+    assert samples[5].peg_prices == {("USDC", "crvUSD"): {("USDC", "crvUSD"): peg}}
+    assert abs(peg - 1) < 0.05
+
+    head = path.head(30)
+    assert list(head) == samples[:30]
+
+
+def test_synthetic_path_run(assets, sim_market):
+    paths = SyntheticPaths(
+        assets, GBM(), 2000, 2, 100, interval=15 * 60, pegcoins=["USDC"], seed=0
+    )
+    strategy = SimpleStrategy(
+        init_metrics(DEFAULT_POOL_METRICS, sim_market=sim_market), sim_mode="pool"
+    )
+    param_sampler = ParameterizedLLAMMAPoolIterator(
+        sim_market, sim_mode="pool", variable_params={"fee": [6 * 10**15]}
+    )
+
+    results = [
+        run_pipeline(param_sampler, price_sampler, strategy, ncpu=1)
+        for price_sampler in paths
+    ]
+    state_data = [result[3][0] for result in results]
+    assert all(len(df) == 100 for df in state_data)
+    assert not state_data[0].equals(state_data[1])